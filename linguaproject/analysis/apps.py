@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class AnalysisConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'linguaproject.analysis'
+    label = 'analysis'
+    verbose_name = '음성 분석 API'
@@ -0,0 +1,294 @@
+'''
+분석 작업 관리 (로컬 프로세스 풀)
+요청 처리(이벤트 루프)는 작업을 풀에 제출하고 job id만 돌려받으며, 모델 추론은 전부 워커 프로세스에서 실행됩니다.
+워커가 보낸 구간 결과는 이벤트 수신 스레드가 Job에 쌓고, 기다리는 async 뷰를 깨웁니다.
+완료된 작업은 메모리에 최근 ANALYSIS_MAX_JOBS개까지만 보관합니다.
+'''
+
+import asyncio
+import importlib
+import multiprocessing
+import multiprocessing.connection
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+FINISHED = (DONE, FAILED)
+
+
+class QueueFull(Exception):
+    """대기 + 실행 중 작업이 max_active에 도달해 새 작업을 받을 수 없음"""
+
+
+def _wake(future):
+    if not future.done():
+        future.set_result(None)
+
+
+def _watch_parent():
+    """웹 프로세스가 정리 없이 종료되면(uvicorn은 SIGTERM을 다시 발생시켜 atexit가 돌지 않음) 워커도 종료"""
+    multiprocessing.connection.wait([multiprocessing.parent_process().sentinel])
+    os._exit(1)
+
+
+def _init_worker(worker_module, events, warmup):
+    """풀 initializer: 부모 감시 스레드 시작 후 워커 모듈의 init_worker 실행"""
+    threading.Thread(target=_watch_parent, name="analysis-parent-watch", daemon=True).start()
+    importlib.import_module(worker_module).init_worker(events, warmup)
+
+
+class Job:
+    """분석 작업 1건의 상태와 누적 결과"""
+
+    def __init__(self, kind, params):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.params = params
+        self.status = QUEUED
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.worker = None
+        self.results = []
+        self.error = None
+        self.expected = None  # 워커가 반환한 결과 수 (이벤트가 모두 도착하면 완료 처리)
+        self.version = 0  # 상태나 결과가 바뀔 때마다 증가
+        self._waiters = []
+        self._lock = threading.Lock()
+
+    def _changed(self):
+        """lock 안에서 호출: version 증가 후 대기 중인 async 뷰를 깨움"""
+        self.version += 1
+        waiters, self._waiters = self._waiters, []
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_wake, future)
+
+    def start(self, worker):
+        with self._lock:
+            if self.status == QUEUED:
+                self.status, self.started, self.worker = RUNNING, time.time(), worker
+                self._changed()
+
+    def add_result(self, result):
+        with self._lock:
+            self.results.append(result)
+            self._finish_if_complete()
+            self._changed()
+
+    def complete(self, count):
+        with self._lock:
+            self.expected = count
+            self._finish_if_complete()
+            self._changed()
+
+    def fail(self, error):
+        with self._lock:
+            self.status, self.error, self.finished = FAILED, error, time.time()
+            self._changed()
+
+    def _finish_if_complete(self):
+        if self.expected is not None and len(self.results) >= self.expected and self.status not in FINISHED:
+            self.status, self.finished = DONE, time.time()
+
+    async def wait(self, version, timeout):
+        """version 이후 변경이 생기거나 timeout(초)이 지날 때까지 대기 (요청 스레드를 막지 않음)"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            if self.version != version or self.status in FINISHED:
+                return
+            self._waiters.append((loop, future))
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def to_dict(self, since=0):
+        with self._lock:
+            return {
+                "id": self.id,
+                "kind": self.kind,
+                "status": self.status,
+                "created": self.created,
+                "started": self.started,
+                "finished": self.finished,
+                "error": self.error,
+                "result_count": len(self.results),
+                "results": self.results[since:],
+                "version": self.version
+            }
+
+
+class JobManager:
+    """
+    작업 큐 + 로컬 프로세스 풀
+
+    Args:
+        worker_module: init_worker / run_audio / run_transcript를 제공하는 모듈 경로
+        workers: 워커 프로세스 수 (워커마다 모델을 한 벌씩 로드)
+        max_jobs: 메모리에 보관할 최대 작업 수 (초과 시 오래된 완료 작업부터 삭제)
+        max_active: 대기 + 실행 중 작업 수 상한 (초과 제출은 QueueFull, 업로드 파일이 디스크에 쌓이지 않도록)
+        warmup: 워커 시작 시 선로딩할 모델 ("none" | "text" | "all", 워커 모듈의 init_worker 참고)
+    """
+
+    def __init__(self, worker_module, workers=1, max_jobs=1000, max_active=32, warmup="text"):
+        self.worker_module = worker_module
+        self.workers = workers
+        self.max_jobs = max_jobs
+        self.max_active = max_active
+        self._active = 0  # 풀에 제출되어 아직 끝나지 않은 작업 수
+        self.warmup = warmup
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = None
+        self._events = None
+        self._module = None
+
+    def _ensure_pool(self):
+        """첫 작업 제출 시 풀 시작 (manage.py 명령 실행 시에는 워커를 띄우지 않음)"""
+        with self._lock:
+            if self._executor is not None:
+                return self._executor
+            # 서버 프로세스의 스레드 / 이벤트 루프를 fork하지 않도록 spawn 사용
+            context = multiprocessing.get_context("spawn")
+            if self._events is None:
+                self._events = context.Queue()
+                threading.Thread(target=self._receive_events, name="analysis-events", daemon=True).start()
+            self._module = importlib.import_module(self.worker_module)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(self.worker_module, self._events, self.warmup)
+            )
+            return self._executor
+
+    def _receive_events(self):
+        while True:
+            kind, job_id, payload = self._events.get()
+            job = self.get(job_id)
+            if job is None:
+                continue
+            if kind == "started":
+                job.start(payload)
+            elif kind == "result":
+                job.start(None)
+                job.add_result(payload)
+
+    def has_capacity(self):
+        """새 작업을 받을 수 있는지 (업로드를 저장하기 전에 미리 확인)"""
+        return self._active < self.max_active
+
+    def _register(self, job):
+        with self._lock:
+            if self._active >= self.max_active:
+                raise QueueFull(f"대기 중인 작업이 너무 많습니다 (최대 {self.max_active}개).")
+            self._active += 1
+            self._jobs[job.id] = job
+            excess = len(self._jobs) - self.max_jobs
+            for old_id in [i for i, j in self._jobs.items() if j.status in FINISHED][:max(excess, 0)]:
+                del self._jobs[old_id]
+
+    def _submit(self, kind, function, params, *args, cleanup=None):
+        job = Job(kind, params)
+        self._register(job)
+        try:
+            executor = self._ensure_pool()
+            try:
+                future = executor.submit(getattr(self._module, function), job.id, *args)
+            except BrokenProcessPool:
+                self._reset_pool(executor)
+                executor = self._ensure_pool()
+                future = executor.submit(getattr(self._module, function), job.id, *args)
+        except Exception as e:
+            with self._lock:
+                self._active -= 1
+            if cleanup:
+                cleanup()
+            job.fail(f"{type(e).__name__}: {e}")
+            raise
+        future.add_done_callback(lambda f: self._on_done(job, f, executor, cleanup))
+        return job
+
+    def _on_done(self, job, future, executor, cleanup):
+        with self._lock:
+            self._active -= 1
+        if cleanup:
+            cleanup()
+        if future.cancelled():  # 풀 종료(shutdown / 재시작) 시 대기 중이던 작업
+            job.fail("cancelled")
+            return
+        error = future.exception()
+        if error is None:
+            job.complete(future.result())
+            return
+        if isinstance(error, BrokenProcessPool):
+            self._reset_pool(executor)  # 워커가 비정상 종료(OOM 등)되면 다음 제출 때 풀을 새로 시작
+        job.fail(f"{type(error).__name__}: {error}")
+
+    def _reset_pool(self, executor=None):
+        """
+        풀 종료 (다음 제출 때 새로 시작)
+
+        executor를 주면 그 풀이 아직 현재 풀일 때만 종료합니다. 깨진 풀의 작업마다 콜백이
+        호출되므로, 그 사이 새로 만든 정상 풀을 늦게 도착한 콜백이 닫지 않도록 합니다.
+        """
+        with self._lock:
+            if executor is not None and self._executor is not executor:
+                return
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit_audio(self, audio_path, process_mode="C", delete_after=True):
+        """녹음 분석 작업 제출 (delete_after이면 끝난 뒤 업로드 파일 삭제)"""
+        cleanup = (lambda: os.path.exists(audio_path) and os.remove(audio_path)) if delete_after else None
+        return self._submit("audio", "run_audio", {"mode": process_mode}, audio_path, process_mode,
+                            cleanup=cleanup)
+
+    def submit_transcript(self, utterances, metadata=None):
+        """전사문 분석 작업 제출"""
+        return self._submit("transcript", "run_transcript", {"utterances": len(utterances)}, utterances, metadata)
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stats(self):
+        with self._lock:
+            jobs = list(self._jobs.values())
+        counts = {status: 0 for status in (QUEUED, RUNNING, DONE, FAILED)}
+        for job in jobs:
+            counts[job.status] += 1
+        return {"workers": self.workers, "worker_module": self.worker_module,
+                "pool_started": self._executor is not None, "active": self._active,
+                "max_active": self.max_active, "jobs": counts}
+
+    def shutdown(self):
+        self._reset_pool()
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager():
+    """설정(ANALYSIS_*)으로 만든 프로세스 전역 JobManager"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = JobManager(
+                worker_module=settings.ANALYSIS_WORKER_MODULE,
+                workers=settings.ANALYSIS_WORKERS,
+                max_jobs=settings.ANALYSIS_MAX_JOBS,
+                max_active=settings.ANALYSIS_MAX_ACTIVE_JOBS,
+                warmup=settings.ANALYSIS_WARMUP
+            )
+        return _manager
@@ -0,0 +1,221 @@
+'''
+분석 API 부하 테스트 (대체 워커 사용, 모델 불필요)
+uvicorn으로 asgi.py를 띄우고 ANALYSIS_WORKER_MODULE을 standin으로 바꿔, 동시 클라이언트가
+업로드 / 전사문 제출 → long-poll 완료 대기를 반복하는 동안 status 응답 지연을 함께 측정합니다.
+추론 중에도 이벤트 루프가 막히지 않는지(제출·status 지연)와 처리량(워커 수 / STANDIN_SECONDS 대비)을 봅니다.
+
+사용법 (저장소 루트에서):
+    python -m linguaproject.analysis.loadtest --clients 16 --jobs 200 --workers 4
+    python -m linguaproject.analysis.loadtest --url http://127.0.0.1:8000  # 이미 떠 있는 서버 대상
+'''
+
+import argparse
+import io
+import json
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+import wave
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+API_PREFIX = "/api/analysis"
+
+
+def _tiny_wav(seconds=0.5, sr=16000):
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sr)
+        w.writeframes(b"\x00\x00" * int(seconds * sr))
+    return buffer.getvalue()
+
+
+def _multipart(fields, filename, content):
+    boundary = uuid.uuid4().hex
+    parts = [f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+             for name, value in fields.items()]
+    parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+                 f'Content-Type: audio/wav\r\n\r\n'.encode() + content + b"\r\n")
+    parts.append(f"--{boundary}--\r\n".encode())
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+def _request(url, body=None, content_type=None, timeout=60):
+    request = urllib.request.Request(url, data=body)
+    if content_type:
+        request.add_header("Content-Type", content_type)
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+class LoadTest:
+    """동시 클라이언트 + status 프로브, 지연 시간 수집"""
+
+    def __init__(self, base_url, clients, jobs, audio_ratio):
+        self.base_url = base_url.rstrip("/") + API_PREFIX
+        self.clients = clients
+        self.jobs = jobs
+        self.audio_ratio = audio_ratio
+        self.submit_latency = []
+        self.complete_latency = []
+        self.probe_latency = []
+        self.results = 0
+        self.failures = []
+        self._issued = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wav = _tiny_wav()
+
+    def _next(self):
+        with self._lock:
+            if self._issued >= self.jobs:
+                return None
+            self._issued += 1
+            return self._issued
+
+    def _submit(self, number):
+        if number % 100 < self.audio_ratio * 100:
+            body, content_type = _multipart({"mode": "C"}, f"load_{number}.wav", self._wav)
+            return _request(f"{self.base_url}/jobs/audio", body, content_type)
+        payload = {"utterances": [{"speaker": "SPEAKER_00", "text": f"부하 테스트 발화 {number}-{i}"}
+                                  for i in range(4)]}
+        return _request(f"{self.base_url}/jobs/transcript", json.dumps(payload).encode(), "application/json")
+
+    def _client(self):
+        while (number := self._next()) is not None:
+            started = time.perf_counter()
+            try:
+                accepted = self._submit(number)
+                submitted = time.perf_counter()
+                since, job = 0, None
+                while job is None or job["status"] not in ("done", "failed"):
+                    job = _request(f"{self.base_url}/jobs/{accepted['job_id']}?since={since}&wait=10")
+                    since += len(job["results"])
+                finished = time.perf_counter()
+            except (urllib.error.URLError, OSError, ValueError) as e:
+                with self._lock:
+                    self.failures.append(f"{type(e).__name__}: {e}")
+                continue
+            with self._lock:
+                self.submit_latency.append(submitted - started)
+                self.complete_latency.append(finished - started)
+                self.results += since
+                if job["status"] == "failed":
+                    self.failures.append(job["error"])
+
+    def _probe(self, interval=0.05):
+        while not self._stop.is_set():
+            started = time.perf_counter()
+            try:
+                _request(f"{self.base_url}/status", timeout=10)
+                self.probe_latency.append(time.perf_counter() - started)
+            except (urllib.error.URLError, OSError):
+                pass
+            self._stop.wait(interval)
+
+    def run(self):
+        probe = threading.Thread(target=self._probe, daemon=True)
+        clients = [threading.Thread(target=self._client) for _ in range(self.clients)]
+        started = time.perf_counter()
+        probe.start()
+        for thread in clients:
+            thread.start()
+        for thread in clients:
+            thread.join()
+        self.elapsed = time.perf_counter() - started
+        self._stop.set()
+        probe.join()
+        return self
+
+
+def _percentiles(values):
+    if not values:
+        return "-"
+    ordered = sorted(values)
+    pick = lambda q: ordered[min(int(q * len(ordered)), len(ordered) - 1)] * 1000
+    return (f"p50 {statistics.median(ordered) * 1000:7.1f}ms  p95 {pick(0.95):7.1f}ms  "
+            f"max {ordered[-1] * 1000:7.1f}ms  (n={len(ordered)})")
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_server(port, workers, seconds):
+    env = dict(os.environ,
+               ANALYSIS_WORKER_MODULE="linguaproject.analysis.standin",
+               ANALYSIS_WORKERS=str(workers),
+               STANDIN_SECONDS=str(seconds),
+               DEBUG=os.environ.get("DEBUG", "True"),
+               SECRET_KEY=os.environ.get("SECRET_KEY", "loadtest-only-secret-key"))
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "linguaproject.asgi:application",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT_DIR, env=env
+    )
+
+
+def _wait_ready(base_url, server=None, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if server is not None and server.poll() is not None:
+            raise RuntimeError(f"서버가 종료되었습니다 (code {server.returncode})")
+        try:
+            return _request(f"{base_url.rstrip('/')}{API_PREFIX}/status", timeout=2)
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.2)
+    raise RuntimeError(f"서버가 {timeout}초 안에 응답하지 않습니다: {base_url}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="분석 API 부하 테스트 (standin 워커)")
+    parser.add_argument("--url", help="이미 실행 중인 서버 주소 (없으면 uvicorn을 직접 띄움)")
+    parser.add_argument("--clients", type=int, default=16, help="동시 클라이언트 수")
+    parser.add_argument("--jobs", type=int, default=200, help="총 작업 수")
+    parser.add_argument("--workers", type=int, default=4, help="워커 프로세스 수 (--url 없을 때)")
+    parser.add_argument("--seconds", type=float, default=0.5, help="standin 작업 1건 처리 시간 (--url 없을 때)")
+    parser.add_argument("--audio-ratio", type=float, default=0.5, help="업로드 작업 비율 (나머지는 전사문)")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        port = _free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        server = _start_server(port, args.workers, args.seconds)
+    try:
+        status = _wait_ready(base_url, server)
+        print(f"서버: {base_url}  워커 {status['workers']}개 ({status['worker_module']})")
+        test = LoadTest(base_url, args.clients, args.jobs, args.audio_ratio).run()
+    finally:
+        if server is not None:
+            server.send_signal(signal.SIGINT)  # 정상 종료 (워커 풀 정리)
+            server.wait(timeout=10)
+
+    done = len(test.complete_latency)
+    print(f"\n작업 {done}/{args.jobs}건, 결과 {test.results}개, 실패 {len(test.failures)}건, {test.elapsed:.1f}초")
+    print(f"처리량: {done / test.elapsed:.2f} jobs/s", end="")
+    if server is not None:
+        print(f"  (이론상 최대 {args.workers / args.seconds:.2f} jobs/s)")
+    else:
+        print()
+    print(f"제출 응답:   {_percentiles(test.submit_latency)}")
+    print(f"완료까지:    {_percentiles(test.complete_latency)}")
+    print(f"status 응답: {_percentiles(test.probe_latency)}")
+    for failure in test.failures[:5]:
+        print(f"  실패: {failure}")
+
+
+if __name__ == "__main__":
+    main()
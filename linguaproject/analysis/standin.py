@@ -0,0 +1,47 @@
+'''
+부하 테스트용 대체 워커 (모델 없이 worker 모듈과 같은 인터페이스)
+작업마다 STANDIN_SECONDS(기본 0.5초)만큼 연산 대신 대기하며 구간 결과를 나눠 보냅니다.
+ANALYSIS_WORKER_MODULE=linguaproject.analysis.standin 으로 지정합니다.
+'''
+
+import os
+import time
+
+SECONDS = float(os.getenv("STANDIN_SECONDS", "0.5"))
+SEGMENTS = int(os.getenv("STANDIN_SEGMENTS", "4"))
+
+_state = {}
+
+
+def init_worker(events, warmup="text"):
+    _state["events"] = events
+
+
+def _fake_result(index, text):
+    return {
+        "speaker": f"SPEAKER_{index % 2:02d}",
+        "text": text,
+        "emotion": "중립",
+        "profanity": False,
+        "risk_score": 0,
+        "risk_level": "NORMAL",
+        "recommendation": "일반 응대",
+        "response": "말씀 감사합니다. 확인해 드리겠습니다."
+    }
+
+
+def _run(job_id, texts):
+    events = _state["events"]
+    events.put(("started", job_id, os.getpid()))
+    for index, text in enumerate(texts):
+        time.sleep(SECONDS / max(len(texts), 1))
+        events.put(("result", job_id, _fake_result(index, text)))
+    return len(texts)
+
+
+def run_audio(job_id, audio_path, process_mode="C"):
+    return _run(job_id, [f"{os.path.basename(audio_path)} 구간 {i + 1}" for i in range(SEGMENTS)])
+
+
+def run_transcript(job_id, utterances, metadata=None):
+    return _run(job_id, [u["text"] if isinstance(u, dict) else u for u in utterances])
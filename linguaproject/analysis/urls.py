@@ -0,0 +1,13 @@
+from django.urls import path
+
+from . import views
+
+app_name = 'analysis'
+
+urlpatterns = [
+    path('jobs/audio', views.submit_audio, name='submit_audio'),
+    path('jobs/transcript', views.submit_transcript, name='submit_transcript'),
+    path('jobs/<str:job_id>', views.job_detail, name='job_detail'),
+    path('jobs/<str:job_id>/stream', views.job_stream, name='job_stream'),
+    path('status', views.status, name='status'),
+]
@@ -0,0 +1,205 @@
+'''
+음성 분석 HTTP API (async 뷰, asgi.py로 실행)
+업로드 / 전사문 제출은 작업을 로컬 워커 풀에 넣고 202와 job id를 바로 돌려줍니다.
+결과는 GET jobs/<id> 폴링(?since=N&wait=초 long-poll) 또는 jobs/<id>/stream (Server-Sent Events)으로 받습니다.
+뷰는 모델을 import하지 않으며, 업로드 저장처럼 블로킹 I/O는 별도 스레드에서 실행합니다.
+'''
+
+import json
+import os
+import uuid
+from dataclasses import fields
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+
+from ..logic_classify_system.risk_based_classifier import ConsultationMetadata
+from .jobs import FINISHED, QueueFull, get_job_manager
+
+AUDIO_EXTENSIONS = (".wav", ".m4a", ".mp3", ".flac", ".ogg")
+PROCESS_MODES = ("A", "B", "C")
+METADATA_FIELDS = {f.name for f in fields(ConsultationMetadata)}
+MAX_WAIT_SECONDS = 30.0
+HEARTBEAT_SECONDS = 15.0
+RETRY_AFTER_SECONDS = 10
+
+
+def _error(message, status=400):
+    return JsonResponse({"error": message}, status=status, json_dumps_params={"ensure_ascii": False})
+
+
+def _busy(message):
+    response = _error(message, status=429)
+    response["Retry-After"] = str(RETRY_AFTER_SECONDS)
+    return response
+
+
+def _accepted(request, job):
+    return JsonResponse({
+        "job_id": job.id,
+        "status": job.status,
+        "url": request.build_absolute_uri(reverse("analysis:job_detail", args=[job.id])),
+        "stream_url": request.build_absolute_uri(reverse("analysis:job_stream", args=[job.id]))
+    }, status=202)
+
+
+async def _submit(function, *args):
+    """풀 제출은 스레드에서 (spawn 워커 시작과 인자 pickle이 이벤트 루프를 막지 않도록)"""
+    return await sync_to_async(function, thread_sensitive=False)(*args)
+
+
+def _save_upload(request):
+    """multipart 'file' 필드를 업로드 디렉터리에 저장 (동기 I/O → 스레드에서 실행)"""
+    upload = request.FILES.get("file")
+    if upload is None:
+        raise ValueError("'file' 필드로 오디오 파일을 보내세요.")
+    extension = os.path.splitext(upload.name)[1].lower()
+    if extension not in AUDIO_EXTENSIONS:
+        raise ValueError(f"지원하지 않는 형식입니다: {extension} (가능: {', '.join(AUDIO_EXTENSIONS)})")
+    if upload.size > settings.ANALYSIS_MAX_UPLOAD_MB * 2**20:
+        raise ValueError(f"파일이 너무 큽니다 (최대 {settings.ANALYSIS_MAX_UPLOAD_MB}MB).")
+
+    os.makedirs(settings.ANALYSIS_UPLOAD_DIR, exist_ok=True)
+    path = os.path.join(settings.ANALYSIS_UPLOAD_DIR, f"{uuid.uuid4().hex}{extension}")
+    with open(path, "wb") as f:
+        for chunk in upload.chunks():
+            f.write(chunk)
+    return path, request.POST.get("mode", "C").upper()
+
+
+@csrf_exempt
+@require_POST
+async def submit_audio(request):
+    """POST jobs/audio (multipart: file, mode=A|B|C) → 202 {job_id} (대기 작업이 가득 차면 429)"""
+    manager = get_job_manager()
+    if not manager.has_capacity():
+        return _busy("대기 중인 작업이 너무 많습니다. 잠시 후 다시 시도하세요.")
+    try:
+        path, mode = await sync_to_async(_save_upload, thread_sensitive=False)(request)
+    except ValueError as e:
+        return _error(str(e))
+    if mode not in PROCESS_MODES:
+        os.remove(path)
+        return _error(f"잘못된 처리 방식입니다: {mode} (가능: {', '.join(PROCESS_MODES)})")
+    try:
+        job = await _submit(manager.submit_audio, path, mode)
+    except QueueFull as e:
+        os.remove(path)
+        return _busy(str(e))
+    return _accepted(request, job)
+
+
+def _parse_transcript(body):
+    """{"utterances": [{"speaker", "text"} | "text", ...] 또는 "text": "줄바꿈 구분", "metadata": {...}}"""
+    try:
+        payload = json.loads(body or b"{}")
+    except ValueError:
+        raise ValueError("JSON 본문이 올바르지 않습니다.")
+    if not isinstance(payload, dict):
+        raise ValueError("JSON 객체를 보내세요.")
+
+    if "utterances" in payload:
+        utterances = payload["utterances"]
+        if not isinstance(utterances, list):
+            raise ValueError("'utterances'는 리스트여야 합니다.")
+        utterances = [{"text": u} if isinstance(u, str) else u for u in utterances]
+        if not all(isinstance(u, dict) and isinstance(u.get("text"), str) for u in utterances):
+            raise ValueError("각 발화는 문자열 또는 'text' 키가 있는 객체여야 합니다.")
+        utterances = [{"speaker": u.get("speaker"), "text": u["text"]} for u in utterances]
+    else:
+        utterances = [{"speaker": None, "text": line.strip()}
+                      for line in str(payload.get("text", "")).splitlines() if line.strip()]
+    if not utterances:
+        raise ValueError("분석할 발화가 없습니다.")
+
+    metadata = payload.get("metadata")
+    if metadata is not None:
+        if not isinstance(metadata, dict) or not set(metadata) <= METADATA_FIELDS:
+            raise ValueError(f"'metadata' 키는 {', '.join(sorted(METADATA_FIELDS))} 중에서 고르세요.")
+    return utterances, metadata
+
+
+@csrf_exempt
+@require_POST
+async def submit_transcript(request):
+    """POST jobs/transcript (JSON) → 202 {job_id} (대기 작업이 가득 차면 429)"""
+    try:
+        utterances, metadata = _parse_transcript(request.body)
+    except ValueError as e:
+        return _error(str(e))
+    try:
+        job = await _submit(get_job_manager().submit_transcript, utterances, metadata)
+    except QueueFull as e:
+        return _busy(str(e))
+    return _accepted(request, job)
+
+
+def _query_number(request, name, default, cast):
+    try:
+        return max(cast(request.GET.get(name, default)), 0)
+    except ValueError:
+        return default
+
+
+@require_GET
+async def job_detail(request, job_id):
+    """
+    GET jobs/<id>?since=N&wait=초
+
+    since 이후 결과만 반환하고, wait를 주면 새 결과나 상태 변화가 생길 때까지 최대 wait초 기다립니다 (long-poll).
+    """
+    job = get_job_manager().get(job_id)
+    if job is None:
+        return _error("작업을 찾을 수 없습니다.", status=404)
+    since = _query_number(request, "since", 0, int)
+    wait = min(_query_number(request, "wait", 0.0, float), MAX_WAIT_SECONDS)
+    version = job.version
+    if wait and job.status not in FINISHED and len(job.results) <= since:
+        await job.wait(version, wait)
+    return JsonResponse(job.to_dict(since), json_dumps_params={"ensure_ascii": False})
+
+
+def _event(name, data):
+    return f"event: {name}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _stream_events(job):
+    sent, status = 0, None
+    while True:
+        version = job.version
+        snapshot = job.to_dict(sent)
+        if snapshot["status"] != status:
+            status = snapshot["status"]
+            yield _event("status", {"status": status, "started": snapshot["started"]})
+        for result in snapshot["results"]:
+            yield _event("result", {"index": sent, **result})
+            sent += 1
+        if status in FINISHED:
+            yield _event("done" if status == "done" else "error",
+                         {"result_count": snapshot["result_count"], "error": snapshot["error"]})
+            return
+        await job.wait(version, HEARTBEAT_SECONDS)
+        if job.version == version:
+            yield ": keep-alive\n\n"
+
+
+@require_GET
+async def job_stream(request, job_id):
+    """GET jobs/<id>/stream → text/event-stream (status / result / done | error 이벤트)"""
+    job = get_job_manager().get(job_id)
+    if job is None:
+        return _error("작업을 찾을 수 없습니다.", status=404)
+    response = StreamingHttpResponse(_stream_events(job), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+@require_GET
+async def status(request):
+    """GET status → 워커 수 / 작업 상태별 개수"""
+    return JsonResponse(get_job_manager().stats())
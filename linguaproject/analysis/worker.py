@@ -0,0 +1,75 @@
+'''
+분석 작업 워커 (JobManager 프로세스 풀의 각 프로세스에서 실행)
+워커 시작 시 모델을 한 번 로드하고, 작업마다 main.analyze_file / analyze_transcript를 실행합니다.
+구간 결과가 확정될 때마다 이벤트 큐로 보내 웹 프로세스가 폴링/스트리밍으로 바로 내보낼 수 있게 합니다.
+
+JobManager는 ANALYSIS_WORKER_MODULE의 init_worker / run_audio / run_transcript만 사용하므로
+같은 인터페이스의 대체 모듈(standin)로 바꿔 끼울 수 있습니다.
+'''
+
+import os
+import sys
+
+# CLI(main.py) / batch_runner와 같은 import 경로 (emotion_system, logic_classify_system이 최상위 패키지)
+SOURCE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 워커 프로세스별 상태 (init_worker에서 한 번 생성)
+_state = {}
+
+
+# ANALYSIS_WARMUP 값 → 워커 시작 시 선로딩할 모델
+WARMUP_MODES = ("none", "text", "all")
+
+
+def init_worker(events, warmup="text"):
+    """
+    Args:
+        warmup: "text"이면 전사문 분석용 텍스트 모델만, "all"이면 녹음 분석 모델(pyannote, Whisper, LSTM)까지,
+                "none"이면 아무것도 선로딩하지 않음 (선로딩하지 않은 모델은 첫 작업에서 로드)
+    """
+    if warmup not in WARMUP_MODES:
+        raise ValueError(f"ANALYSIS_WARMUP 값이 올바르지 않습니다: {warmup} (가능: {', '.join(WARMUP_MODES)})")
+    if SOURCE_DIR not in sys.path:
+        sys.path.insert(0, SOURCE_DIR)
+
+    from main import warmup_models
+    from emotion_system.response.responder import TieredResponder
+    from logic_classify_system.risk_based_classifier import RiskScoreClassifier
+
+    if warmup != "none":
+        # 선로딩 실패는 워커 시작 실패(BrokenProcessPool)가 되므로 기본은 어디서나 로드 가능한 텍스트 모델만
+        warmup_models("C", audio=warmup == "all")
+    _state.update(
+        events=events,
+        responder=TieredResponder(),  # 응답 캐시는 워커 안에서 작업 간 공유
+        classifier=RiskScoreClassifier()
+    )
+
+
+def _emitter(job_id):
+    events = _state["events"]
+    events.put(("started", job_id, os.getpid()))
+    return lambda result: events.put(("result", job_id, result))
+
+
+def run_audio(job_id, audio_path, process_mode="C"):
+    """
+    업로드된 녹음 분석
+
+    Returns:
+        결과 수 (결과 자체는 이벤트 큐로 전달)
+    """
+    from main import analyze_file
+
+    results = analyze_file(audio_path, process_mode, responder=_state["responder"],
+                           classifier=_state["classifier"], on_result=_emitter(job_id))
+    return len(results)
+
+
+def run_transcript(job_id, utterances, metadata=None):
+    """전사문 분석 (결과 수 반환, 결과는 이벤트 큐로 전달)"""
+    from main import analyze_transcript
+
+    results = analyze_transcript(utterances, metadata, responder=_state["responder"],
+                                 classifier=_state["classifier"], on_result=_emitter(job_id))
+    return len(results)
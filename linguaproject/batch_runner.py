@@ -0,0 +1,364 @@
+'''
+녹음 디렉터리 / 목록 파일 일괄 분석 (비대화형 배치 실행)
+프로세스 풀의 각 워커가 시작할 때 모델을 한 번만 로드하고, 파일마다 main.analyze_file을 실행합니다.
+결과는 파일당 한 줄씩 JSONL로 쓰고 매 줄마다 fsync하므로 이 JSONL이 곧 체크포인트입니다.
+중단 후 같은 명령으로 다시 실행하면 이미 기록된 파일은 건너뜁니다 (--retry-failed이면 실패한 파일은 다시 처리).
+--parquet를 주면 끝난 뒤 구간 단위로 펼친 Parquet 파일도 씁니다 (pandas + pyarrow 필요).
+
+입력: 오디오 파일이 있는 디렉터리(하위 폴더 포함), 경로 목록 파일(.txt, 한 줄에 하나, '#'은 주석),
+      또는 {"path": ...} 줄로 된 .jsonl manifest
+
+실행: python batch_runner.py recordings/ --output results.jsonl [--workers 4] [--mode C]
+      [--parquet results.parquet] [--report report.json] [--retry-failed]
+'''
+
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from emotion_system.metrics import metrics
+
+AUDIO_EXTENSIONS = (".wav", ".m4a", ".mp3", ".flac", ".ogg")
+
+
+def collect_inputs(source):
+    """디렉터리 / 목록 파일 / 단일 오디오 파일 → 절대 경로 리스트 (입력 순서 유지, 중복 제거)"""
+    if os.path.isdir(source):
+        paths = [os.path.join(root, name)
+                 for root, _, names in sorted(os.walk(source))
+                 for name in sorted(names) if name.lower().endswith(AUDIO_EXTENSIONS)]
+    elif source.lower().endswith(AUDIO_EXTENSIONS):
+        paths = [source]
+    else:
+        base = os.path.dirname(os.path.abspath(source))
+        paths = []
+        with open(source, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                path = json.loads(line)["path"] if source.endswith(".jsonl") else line
+                paths.append(path if os.path.isabs(path) else os.path.join(base, path))
+    return list(dict.fromkeys(os.path.abspath(path) for path in paths))
+
+
+def load_checkpoint(output_path):
+    """
+    기존 결과 JSONL에서 처리 완료 기록을 읽음
+
+    마지막 줄이 기록 도중 끊겼으면 그 줄을 잘라내 이어쓰기가 가능한 상태로 만듭니다.
+
+    Returns:
+        {파일 경로: "ok" | "error"}
+    """
+    done = {}
+    if not os.path.exists(output_path):
+        return done
+    valid = 0
+    with open(output_path, "rb+") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            done[record["file"]] = record["status"]
+            valid += len(line)
+        f.truncate(valid)
+    return done
+
+
+# --- 워커 ---
+
+# 프로세스 풀 워커별 상태 (워커 시작 시 한 번 생성)
+_worker = {}
+
+
+def _init_worker(process_mode, threads):
+    # 워커끼리 코어를 나눠 쓰도록 torch / ctranslate2 스레드 수 제한 (torch import 전에 설정)
+    os.environ.setdefault("OMP_NUM_THREADS", str(threads))
+    os.environ.setdefault("ASR_CPU_THREADS", str(threads))
+    import torch
+    torch.set_num_threads(threads)
+
+    from main import warmup_models
+    from emotion_system.response.responder import TieredResponder
+    from logic_classify_system.risk_based_classifier import RiskScoreClassifier
+
+    warmup_models(process_mode)
+    metrics.enable()  # 파일별 단계 시간 수집
+    _worker.update(
+        process_mode=process_mode,
+        responder=TieredResponder(),  # 응답 캐시는 워커 안에서 파일 간 공유
+        classifier=RiskScoreClassifier()
+    )
+
+
+def _stage_seconds(snapshot):
+    """메트릭 스냅샷 → {단계: 합계 초} (단계 외 라벨은 합침, 단계들을 감싸는 호출 전체 "call"은 제외)"""
+    stages = {}
+    for item in snapshot["histograms"].get("stage_seconds", []):
+        stage = item["labels"]["stage"]
+        if stage == "call":
+            continue
+        stages[stage] = stages.get(stage, 0.0) + item["sum"]
+    return stages
+
+
+def _analyze(path):
+    from main import analyze_file
+    from emotion_system.features.long_audio import audio_duration
+
+    metrics.reset()
+    started = time.perf_counter()
+    record = {"file": path, "status": "ok", "audio_seconds": None}
+    try:
+        record["audio_seconds"] = audio_duration(path)
+        record["segments"] = analyze_file(path, _worker["process_mode"], responder=_worker["responder"],
+                                          classifier=_worker["classifier"])
+    except Exception as e:  # 한 파일의 실패가 배치 전체를 멈추지 않도록 기록 후 계속
+        record.update(status="error", error=f"{type(e).__name__}: {e}")
+    record["seconds"] = time.perf_counter() - started
+    record["stages"] = _stage_seconds(metrics.snapshot())
+    record["worker"] = os.getpid()
+    return record
+
+
+# --- 실행 / 보고 ---
+
+class BatchReport:
+    """처리량(files/hour)과 단계별 누적 시간"""
+
+    def __init__(self, total, skipped):
+        self.total = total
+        self.skipped = skipped
+        self.ok = 0
+        self.failed = 0
+        self.audio_seconds = 0.0
+        self.stages = {}
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def add(self, record):
+        if record["status"] == "ok":
+            self.ok += 1
+        else:
+            self.failed += 1
+        self.audio_seconds += record.get("audio_seconds") or 0.0
+        for stage, seconds in record["stages"].items():
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    @property
+    def processed(self):
+        return self.ok + self.failed
+
+    def finish(self):
+        self.finished = time.perf_counter()
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def files_per_hour(self):
+        return self.processed / self.elapsed * 3600 if self.elapsed else 0.0
+
+    def progress(self, record):
+        remaining = self.total - self.skipped - self.processed
+        eta = remaining / self.files_per_hour * 60 if self.files_per_hour else 0.0
+        status = "✅" if record["status"] == "ok" else f"❌ {record.get('error')}"
+        return (f"[{self.skipped + self.processed}/{self.total}] {os.path.basename(record['file'])} "
+                f"{record['seconds']:.1f}s {status} | {self.files_per_hour:.1f} files/h, 남은 시간 {eta:.0f}분")
+
+    def as_dict(self):
+        return {
+            "total": self.total,
+            "skipped": self.skipped,
+            "ok": self.ok,
+            "failed": self.failed,
+            "wall_seconds": self.elapsed,
+            "files_per_hour": self.files_per_hour,
+            "audio_hours_per_hour": self.audio_seconds / self.elapsed if self.elapsed else 0.0,
+            "stage_seconds": dict(sorted(self.stages.items(), key=lambda item: -item[1])),
+            "stage_seconds_per_file": {stage: seconds / self.processed for stage, seconds in self.stages.items()}
+            if self.processed else {}
+        }
+
+    def format(self):
+        report = self.as_dict()
+        lines = [
+            f"처리 {report['ok']}개 성공 / {report['failed']}개 실패 / {report['skipped']}개 건너뜀 "
+            f"({report['wall_seconds'] / 60:.1f}분)",
+            f"처리량: {report['files_per_hour']:.1f} files/h, 오디오 {report['audio_hours_per_hour']:.2f}시간/h",
+            f"{'stage':<24}{'total(s)':>10}{'per file(s)':>14}{'share':>8}"
+        ]
+        total = sum(report["stage_seconds"].values()) or 1.0
+        for stage, seconds in report["stage_seconds"].items():
+            lines.append(f"{stage:<24}{seconds:>10.1f}{report['stage_seconds_per_file'][stage]:>14.2f}"
+                         f"{seconds / total * 100:>7.1f}%")
+        return "\n".join(lines)
+
+
+def _run_records(paths, process_mode, workers, threads):
+    """
+    파일별 결과 레코드를 완료 순서대로 생성 (workers가 1이면 현재 프로세스에서 순차 처리)
+
+    워커가 비정상 종료(OOM, segfault 등)되면 풀의 진행 중 작업이 모두 실패하고 어느 파일이 원인인지 알 수 없으므로,
+    풀을 새로 시작한 뒤 진행 중이던 파일을 하나씩 따로 다시 처리해 혼자서도 워커를 죽이는 파일만 실패로 기록합니다.
+    (실패 기록은 체크포인트에 남으므로 재실행 시 같은 파일에서 다시 멈추지 않음)
+    """
+    if not paths:
+        return
+    if workers <= 1:
+        _init_worker(process_mode, threads)
+        for path in paths:
+            yield _analyze(path)
+        return
+
+    def start_pool():
+        return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(process_mode, threads))
+
+    paths = iter(paths)
+    executor = start_pool()
+    pending = {}  # future → 경로
+    suspects = deque()  # 풀이 깨질 때 진행 중이던 파일 (하나씩 단독 실행)
+
+    def fill():
+        nonlocal paths
+        if suspects:
+            if not pending:
+                path = suspects.popleft()
+                pending[executor.submit(_analyze, path)] = path
+            return
+        # 대기 작업 수를 워커 수 x 2로 제한 (수천 개 파일도 한 번에 제출하지 않음)
+        taken = _take(paths, workers * 2 - len(pending))
+        for index, path in enumerate(taken):
+            try:
+                pending[executor.submit(_analyze, path)] = path
+            except BrokenProcessPool:
+                # 원인 작업의 future가 아직 완료 전 → 다음 wait에서 처리되고 풀이 재시작된 뒤 다시 제출
+                paths = itertools.chain(taken[index:], paths)
+                return
+
+    try:
+        fill()
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            broken, error = [], None
+            for future in finished:
+                path = pending.pop(future)
+                try:
+                    yield future.result()
+                except BrokenProcessPool as e:
+                    broken.append(path)
+                    error = e
+            if broken:
+                broken += pending.values()
+                pending.clear()
+                executor.shutdown(wait=False, cancel_futures=True)
+                executor = start_pool()
+                if len(broken) == 1:
+                    yield _failed_record(broken[0], error)
+                else:
+                    suspects.extend(broken)
+            fill()
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=not pending, cancel_futures=True)
+
+
+def _failed_record(path, error):
+    return {"file": path, "status": "error", "audio_seconds": None, "error": f"{type(error).__name__}: {error}",
+            "seconds": 0.0, "stages": {}, "worker": None}
+
+
+def _take(iterator, n):
+    return [path for _, path in zip(range(n), iterator)]
+
+
+def run_batch(source, output_path, process_mode="C", workers=1, threads=None, retry_failed=False):
+    """
+    일괄 분석 실행
+
+    Args:
+        source: 디렉터리 / 목록 파일 / 오디오 파일 경로
+        output_path: 결과 JSONL 경로 (체크포인트 겸용, 있으면 이어서 처리)
+        process_mode: "A" | "B" | "C" (main.analyze_file과 동일)
+        workers: 프로세스 수 (워커마다 모델을 한 벌씩 로드하므로 메모리에 맞게 설정)
+        threads: 워커당 연산 스레드 수 (None이면 CPU 수 / workers)
+        retry_failed: 이전 실행에서 실패한 파일도 다시 처리
+
+    Returns:
+        BatchReport
+    """
+    paths = collect_inputs(source)
+    done = load_checkpoint(output_path)
+    todo = [path for path in paths if path not in done or (retry_failed and done[path] != "ok")]
+    threads = threads or max((os.cpu_count() or 1) // max(workers, 1), 1)
+    report = BatchReport(len(paths), len(paths) - len(todo))
+    print(f"📂 {len(paths)}개 파일 중 {len(todo)}개 처리 (workers={workers}, threads={threads}, mode={process_mode})")
+
+    with open(output_path, "a", encoding="utf-8") as out:
+        for record in _run_records(todo, process_mode, workers, threads):
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            os.fsync(out.fileno())  # 기록된 줄은 중단되어도 남음 → 재실행 시 건너뜀
+            report.add(record)
+            print(report.progress(record))
+    report.finish()
+    return report
+
+
+def write_parquet(jsonl_path, parquet_path):
+    """결과 JSONL을 구간 단위 행(file, speaker, start, end, text, emotion, ...)으로 펼쳐 Parquet으로 저장"""
+    import pandas as pd
+
+    rows = []
+    with open(jsonl_path, encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            for index, segment in enumerate(record.get("segments") or []):
+                row = {"file": record["file"], "segment": index, **segment}
+                if "comparison" in row:
+                    row["comparison"] = json.dumps(row["comparison"], ensure_ascii=False)
+                rows.append(row)
+    pd.DataFrame(rows).to_parquet(parquet_path, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", help="오디오 디렉터리, 경로 목록(.txt) 또는 manifest(.jsonl)")
+    parser.add_argument("--output", default="batch_results.jsonl", help="결과 JSONL (체크포인트 겸용)")
+    parser.add_argument("--mode", choices=["A", "B", "C"], default="C")
+    parser.add_argument("--workers", type=int, default=max((os.cpu_count() or 1) // 4, 1))
+    parser.add_argument("--threads", type=int, default=None, help="워커당 연산 스레드 수")
+    parser.add_argument("--retry-failed", action="store_true", help="이전에 실패한 파일도 다시 처리")
+    parser.add_argument("--parquet", default=None, help="구간 단위 Parquet 출력 경로")
+    parser.add_argument("--report", default=None, help="처리량 / 단계별 시간 보고서 JSON 경로")
+    args = parser.parse_args()
+
+    report = run_batch(args.source, args.output, args.mode, args.workers, args.threads, args.retry_failed)
+    print("\n" + report.format())
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report.as_dict(), f, ensure_ascii=False, indent=2)
+    if args.parquet:
+        try:
+            write_parquet(args.output, args.parquet)
+            print(f"Parquet 저장: {args.parquet}")
+        except ImportError as e:
+            print(f"Warning: Parquet 출력에는 pandas와 pyarrow가 필요합니다: {e}")
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+'''
+ASR 백엔드 설정별 벤치마크
+모델 크기 / compute_type / beam size / 스레드 수 조합마다 실시간 배율(RTF)과
+참조 전사 대비 WER / CER을 측정합니다. RTF < 1이면 실시간보다 빠릅니다.
+
+참조 전사는 benchmarks/data/asr_ko_reference.txt에 있습니다. 녹음 파일은 저장소에 포함하지 않으므로
+참조 전사를 한 줄씩 소리 내어 읽은 녹음(mono, 16kHz 권장, 다른 형식은 자동 변환)을 만들어 --audio로 지정합니다.
+(예: ffmpeg -f pulse -i default -ac 1 -ar 16000 asr_ko_sample.wav / Windows는 음성 녹음기 → m4a도 가능)
+
+실행: python -m benchmarks.bench_asr --audio sample.wav [--sizes small medium] [--compute-types int8 float32]
+      [--beams 1 5] [--threads 4] [--backend faster-whisper] [--device auto]
+'''
+
+import argparse
+import itertools
+import os
+import re
+import time
+
+from emotion_system.asr import ASRConfig, load_asr_model, transcribe
+from emotion_system.model_registry import registry
+from emotion_system.utils.audio_utils import load_audio
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+DEFAULT_REFERENCE = os.path.join(DATA_DIR, "asr_ko_reference.txt")
+
+
+def normalize(text):
+    """문장부호 제거 + 공백 정규화"""
+    return " ".join(re.sub(r"[^\w\s]", " ", text).split())
+
+
+def edit_distance(ref, hyp):
+    previous = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        current = [i]
+        for j, h in enumerate(hyp, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (r != h)))
+        previous = current
+    return previous[-1]
+
+
+def error_rates(reference, hypothesis):
+    """(WER, CER) — CER은 공백을 제외한 음절 단위"""
+    ref, hyp = normalize(reference), normalize(hypothesis)
+    ref_words, hyp_words = ref.split(), hyp.split()
+    ref_chars, hyp_chars = ref.replace(" ", ""), hyp.replace(" ", "")
+    wer = edit_distance(ref_words, hyp_words) / max(len(ref_words), 1)
+    cer = edit_distance(ref_chars, hyp_chars) / max(len(ref_chars), 1)
+    return wer, cer
+
+
+def run(audio, reference, config, repeat=2):
+    load_asr_model(config)  # 로드 시간은 측정에서 제외
+    best, text = float("inf"), ""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        segments = transcribe(audio, config)
+        best = min(best, time.perf_counter() - started)
+        text = " ".join(segment.text for segment in segments)
+    wer, cer = error_rates(reference, text)
+    return best, wer, cer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--audio", required=True, help="참조 전사를 읽은 녹음 파일")
+    parser.add_argument("--reference", default=DEFAULT_REFERENCE)
+    parser.add_argument("--backend", default="faster-whisper")
+    parser.add_argument("--device", default="auto")
+    parser.add_argument("--sizes", nargs="+", default=["tiny", "base", "small", "medium"])
+    parser.add_argument("--compute-types", nargs="+", default=["auto"])
+    parser.add_argument("--beams", nargs="+", type=int, default=[1, 5])
+    parser.add_argument("--threads", nargs="+", type=int, default=[0])
+    parser.add_argument("--repeat", type=int, default=2)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.audio):
+        raise SystemExit(f"오디오 파일이 없습니다: {args.audio} (참조 전사 {args.reference}를 읽은 녹음을 지정하세요)")
+
+    audio = load_audio(args.audio)
+    duration = len(audio) / 16000
+    with open(args.reference, encoding="utf-8") as f:
+        reference = f.read()
+
+    print(f"audio: {args.audio} ({duration:.1f}s)")
+    print(f"{'size':<10}{'device':<8}{'compute':<10}{'beam':>6}{'threads':>9}{'sec':>9}{'RTF':>8}{'WER':>8}{'CER':>8}")
+    for size, compute_type in itertools.product(args.sizes, args.compute_types):
+        for beam, threads in itertools.product(args.beams, args.threads):
+            config = ASRConfig(backend=args.backend, model_size=size, device=args.device,
+                               compute_type=compute_type, beam_size=beam, cpu_threads=threads).resolved()
+            seconds, wer, cer = run(audio, reference, config, args.repeat)
+            print(f"{size:<10}{config.device:<8}{config.compute_type:<10}{beam:>6}{threads:>9}"
+                  f"{seconds:>9.2f}{seconds / duration:>8.3f}{wer * 100:>7.1f}%{cer * 100:>7.1f}%")
+        # 다음 모델 크기로 넘어가기 전에 메모리 해제
+        registry.unload("asr")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+'''
+SimpleLSTM 음향 감정 모델 fp32 vs int8 동적 양자화 벤치마크
+무작위 가변 길이 프레임 특징으로 처리량(구간/초)과 라벨 일치율을 비교합니다.
+
+실행: python -m benchmarks.bench_audio_quantization [--segments 512] [--batch 64]
+'''
+
+import argparse
+import time
+
+import numpy as np
+import torch
+
+from emotion_system.emotion.audio_emotion import classify_audio_emotion_batch
+from emotion_system.features.extract_features import FRAME_FEATURE_DIM
+
+
+def make_segments(n, min_frames=20, max_frames=400, seed=0):
+    rng = np.random.default_rng(seed)
+    return [rng.standard_normal((rng.integers(min_frames, max_frames), FRAME_FEATURE_DIM)).astype(np.float32)
+            for _ in range(n)]
+
+
+def run(segments, batch_size, quantized, repeat=3):
+    labels = []
+    best = float("inf")
+    for _ in range(repeat):
+        labels = []
+        started = time.perf_counter()
+        for b in range(0, len(segments), batch_size):
+            labels.extend(label for label, _ in
+                          classify_audio_emotion_batch(segments[b:b + batch_size], quantized=quantized))
+        best = min(best, time.perf_counter() - started)
+    return labels, len(segments) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--segments", type=int, default=512)
+    parser.add_argument("--batch", type=int, default=64)
+    parser.add_argument("--threads", type=int, default=None)
+    args = parser.parse_args()
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    segments = make_segments(args.segments)
+    fp32_labels, fp32_tput = run(segments, args.batch, quantized=False)
+    int8_labels, int8_tput = run(segments, args.batch, quantized=True)
+    agreement = np.mean([a == b for a, b in zip(fp32_labels, int8_labels)])
+
+    print(f"{'variant':<8}{'segments/s':>14}")
+    print(f"{'fp32':<8}{fp32_tput:>14.1f}")
+    print(f"{'int8':<8}{int8_tput:>14.1f}")
+    print(f"speedup: {int8_tput / fp32_tput:.2f}x, label agreement: {agreement * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
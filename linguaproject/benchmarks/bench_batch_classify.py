@@ -0,0 +1,60 @@
+'''
+RiskScoreClassifier.classify_stream 워커 수별 처리량 벤치마크
+합성 발화 레코드를 제너레이터로 흘려보내며 처리량(건/초)과 최대 RSS를 측정합니다.
+
+실행: python -m benchmarks.bench_batch_classify [--records 200000] [--workers 1 2 4]
+'''
+
+import argparse
+import os
+import random
+import resource
+import time
+
+from logic_classify_system.classification_criteria import ClassificationCriteria
+from logic_classify_system.risk_based_classifier import (
+    ClassificationRecord,
+    ConsultationMetadata,
+    RiskScoreClassifier
+)
+
+FILLER = ["안녕하세요", "환불", "문의드립니다", "배송이", "아직", "안 왔어요", "확인", "부탁드립니다", "네", "감사합니다"]
+
+
+def synthetic_records(n, seed=0):
+    """키워드와 일반 단어를 섞은 합성 발화 제너레이터 (메모리에 쌓지 않음)"""
+    rng = random.Random(seed)
+    keywords = [kw for group in ClassificationCriteria.KEYWORD_GROUPS for kw in getattr(ClassificationCriteria, group)]
+    metadata = ConsultationMetadata(consultation_content="고충 상담", consultation_result="추가 상담 필요")
+    for _ in range(n):
+        words = rng.choices(FILLER, k=rng.randint(3, 15))
+        if rng.random() < 0.2:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(keywords))
+        yield ClassificationRecord(text=" ".join(words), metadata=metadata)
+
+
+def peak_rss_mb():
+    # Linux ru_maxrss 단위는 KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=200000)
+    parser.add_argument("--chunk-size", type=int, default=512)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    classifier = RiskScoreClassifier()
+    print(f"{'workers':>8}{'records/s':>14}{'seconds':>10}{'peak RSS(MB)':>14}")
+    for workers in args.workers:
+        started = time.perf_counter()
+        count = sum(1 for _ in classifier.classify_stream(
+            synthetic_records(args.records), workers=workers, chunk_size=args.chunk_size))
+        elapsed = time.perf_counter() - started
+        print(f"{workers:>8}{count / elapsed:>14.0f}{elapsed:>10.2f}{peak_rss_mb():>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+'''
+CLI / 분류기 시작 시간 예산 확인
+새 인터프리터에서 모듈을 import하는 데 걸린 시간을 재고, 무거운 의존성
+(torch, transformers, pyannote, whisper, sounddevice 등)이 모드 선택 전에
+로드되지 않았는지 확인합니다. 예산을 넘거나 무거운 모듈이 로드되면 종료 코드 1을 반환합니다.
+
+실행: python -m benchmarks.bench_startup [--budget 1.0] [--repeat 5]
+'''
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 시작 시점에 로드되면 안 되는 모듈
+HEAVY_MODULES = ("torch", "transformers", "pyannote", "whisper", "faster_whisper", "ctranslate2",
+                 "sounddevice", "librosa")
+
+# (이름, import 대상)
+TARGETS = [
+    ("main (CLI)", "main"),
+    ("logic_classify_system", "logic_classify_system.risk_based_classifier"),
+]
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+heavy = sorted(m for m in {heavy!r} if m in sys.modules)
+print(json.dumps({{"seconds": elapsed, "heavy": heavy}}))
+"""
+
+
+def measure(module, repeat):
+    """새 프로세스에서 import 시간(최솟값)과 로드된 무거운 모듈 목록"""
+    best, heavy = float("inf"), []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            cwd=PROJECT_DIR, capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        best = min(best, result["seconds"])
+        heavy = result["heavy"]
+    return best, heavy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--budget", type=float, default=1.0, help="import 시간 예산 (초)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'target':<24}{'import (s)':>12}  heavy modules")
+    for name, module in TARGETS:
+        seconds, heavy = measure(module, args.repeat)
+        ok = seconds <= args.budget and not heavy
+        failed |= not ok
+        print(f"{name:<24}{seconds:>12.3f}  {', '.join(heavy) or '-'}{'' if ok else '  ✗'}")
+
+    print(f"budget: {args.budget:.2f}s → {'FAIL' if failed else 'OK'}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
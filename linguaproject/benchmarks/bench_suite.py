@@ -0,0 +1,213 @@
+'''
+파이프라인 단계별 오프라인 벤치마크 스위트
+합성 발화 / 합성 16kHz 오디오 / 무작위 초기화 로컬 모델로 네트워크 없이 실행하고,
+단계마다 여러 입력 크기에서 시간을 재어 JSON으로 저장합니다.
+--compare로 이전 커밋의 결과 JSON과 비교할 수 있습니다.
+
+실행: python -m benchmarks.bench_suite [--output bench_results.json] [--scale base|small]
+      [--stages extract_features risk_classify ...] [--repeat 5] [--compare old.json]
+'''
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from benchmarks.synthetic import SAMPLE_RATE, install_offline_models, synthetic_audio, synthetic_utterances
+
+
+def timeit(fn, repeat, warmup=1):
+    """warmup 후 repeat회 실행한 소요 시간 리스트 (초)"""
+    for _ in range(warmup):
+        fn()
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return times
+
+
+# --- 단계별 벤치마크: size → 실행 함수 (size는 입력 개수 또는 오디오 길이) ---
+
+def bench_extract_features(size):
+    from emotion_system.features.extract_features import extract_features
+    audio = synthetic_audio(size)
+    return lambda: extract_features(audio, SAMPLE_RATE, 0.0, size)
+
+
+def bench_segment_frame_features(size):
+    from emotion_system.features.extract_features import segment_frame_features
+    audio = synthetic_audio(60)
+    spans = [(i * 60 / size, (i + 1) * 60 / size) for i in range(size)]
+    return lambda: segment_frame_features(audio, spans)
+
+
+def bench_long_audio_statistics(size):
+    import tempfile
+    import soundfile as sf
+    from emotion_system.features.long_audio import segment_statistics
+    path = os.path.join(tempfile.mkdtemp(prefix="lingua_bench_"), "long.wav")
+    sf.write(path, synthetic_audio(size), SAMPLE_RATE, subtype="PCM_16")
+    spans = [(start, start + 4.0) for start in range(0, size, 5)]
+    return lambda: segment_statistics(path, spans)
+
+
+def bench_text_emotion(size):
+    from emotion_system.emotion.text_emotion import classify_text_emotion_batch
+    texts = synthetic_utterances(size, seed=1)
+    return lambda: classify_text_emotion_batch(texts)
+
+
+def bench_audio_emotion(size):
+    import numpy as np
+    from emotion_system.emotion.audio_emotion import classify_audio_emotion_batch
+    from emotion_system.features.extract_features import FRAME_FEATURE_DIM
+    rng = np.random.default_rng(size)
+    mats = [rng.standard_normal((rng.integers(30, 300), FRAME_FEATURE_DIM)).astype(np.float32) for _ in range(size)]
+    return lambda: classify_audio_emotion_batch(mats)
+
+
+def bench_criteria_classify_text(size):
+    from logic_classify_system.classification_criteria import ClassificationCriteria
+    texts = synthetic_utterances(size, seed=2)
+    return lambda: [ClassificationCriteria.classify_text(text) for text in texts]
+
+
+def _metadata_list(size):
+    from logic_classify_system.risk_based_classifier import ConsultationMetadata
+    metadata = ConsultationMetadata(consultation_content="고충 상담", consultation_result="추가 상담 필요")
+    return [metadata] * size
+
+
+def bench_risk_classify(size):
+    from logic_classify_system.risk_based_classifier import RiskScoreClassifier
+    classifier = RiskScoreClassifier()
+    texts, metadata_list = synthetic_utterances(size, seed=3), _metadata_list(size)
+    return lambda: [classifier.classify(text, metadata=metadata) for text, metadata in zip(texts, metadata_list)]
+
+
+def bench_risk_batch_classify(size):
+    from logic_classify_system.risk_based_classifier import RiskScoreClassifier
+    classifier = RiskScoreClassifier()
+    texts, metadata_list = synthetic_utterances(size, seed=4), _metadata_list(size)
+    return lambda: classifier.batch_classify(texts, metadata_list=metadata_list)
+
+
+def bench_compare_actions(size):
+    from emotion_system.response.compare_actions import compare_actions
+    texts = synthetic_utterances(size, seed=5)
+    return lambda: [compare_actions(text, "환불 접수 후 3일 내 처리", "처리 지연 중") for text in texts]
+
+
+def bench_generate_response(size, max_new_tokens=32):
+    from emotion_system.response.generate_response import generate_responses
+    items = [("불만", text) for text in synthetic_utterances(size, seed=6)]
+    return lambda: generate_responses(items, max_new_tokens=max_new_tokens, do_sample=False)
+
+
+# 단계 이름 → (벤치마크 함수, 입력 크기들, 크기 단위)
+STAGES = {
+    "extract_features": (bench_extract_features, [1, 5, 30], "seconds"),
+    "segment_frame_features": (bench_segment_frame_features, [1, 10, 100], "segments"),
+    "long_audio_statistics": (bench_long_audio_statistics, [60, 300], "seconds"),
+    "classify_text_emotion": (bench_text_emotion, [1, 8, 32], "texts"),
+    "classify_audio_emotion": (bench_audio_emotion, [1, 8, 32], "segments"),
+    "criteria_classify_text": (bench_criteria_classify_text, [100, 1000, 10000], "texts"),
+    "risk_classify": (bench_risk_classify, [100, 1000, 10000], "texts"),
+    "risk_batch_classify": (bench_risk_batch_classify, [100, 1000, 10000], "texts"),
+    "compare_actions": (bench_compare_actions, [100, 1000, 10000], "texts"),
+    "generate_response": (bench_generate_response, [1, 4], "texts"),
+}
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(stages, repeat, scale, seed=0):
+    import torch
+
+    install_offline_models(scale, seed)
+    results = []
+    for stage in stages:
+        bench, sizes, unit = STAGES[stage]
+        for size in sizes:
+            times = timeit(bench(size), repeat)
+            best = min(times)
+            results.append({
+                "stage": stage,
+                "size": size,
+                "unit": unit,
+                "repeat": repeat,
+                "min_s": best,
+                "median_s": statistics.median(times),
+                "mean_s": statistics.fmean(times),
+                "items_per_s": size / best if best else None
+            })
+            print(f"{stage:<24}{size:>7} {unit:<9}{best * 1000:>11.2f} ms{size / best:>14.1f} /s")
+
+    meta = {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "torch": torch.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "torch_threads": torch.get_num_threads(),
+        "scale": scale,
+        "seed": seed
+    }
+    return {"meta": meta, "results": results}
+
+
+def compare(current, baseline_path):
+    """이전 결과 대비 min_s 변화율 출력 (+는 느려짐)"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    previous = {(r["stage"], r["size"]): r["min_s"] for r in baseline["results"]}
+    print(f"\nvs {baseline['meta'].get('commit')} ({baseline_path})")
+    for r in current["results"]:
+        before = previous.get((r["stage"], r["size"]))
+        if before:
+            change = (r["min_s"] - before) / before * 100
+            print(f"{r['stage']:<24}{r['size']:>7}{change:>+10.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--scale", choices=["small", "base"], default="base")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--compare", default=None, help="비교할 이전 결과 JSON")
+    args = parser.parse_args()
+
+    if args.threads:
+        import torch
+        torch.set_num_threads(args.threads)
+
+    print(f"{'stage':<24}{'size':>7} {'unit':<9}{'min':>14}{'throughput':>16}")
+    report = run_suite(args.stages, args.repeat, args.scale, args.seed)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {args.output}")
+
+    if args.compare:
+        compare(report, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+'''
+오프라인 벤치마크용 합성 데이터와 로컬 모델
+네트워크 없이 재현 가능하도록 합성 한국어 발화, 합성 16kHz 오디오를 만들고
+허브 다운로드 대신 무작위 초기화한 로컬 config 모델을 레지스트리에 등록합니다.
+'''
+
+import os
+import random
+import tempfile
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+SUBJECTS = ["제가", "저희 집", "어머니가", "회사에서", "지난달에", "어제", "오늘 아침에", "아이가"]
+OBJECTS = ["요금이", "배송이", "환불이", "상품이", "상담원이", "인터넷이", "카드 결제가", "예약이"]
+PREDICATES = [
+    "너무 많이 나왔어요", "아직 안 왔어요", "처리가 안 되고 있어요", "고장 났어요",
+    "연결이 안 돼요", "취소가 안 돼요", "두 번 결제됐어요", "확인 부탁드립니다",
+    "정말 감사합니다", "언제쯤 되는지 궁금해요", "설명이 이해가 안 돼요", "다시 안내해 주세요"
+]
+ENDINGS = ["", "빨리 해결해 주세요", "벌써 세 번째 전화예요", "도와주셔서 고맙습니다", "어떻게 해야 하나요"]
+
+
+def _keywords():
+    from logic_classify_system.classification_criteria import ClassificationCriteria
+    return [kw for group in ClassificationCriteria.KEYWORD_GROUPS for kw in getattr(ClassificationCriteria, group)]
+
+
+def synthetic_utterances(n, seed=0, keyword_rate=0.2):
+    """
+    합성 한국어 발화 리스트
+
+    주어/대상/서술어 조합에 일부 발화는 분류 기준 키워드를 섞어 규칙 경로도 실행되게 합니다.
+    """
+    rng = random.Random(seed)
+    keywords = _keywords()
+    texts = []
+    for _ in range(n):
+        words = [rng.choice(SUBJECTS), rng.choice(OBJECTS), rng.choice(PREDICATES), rng.choice(ENDINGS)]
+        if rng.random() < keyword_rate:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(keywords))
+        texts.append(" ".join(word for word in words if word))
+    return texts
+
+
+def synthetic_audio(seconds, sr=SAMPLE_RATE, seed=0):
+    """
+    말소리와 비슷한 합성 오디오 (float32 mono)
+
+    피치가 흔들리는 배음 신호를 음절 길이로 켜고 끄고, 사이에 무음과 배경 잡음을 넣습니다.
+    """
+    rng = np.random.default_rng(seed)
+    n = int(seconds * sr)
+    t = np.arange(n, dtype=np.float32) / sr
+    pitch = 120 + 40 * np.sin(2 * np.pi * 0.5 * t) + rng.normal(0, 2, n).cumsum() / sr
+    phase = 2 * np.pi * np.cumsum(pitch) / sr
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 6))
+
+    # 0.15~0.4초 음절 / 0.05~0.5초 무음 반복
+    envelope = np.zeros(n, dtype=np.float32)
+    position = 0
+    while position < n:
+        length = int(rng.uniform(0.15, 0.4) * sr)
+        envelope[position:position + length] = np.hanning(len(envelope[position:position + length]))
+        position += length + int(rng.uniform(0.05, 0.5) * sr)
+    audio = 0.3 * voiced * envelope + rng.normal(0, 0.005, n)
+    return audio.astype(np.float32)
+
+
+def _bert_tokenizer(texts, directory):
+    from transformers import BertTokenizerFast
+
+    words = sorted({word for text in texts for word in text.split()})
+    chars = sorted({char for text in texts for char in text if not char.isspace()})
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + words + chars + ["##" + c for c in chars]
+    path = os.path.join(directory, "vocab.txt")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(dict.fromkeys(vocab)))
+    return BertTokenizerFast(vocab_file=path, tokenize_chinese_chars=False)
+
+
+def _gpt2_tokenizer(texts, vocab_size=2000):
+    from tokenizers import Tokenizer, decoders, models, pre_tokenizers, trainers
+    from transformers import PreTrainedTokenizerFast
+
+    tokenizer = Tokenizer(models.BPE(unk_token="<unk>"))
+    tokenizer.pre_tokenizer = pre_tokenizers.ByteLevel(add_prefix_space=False)
+    tokenizer.decoder = decoders.ByteLevel()
+    trainer = trainers.BpeTrainer(vocab_size=vocab_size, special_tokens=["<pad>", "</s>", "<unk>"],
+                                  initial_alphabet=pre_tokenizers.ByteLevel.alphabet(), show_progress=False)
+    tokenizer.train_from_iterator(texts, trainer)
+    return PreTrainedTokenizerFast(tokenizer_object=tokenizer, eos_token="</s>", pad_token="<pad>",
+                                   unk_token="<unk>")
+
+
+# scale별 모델 크기 ("base"는 monologg/kobert, skt/kogpt2-base-v2와 같은 차원)
+MODEL_SCALES = {
+    "small": {"bert": dict(vocab_size=8002, hidden_size=256, num_hidden_layers=4, num_attention_heads=4,
+                           intermediate_size=1024),
+              "gpt2": dict(vocab_size=51200, n_embd=256, n_layer=4, n_head=4)},
+    "base": {"bert": dict(vocab_size=8002, hidden_size=768, num_hidden_layers=12, num_attention_heads=12,
+                          intermediate_size=3072),
+             "gpt2": dict(vocab_size=51200, n_embd=768, n_layer=12, n_head=12)},
+}
+
+
+def install_offline_models(scale="base", seed=0):
+    """
+    KoBERT / KoGPT2 / SimpleLSTM 로더를 무작위 초기화 로컬 모델로 교체
+
+    가중치는 무작위이므로 라벨과 응답 내용은 의미가 없고, 연산량(차원/층 수)만 실제 모델과 같습니다.
+    """
+    os.environ.setdefault("HF_HUB_OFFLINE", "1")
+    os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+    import torch
+    from transformers import BertConfig, BertForSequenceClassification, GPT2Config, GPT2LMHeadModel
+
+    from emotion_system.emotion import audio_emotion, text_emotion  # noqa: F401  기본 로더 등록 후 교체
+    from emotion_system.emotion.label_map import label_map
+    from emotion_system.model_registry import registry
+    from emotion_system.response import generate_response  # noqa: F401
+
+    dims = MODEL_SCALES[scale]
+    corpus = synthetic_utterances(2000, seed=seed, keyword_rate=0.5)
+    directory = tempfile.mkdtemp(prefix="lingua_bench_")
+
+    def load_kobert():
+        torch.manual_seed(seed)
+        model = BertForSequenceClassification(BertConfig(num_labels=len(label_map), **dims["bert"]))
+        return registry.get("kobert_tokenizer"), model.eval()
+
+    def load_kogpt2():
+        torch.manual_seed(seed)
+        tokenizer = _gpt2_tokenizer(corpus)
+        return tokenizer, GPT2LMHeadModel(GPT2Config(**dims["gpt2"])).eval()
+
+    def load_audio_lstm(checkpoint_path=os.path.join(directory, "missing.pt"), quantized=False):
+        torch.manual_seed(seed)
+        return audio_emotion._load_audio_lstm(checkpoint_path, quantized)
+
+    registry.register("kobert_tokenizer", lambda: _bert_tokenizer(corpus, directory))
+    registry.register("kobert_emotion", load_kobert)
+    registry.register("kogpt2", load_kogpt2)
+    registry.register("audio_lstm", load_audio_lstm)
+    registry.unload()
+    return registry
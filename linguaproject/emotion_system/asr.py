@@ -0,0 +1,162 @@
+'''
+ASR(음성 인식) 백엔드 설정 및 전사
+faster-whisper / openai-whisper 중 백엔드를 고르고 device, compute_type,
+모델 크기, beam size, 스레드 수를 설정합니다.
+GPU가 없으면 기본값은 CPU int8 faster-whisper입니다.
+환경 변수: ASR_BACKEND, ASR_MODEL_SIZE, ASR_DEVICE, ASR_COMPUTE_TYPE, ASR_BEAM_SIZE, ASR_CPU_THREADS
+'''
+
+import os
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from typing import List, Optional
+
+from .metrics import metrics
+from .model_registry import registry
+
+BACKENDS = ("faster-whisper", "openai-whisper")
+
+
+@dataclass(frozen=True)
+class ASRConfig:
+    """ASR 백엔드 설정"""
+    backend: str = "faster-whisper"   # "faster-whisper" | "openai-whisper"
+    model_size: str = "medium"        # tiny / base / small / medium / large-v3 ...
+    device: str = "auto"              # "auto" | "cpu" | "cuda"
+    compute_type: str = "auto"        # "auto" | "int8" | "int8_float16" | "float16" | "float32"
+    beam_size: int = 5
+    cpu_threads: int = 0              # 0이면 백엔드 기본값
+    language: str = "ko"
+
+    @classmethod
+    def from_env(cls) -> "ASRConfig":
+        defaults = cls()
+        return cls(
+            backend=os.getenv("ASR_BACKEND", defaults.backend),
+            model_size=os.getenv("ASR_MODEL_SIZE", defaults.model_size),
+            device=os.getenv("ASR_DEVICE", defaults.device),
+            compute_type=os.getenv("ASR_COMPUTE_TYPE", defaults.compute_type),
+            beam_size=int(os.getenv("ASR_BEAM_SIZE", defaults.beam_size)),
+            cpu_threads=int(os.getenv("ASR_CPU_THREADS", defaults.cpu_threads)),
+            language=os.getenv("ASR_LANGUAGE", defaults.language)
+        )
+
+    def resolved(self) -> "ASRConfig":
+        """auto 값을 실제 device / compute_type으로 확정"""
+        if self.backend not in BACKENDS:
+            raise ValueError(f"지원하지 않는 ASR 백엔드입니다: {self.backend} (가능: {', '.join(BACKENDS)})")
+        device = self.device
+        if device == "auto":
+            device = "cuda" if _cuda_available(self.backend) else "cpu"
+        compute_type = self.compute_type
+        if compute_type == "auto":
+            compute_type = "float16" if device == "cuda" else "int8"
+        if self.backend == "openai-whisper" and compute_type not in ("float16", "float32"):
+            # openai-whisper는 int8을 지원하지 않음
+            compute_type = "float16" if device == "cuda" else "float32"
+        return replace(self, device=device, compute_type=compute_type)
+
+
+@dataclass
+class ASRSegment:
+    """백엔드 공통 전사 구간"""
+    start: float
+    end: float
+    text: str
+    words: List[dict] = field(default_factory=list)  # [{"word", "start", "end"}, ...]
+
+
+@lru_cache(maxsize=None)
+def _cuda_available(backend: str) -> bool:
+    try:
+        if backend == "faster-whisper":
+            import ctranslate2
+            return ctranslate2.get_cuda_device_count() > 0
+        import torch
+        return torch.cuda.is_available()
+    except ImportError:
+        return False
+
+
+def _asr_options(backend=None, model_size=None, device=None, compute_type=None, cpu_threads=None):
+    """생략한 옵션을 ASRConfig.from_env()로 채우고 auto 값을 확정 (같은 설정이면 항상 같은 레지스트리 키)"""
+    defaults = ASRConfig.from_env()
+    config = replace(
+        defaults,
+        backend=backend or defaults.backend,
+        model_size=model_size or defaults.model_size,
+        device=device or defaults.device,
+        compute_type=compute_type or defaults.compute_type,
+        cpu_threads=defaults.cpu_threads if cpu_threads is None else cpu_threads
+    ).resolved()
+    return {"backend": config.backend, "model_size": config.model_size, "device": config.device,
+            "compute_type": config.compute_type, "cpu_threads": config.cpu_threads}
+
+
+def _load_asr(backend, model_size, device, compute_type, cpu_threads):
+    if backend == "faster-whisper":
+        from faster_whisper import WhisperModel
+        return WhisperModel(model_size, device=device, compute_type=compute_type, cpu_threads=cpu_threads)
+
+    import torch
+    import whisper
+    if cpu_threads:
+        torch.set_num_threads(cpu_threads)
+    return whisper.load_model(model_size, device=device)
+
+
+registry.register("asr", _load_asr, resolve=_asr_options)
+
+
+def load_asr_model(config: Optional[ASRConfig] = None):
+    """
+    설정에 맞는 ASR 모델 반환 (레지스트리 캐시)
+
+    config가 None이면 환경 변수 기본 설정 모델을 사용합니다.
+    (None과 ASRConfig.from_env()는 같은 모델을 공유하므로 warmup한 모델을 실시간 모드에서도 그대로 사용)
+    """
+    config = (config or ASRConfig.from_env()).resolved()
+    return registry.get("asr", backend=config.backend, model_size=config.model_size, device=config.device,
+                        compute_type=config.compute_type, cpu_threads=config.cpu_threads)
+
+
+@metrics.timed("asr")
+def transcribe(audio, config: Optional[ASRConfig] = None, word_timestamps: bool = False) -> List[ASRSegment]:
+    """
+    오디오 전사
+
+    Args:
+        audio: 16kHz mono float32 배열 또는 파일 경로
+        config: ASR 설정 (None이면 ASRConfig.from_env())
+        word_timestamps: 단어 단위 타임스탬프 포함 여부
+
+    Returns:
+        ASRSegment 리스트
+    """
+    config = (config or ASRConfig.from_env()).resolved()
+    model = load_asr_model(config)
+
+    if config.backend == "faster-whisper":
+        segments, _ = model.transcribe(audio, language=config.language, beam_size=config.beam_size,
+                                       word_timestamps=word_timestamps)
+        return [
+            ASRSegment(
+                start=segment.start,
+                end=segment.end,
+                text=segment.text,
+                words=[{"word": w.word, "start": w.start, "end": w.end} for w in (segment.words or [])]
+            )
+            for segment in segments
+        ]
+
+    result = model.transcribe(audio, language=config.language, beam_size=config.beam_size,
+                              word_timestamps=word_timestamps, fp16=config.compute_type == "float16")
+    return [
+        ASRSegment(
+            start=segment["start"],
+            end=segment["end"],
+            text=segment["text"],
+            words=[{"word": w["word"], "start": w["start"], "end": w["end"]} for w in segment.get("words", [])]
+        )
+        for segment in result["segments"]
+    ]
@@ -0,0 +1,92 @@
+'''
+실시간 모드용 온라인 화자 분리
+발화(또는 ASR 구간)마다 화자 임베딩을 한 번 추출하고, 통화 동안 유지되는
+화자별 centroid에 증분 클러스터링으로 배정합니다.
+발화당 비용은 임베딩 1회 + (화자 수 x 임베딩 차원)으로 일정하고,
+화자 라벨은 통화 전체에서 유지됩니다.
+'''
+
+import numpy as np
+import torch
+from ..model_registry import registry
+
+
+def _load_speaker_embedding(hf_token=None, model_name="pyannote/embedding"):
+    from pyannote.audio import Inference, Model
+    model = Model.from_pretrained(model_name, use_auth_token=hf_token)
+    return Inference(model, window="whole")
+
+
+registry.register("speaker_embedding", _load_speaker_embedding)
+
+
+class OnlineDiarizer:
+    """통화 단위 증분 화자 클러스터링"""
+
+    def __init__(self, hf_token=None, threshold=0.5, max_speakers=4, min_duration=0.5,
+                 samplerate=16000, embed_fn=None):
+        """
+        Args:
+            threshold: 기존 화자로 배정할 최소 코사인 유사도
+            max_speakers: 최대 화자 수 (도달하면 가장 가까운 화자로 배정)
+            min_duration: 이보다 짧은 구간은 임베딩 없이 직전 화자로 배정 (초)
+            embed_fn: float32 오디오 → 1차원 임베딩 함수 (기본: pyannote/embedding)
+        """
+        self.hf_token = hf_token
+        self.threshold = threshold
+        self.max_speakers = max_speakers
+        self.min_samples = int(min_duration * samplerate)
+        self.samplerate = samplerate
+        self.embed_fn = embed_fn or self._pyannote_embedding
+
+        self._sums = None      # (화자 수, dim) 정규화 임베딩 합
+        self._counts = []      # 화자별 배정 횟수
+        self._last_label = None
+
+    def _pyannote_embedding(self, audio):
+        inference = registry.get("speaker_embedding", hf_token=self.hf_token)
+        waveform = torch.from_numpy(np.ascontiguousarray(audio, dtype=np.float32)).unsqueeze(0)
+        return inference({"waveform": waveform, "sample_rate": self.samplerate})
+
+    @staticmethod
+    def _label(index):
+        return f"SPEAKER_{index:02d}"
+
+    @property
+    def num_speakers(self):
+        return len(self._counts)
+
+    def assign(self, audio):
+        """
+        발화 구간의 화자 라벨 반환 (centroid 제자리 갱신)
+
+        Args:
+            audio: 한 화자의 발화로 가정하는 float32 오디오 구간
+        """
+        if len(audio) < self.min_samples and self._last_label is not None:
+            return self._last_label
+
+        embedding = np.asarray(self.embed_fn(audio), dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(embedding)
+        if not np.isfinite(norm) or norm == 0:
+            return self._last_label or self._label(0)
+        embedding /= norm
+
+        if self._sums is None:
+            self._sums = embedding[None].copy()
+            self._counts = [1]
+            index = 0
+        else:
+            centroids = self._sums / np.linalg.norm(self._sums, axis=1, keepdims=True)
+            similarities = centroids @ embedding
+            index = int(np.argmax(similarities))
+            if similarities[index] >= self.threshold or self.num_speakers >= self.max_speakers:
+                self._sums[index] += embedding
+                self._counts[index] += 1
+            else:
+                self._sums = np.vstack((self._sums, embedding))
+                self._counts.append(1)
+                index = self.num_speakers - 1
+
+        self._last_label = self._label(index)
+        return self._last_label
@@ -1,29 +1,103 @@
-import whisper
-from pyannote.audio import Pipeline
+import torch
 import json
+import warnings
+from ..metrics import metrics
+from ..model_registry import registry
+from ..asr import transcribe
 
 '''
 Whisper로 Speech-To-Text
 Pyannote로 화자분리(diarization) 수행 + JSON 저장 (타임스탬프 포함)
+파일당 한 번만 전사(word-level timestamp)하고, 각 단어를 겹치는 화자 구간에 배정합니다.
 '''
 
-def diarize_and_transcribe(audio_path, hf_token, save_json=False, json_path="segments.json"):
-    # 모델 로드
-    whisper_model = whisper.load_model("medium")
-    pipeline = Pipeline.from_pretrained("pyannote/speaker-diarization", use_auth_token=hf_token)
+
+def _load_diarization_pipeline(hf_token=None):
+    from pyannote.audio import Pipeline
+    return Pipeline.from_pretrained("pyannote/speaker-diarization", use_auth_token=hf_token)
+
+
+registry.register("pyannote_diarization", _load_diarization_pipeline)
+
+
+def align_words_to_turns(words, turns):
+    """
+    단어 타임스탬프를 화자 구간(turn)에 배정
+
+    Args:
+        words: [{"word", "start", "end"}, ...] (시작 시간 순)
+        turns: [(start, end), ...] (시작 시간 순)
+
+    Returns:
+        turn별 텍스트 리스트 (turns와 같은 순서)
+
+    각 단어는 겹치는 시간이 가장 긴 구간에 배정되고, 어느 구간과도 겹치지 않으면
+    가장 가까운 구간에 배정됩니다. 두 리스트를 한 번씩 훑으므로 O(단어 수 + 구간 수)입니다.
+    """
+    texts = [[] for _ in turns]
+    if not turns:
+        return []
+
+    first = 0  # word.start 이후에 끝나는 첫 구간
+    for word in words:
+        w_start, w_end = word["start"], word["end"]
+        while first < len(turns) - 1 and turns[first][1] <= w_start:
+            first += 1
+
+        best, best_overlap = None, 0.0
+        i = first
+        while i < len(turns) and turns[i][0] < w_end:
+            overlap = min(w_end, turns[i][1]) - max(w_start, turns[i][0])
+            if overlap > best_overlap:
+                best, best_overlap = i, overlap
+            i += 1
+
+        if best is None:
+            # 구간 사이 무음 영역의 단어 → 중심 시각이 가장 가까운 구간
+            mid = (w_start + w_end) / 2
+            candidates = [j for j in (first - 1, first) if 0 <= j < len(turns)]
+            best = min(candidates, key=lambda j: min(abs(mid - turns[j][0]), abs(mid - turns[j][1])))
+
+        texts[best].append(word["word"])
+
+    return ["".join(parts).strip() for parts in texts]
+
+
+def diarize_and_transcribe(audio_path, hf_token, save_json=False, json_path="segments.json",
+                           audio=None, sample_rate=16000, asr_config=None):
+    # 모델 로드 (프로세스당 1회, ASR 모델은 transcribe에서 asr_config 기준으로 로드)
+    pipeline = registry.get("pyannote_diarization", hf_token=hf_token)
+
+    # 미리 디코딩한 16kHz float32 버퍼가 있으면 파일을 다시 디코딩하지 않음
+    if audio is not None:
+        with warnings.catch_warnings():
+            # 디코딩 캐시 버퍼는 읽기 전용 (pyannote는 waveform을 수정하지 않으므로 복사하지 않고 공유)
+            warnings.filterwarnings("ignore", message="The given NumPy array is not writable")
+            waveform = torch.from_numpy(audio).unsqueeze(0)
+        diarization_input = {"waveform": waveform, "sample_rate": sample_rate}
+        asr_input = audio
+    else:
+        diarization_input = asr_input = audio_path
 
     # 화자 분리 수행
-    diarization = pipeline(audio_path)
-    segments = []
+    with metrics.span("diarization"):
+        diarization = pipeline(diarization_input)
+    turns = [(turn.start, turn.end, speaker)
+             for turn, _, speaker in diarization.itertracks(yield_label=True)]
+
+    # 파일 전체를 한 번만 전사 (단어 단위 타임스탬프)
+    asr_segments = transcribe(asr_input, asr_config, word_timestamps=True)
+    words = [word for seg in asr_segments for word in seg.words]
+    texts = align_words_to_turns(words, [(start, end) for start, end, _ in turns])
 
     # 화자별 구간 추출
-    for turn, _, speaker in diarization.itertracks(yield_label=True):
-        result = whisper_model.transcribe(audio_path)
+    segments = []
+    for (start, end, speaker), text in zip(turns, texts):
         segments.append({
             "speaker": speaker,
-            "start": turn.start,   # 시작 시간 (초)
-            "end": turn.end,       # 종료 시간 (초)
-            "text": result["text"]
+            "start": start,   # 시작 시간 (초)
+            "end": end,       # 종료 시간 (초)
+            "text": text
         })
 
     # JSON 저장 옵션
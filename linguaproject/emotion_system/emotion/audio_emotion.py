@@ -2,27 +2,115 @@
 LSTM 기반 음향 감정 분석
 음향 특징 벡터 (MFCC, pitch, energy 등)를 입력받아 
 감정라벨을 출력합니다.
+모델은 체크포인트에서 한 번만 로드하고, 가변 길이 구간들은 packed sequence로
+한 번에 추론합니다. quantized=True이면 int8 동적 양자화 CPU 모델을 사용합니다.
+backend="onnx" | "torchscript"이면 export.py로 내보낸 아티팩트로 추론합니다.
 '''
 
+import copy
+import os
 import torch
 import torch.nn as nn
+from torch.nn.utils.rnn import pack_padded_sequence
 from .label_map import label_map
+from .export import EXPORT_DIR, resolve_backend
+from ..features.extract_features import FRAME_FEATURE_DIM, pad_feature_batch
+from ..metrics import metrics
+from ..model_registry import registry
+
+CHECKPOINT_PATH = os.getenv(
+    "AUDIO_EMOTION_CHECKPOINT",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "checkpoints", "simple_lstm.pt")
+)
+
 
 class SimpleLSTM(nn.Module):
-    def __init__(self, input_dim, num_classes):
+    def __init__(self, input_dim, num_classes, hidden_dim=64):
         super().__init__()
-        self.lstm = nn.LSTM(input_dim, 64, batch_first=True)
-        self.fc = nn.Linear(64, num_classes)
+        self.lstm = nn.LSTM(input_dim, hidden_dim, batch_first=True)
+        self.fc = nn.Linear(hidden_dim, num_classes)
 
-    def forward(self, x):
+    def forward(self, x, lengths=None):
+        if lengths is not None:
+            # 패딩 프레임을 건너뛰도록 packed sequence로 변환 (원래 순서로 hn 반환)
+            x = pack_padded_sequence(x, lengths.cpu(), batch_first=True, enforce_sorted=False)
         _, (hn, _) = self.lstm(x)
-        return self.fc(hn.squeeze(0))
+        return self.fc(hn[-1])
+
+
+def _load_audio_lstm(checkpoint_path=CHECKPOINT_PATH, quantized=False):
+    if quantized:
+        # fp32 모델과 같은 가중치를 양자화해야 라벨 비교가 의미 있음
+        base = registry.get("audio_lstm", checkpoint_path=checkpoint_path, quantized=False)
+        return torch.ao.quantization.quantize_dynamic(copy.deepcopy(base), {nn.LSTM, nn.Linear}, dtype=torch.qint8)
 
-def classify_audio_emotion(features):
-    model = SimpleLSTM(input_dim=features.shape[2], num_classes=len(label_map))
+    checkpoint = torch.load(checkpoint_path, map_location="cpu") if os.path.exists(checkpoint_path) else None
+    if checkpoint is None:
+        print(f"Warning: 음향 감정 체크포인트({checkpoint_path})가 없어 무작위 가중치를 사용합니다.")
+        checkpoint = {}
+    state_dict = checkpoint.get("state_dict", checkpoint)
+
+    model = SimpleLSTM(
+        input_dim=checkpoint.get("input_dim", FRAME_FEATURE_DIM),
+        num_classes=checkpoint.get("num_classes", len(label_map)),
+        hidden_dim=checkpoint.get("hidden_dim", 64)
+    )
+    if state_dict:
+        model.load_state_dict(state_dict)
     model.eval()
-    with torch.no_grad():
-        x = torch.tensor(features, dtype=torch.float32)
-        logits = model(x)
-        label = torch.argmax(logits, dim=1).item()
-        return label_map[label]
\ No newline at end of file
+    return model
+
+
+registry.register("audio_lstm", _load_audio_lstm)
+
+
+def save_checkpoint(model, checkpoint_path=CHECKPOINT_PATH):
+    """학습된 SimpleLSTM을 _load_audio_lstm이 읽는 형식으로 저장"""
+    os.makedirs(os.path.dirname(checkpoint_path), exist_ok=True)
+    torch.save({
+        "input_dim": model.lstm.input_size,
+        "num_classes": model.fc.out_features,
+        "hidden_dim": model.lstm.hidden_size,
+        "state_dict": model.state_dict()
+    }, checkpoint_path)
+
+
+@metrics.timed("audio_emotion")
+def classify_audio_emotion_batch(frame_mats, quantized=False, backend=None, export_dir=EXPORT_DIR):
+    """
+    여러 구간의 음향 감정을 한 번에 분류
+
+    Args:
+        frame_mats: 구간별 (time, dim) 프레임 특징 행렬 리스트
+        quantized: int8 동적 양자화 모델 사용 여부 (CPU 전용)
+        backend: "torch" | "onnx" | "torchscript" (기본: 환경 변수 EMOTION_BACKEND, 없으면 torch)
+
+    Returns:
+        입력 순서대로 (감정 라벨, softmax 신뢰도) 튜플 리스트
+        프레임이 없는 구간은 (None, 0.0) (호출 측에서 텍스트 감정으로 대체)
+    """
+    frame_mats = list(frame_mats)
+    results = [(None, 0.0)] * len(frame_mats)
+    nonempty = [i for i, m in enumerate(frame_mats) if len(m)]
+    if not nonempty:
+        return results
+
+    backend = resolve_backend(backend)
+    if backend == "torch":
+        model = registry.get("audio_lstm", quantized=quantized)
+    else:
+        model = registry.get("emotion_exported", model="audio_lstm", fmt=backend, quantized=quantized,
+                             export_dir=export_dir)
+    batch, lengths = pad_feature_batch([frame_mats[i] for i in nonempty])
+    with torch.inference_mode():
+        logits = model(torch.from_numpy(batch), torch.from_numpy(lengths))
+        confidences, labels = torch.softmax(logits, dim=-1).max(dim=-1)
+    for i, label, confidence in zip(nonempty, labels.tolist(), confidences.tolist()):
+        results[i] = (label_map[label], confidence)
+    return results
+
+
+def classify_audio_emotion(features, quantized=False, backend=None):
+    """(batch, time, dim) 특징 배열에서 첫 구간의 감정 라벨 반환"""
+    label, _ = classify_audio_emotion_batch(list(features[:1]), quantized=quantized, backend=backend)[0]
+    return label
@@ -0,0 +1,236 @@
+'''
+감정 모델(KoBERT, SimpleLSTM) 추론용 아티팩트 내보내기
+ONNX 또는 TorchScript로 저장하고, 선택적으로 int8 동적 양자화를 적용합니다.
+text_emotion / audio_emotion은 backend="onnx" | "torchscript"(또는 환경 변수
+EMOTION_BACKEND)로 이 아티팩트를 불러와 추론합니다.
+
+실행: python -m emotion_system.emotion.export --model all --format onnx [--quantize] [--check]
+'''
+
+import argparse
+import os
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+from ..model_registry import registry
+
+BACKENDS = ("torch", "onnx", "torchscript")
+DEFAULT_BACKEND = os.getenv("EMOTION_BACKEND", "torch")
+EXPORT_DIR = os.getenv(
+    "EMOTION_EXPORT_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "exported")
+)
+EXTENSIONS = {"onnx": "onnx", "torchscript": "pt"}
+
+# 모델별 입력 이름 (runner 호출 순서와 동일)
+INPUT_NAMES = {
+    "kobert_emotion": ["input_ids", "attention_mask", "token_type_ids"],
+    "audio_lstm": ["features", "lengths"],
+}
+DYNAMIC_AXES = {
+    "kobert_emotion": {"input_ids": {0: "batch", 1: "tokens"}, "attention_mask": {0: "batch", 1: "tokens"},
+                       "token_type_ids": {0: "batch", 1: "tokens"}, "logits": {0: "batch"}},
+    "audio_lstm": {"features": {0: "batch", 1: "frames"}, "lengths": {0: "batch"}, "logits": {0: "batch"}},
+}
+
+
+class _BertLogits(nn.Module):
+    """BertForSequenceClassification → logits 텐서만 반환 (trace/export용)"""
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids, attention_mask, token_type_ids):
+        return self.model(input_ids=input_ids, attention_mask=attention_mask,
+                          token_type_ids=token_type_ids, return_dict=False)[0]
+
+
+class _LastStepLSTM(nn.Module):
+    """
+    SimpleLSTM의 export용 forward
+
+    packed sequence 대신 패딩 배치 전체를 돌리고 구간별 마지막 유효 프레임의 출력을
+    고릅니다. 단방향 LSTM이고 패딩이 뒤에 붙으므로 packed sequence의 hn과 같습니다.
+    """
+
+    def __init__(self, model):
+        super().__init__()
+        self.lstm = model.lstm
+        self.fc = model.fc
+
+    def forward(self, features, lengths):
+        output, _ = self.lstm(features)
+        last = output[torch.arange(output.shape[0]), (lengths - 1).clamp(min=0)]
+        return self.fc(last)
+
+
+def artifact_path(name, fmt, quantized=False, export_dir=EXPORT_DIR):
+    """{export_dir}/{name}.{fp32|int8}.{onnx|pt}"""
+    return os.path.join(export_dir, f"{name}.{'int8' if quantized else 'fp32'}.{EXTENSIONS[fmt]}")
+
+
+def _example_inputs(name, module):
+    if name == "kobert_emotion":
+        input_ids = torch.randint(0, module.model.config.vocab_size, (2, 16))
+        return input_ids, torch.ones_like(input_ids), torch.zeros_like(input_ids)
+    from ..features.extract_features import FRAME_FEATURE_DIM
+    return torch.randn(2, 50, FRAME_FEATURE_DIM), torch.tensor([50, 30])
+
+
+def _export_module(name):
+    """내보낼 fp32 모듈 (레지스트리의 eager 모델을 감쌈)"""
+    if name == "kobert_emotion":
+        from . import text_emotion  # noqa: F401  로더 등록
+        _, model = registry.get("kobert_emotion")
+        return _BertLogits(model).eval()
+    from . import audio_emotion  # noqa: F401  로더 등록
+    return _LastStepLSTM(registry.get("audio_lstm", quantized=False)).eval()
+
+
+def export_model(name, fmt="onnx", quantize=False, export_dir=EXPORT_DIR):
+    """
+    모델을 아티팩트로 저장
+
+    Args:
+        name: "kobert_emotion" 또는 "audio_lstm"
+        fmt: "onnx" 또는 "torchscript"
+        quantize: int8 동적 양자화 (ONNX는 onnxruntime 양자화, TorchScript는 torch quantize_dynamic)
+
+    Returns:
+        저장된 파일 경로
+    """
+    if fmt not in EXTENSIONS:
+        raise ValueError(f"지원하지 않는 형식입니다: {fmt} (가능: {', '.join(EXTENSIONS)})")
+    os.makedirs(export_dir, exist_ok=True)
+    module = _export_module(name)
+    example = _example_inputs(name, module)
+    path = artifact_path(name, fmt, quantize, export_dir)
+
+    if fmt == "torchscript":
+        if quantize:
+            module = torch.ao.quantization.quantize_dynamic(module, {nn.LSTM, nn.Linear}, dtype=torch.qint8)
+        with torch.no_grad():
+            traced = torch.jit.trace(module, example, check_trace=False)
+        torch.jit.save(traced, path)
+        return path
+
+    fp32_path = artifact_path(name, fmt, False, export_dir)
+    with torch.no_grad():
+        torch.onnx.export(module, example, fp32_path, input_names=INPUT_NAMES[name], output_names=["logits"],
+                          dynamic_axes=DYNAMIC_AXES[name], opset_version=17, dynamo=False)
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        quantize_dynamic(fp32_path, path, weight_type=QuantType.QInt8)
+    return path
+
+
+class _ExportedRunner:
+    """아티팩트를 eager 모델과 같은 방식(torch 텐서 입력 → logits 텐서)으로 호출"""
+
+    def __init__(self, path, fmt):
+        self.fmt = fmt
+        if fmt == "torchscript":
+            self._module = torch.jit.load(path, map_location="cpu").eval()
+            return
+        import onnxruntime as ort
+        self._session = ort.InferenceSession(path, providers=["CPUExecutionProvider"])
+        self._input_names = [i.name for i in self._session.get_inputs()]
+
+    def __call__(self, *inputs):
+        if self.fmt == "torchscript":
+            with torch.inference_mode():
+                return self._module(*inputs)
+        feeds = {name: tensor.numpy() for name, tensor in zip(self._input_names, inputs)}
+        return torch.from_numpy(self._session.run(["logits"], feeds)[0])
+
+
+def _load_exported(model, fmt="onnx", quantized=False, export_dir=EXPORT_DIR):
+    path = artifact_path(model, fmt, quantized, export_dir)
+    if not os.path.exists(path):
+        raise FileNotFoundError(
+            f"{path}가 없습니다. python -m emotion_system.emotion.export --model {model} --format {fmt}"
+            f"{' --quantize' if quantized else ''} 로 먼저 내보내세요."
+        )
+    return _ExportedRunner(path, fmt)
+
+
+registry.register("emotion_exported", _load_exported)
+
+
+def resolve_backend(backend=None):
+    backend = backend or DEFAULT_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"지원하지 않는 추론 백엔드입니다: {backend} (가능: {', '.join(BACKENDS)})")
+    return backend
+
+
+# 라벨 일치율 확인용 샘플 발화
+PARITY_TEXTS = [
+    "요금이 왜 이렇게 많이 나왔는지 설명해 주세요",
+    "벌써 세 번째 전화하는데 아직도 해결이 안 됐네요",
+    "친절하게 안내해 주셔서 정말 감사합니다",
+    "배송이 언제 오는지 알 수 있을까요",
+    "이게 말이 됩니까 당장 책임자 바꿔요",
+    "그냥 너무 지쳐서 아무것도 하기 싫어요",
+    "확인 부탁드립니다",
+    "환불 절차가 어떻게 되는지 궁금해요",
+]
+
+
+def check_parity(name, fmt, quantized=False, samples=256, export_dir=EXPORT_DIR):
+    """
+    eager PyTorch(fp32) 대비 아티팩트의 라벨 일치율
+
+    Returns:
+        (라벨 일치율, 최대 신뢰도 차이)
+    """
+    from .text_emotion import classify_text_emotion_batch
+    from .audio_emotion import classify_audio_emotion_batch
+
+    if name == "kobert_emotion":
+        inputs = [PARITY_TEXTS[i % len(PARITY_TEXTS)] * (1 + i // len(PARITY_TEXTS) % 4) for i in range(samples)]
+        classify = classify_text_emotion_batch
+    else:
+        from ..features.extract_features import FRAME_FEATURE_DIM
+        rng = np.random.default_rng(0)
+        inputs = [rng.standard_normal((rng.integers(20, 400), FRAME_FEATURE_DIM)).astype(np.float32)
+                  for _ in range(samples)]
+        classify = classify_audio_emotion_batch
+
+    eager = classify(inputs, backend="torch")
+    exported = classify(inputs, backend=fmt, quantized=quantized, export_dir=export_dir)
+    agreement = float(np.mean([a[0] == b[0] for a, b in zip(eager, exported)]))
+    max_confidence_diff = float(max(abs(a[1] - b[1]) for a, b in zip(eager, exported)))
+    return agreement, max_confidence_diff
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", choices=["kobert_emotion", "audio_lstm", "all"], default="all")
+    parser.add_argument("--format", choices=list(EXTENSIONS), default="onnx")
+    parser.add_argument("--quantize", action="store_true", help="int8 동적 양자화")
+    parser.add_argument("--export-dir", default=EXPORT_DIR)
+    parser.add_argument("--check", action="store_true", help="eager PyTorch 대비 라벨 일치율 확인")
+    parser.add_argument("--samples", type=int, default=256)
+    parser.add_argument("--min-agreement", type=float, default=0.95)
+    args = parser.parse_args()
+
+    names = ["kobert_emotion", "audio_lstm"] if args.model == "all" else [args.model]
+    failed = False
+    for name in names:
+        path = export_model(name, args.format, args.quantize, args.export_dir)
+        print(f"✅ {name} → {path}")
+        if args.check:
+            registry.unload("emotion_exported")
+            agreement, diff = check_parity(name, args.format, args.quantize, args.samples, args.export_dir)
+            ok = agreement >= args.min_agreement
+            failed |= not ok
+            print(f"   라벨 일치율 {agreement * 100:.1f}%, 최대 신뢰도 차이 {diff:.4f} {'OK' if ok else 'FAIL'}")
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
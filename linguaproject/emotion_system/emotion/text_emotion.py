@@ -1,16 +1,86 @@
 '''
 KoBERT 기반 텍스트 감정 분석
 발화 텍스트를 입력받아 감정 라벨을 출력합니다.
+여러 발화는 classify_text_emotion_batch로 길이순 버킷 배치 추론합니다.
+backend="onnx" | "torchscript"이면 export.py로 내보낸 아티팩트로 추론합니다.
 '''
 
 import torch
-from transformers import BertTokenizer, BertForSequenceClassification
+from transformers import BertTokenizerFast, BertForSequenceClassification
 from .label_map import label_map
+from .export import EXPORT_DIR, resolve_backend
+from ..metrics import metrics
+from ..model_registry import registry
+
+MODEL_NAME = "monologg/kobert"
+DEFAULT_MAX_BATCH_SIZE = 32
+
+
+def _load_kobert_tokenizer():
+    return BertTokenizerFast.from_pretrained(MODEL_NAME)
+
+
+def _load_kobert():
+    model = BertForSequenceClassification.from_pretrained(MODEL_NAME, num_labels=len(label_map))
+    model.eval()
+    return registry.get("kobert_tokenizer"), model
+
+
+# 내보낸 백엔드(onnx / torchscript)는 토크나이저만 필요 → eager 모델을 따로 로드하지 않음
+registry.register("kobert_tokenizer", _load_kobert_tokenizer)
+registry.register("kobert_emotion", _load_kobert)
+
+
+@metrics.timed("text_emotion")
+def classify_text_emotion_batch(texts, max_batch_size=DEFAULT_MAX_BATCH_SIZE, backend=None, quantized=False,
+                                export_dir=EXPORT_DIR):
+    """
+    여러 발화의 감정을 배치로 분류
+
+    토큰 길이순으로 정렬한 뒤 max_batch_size 단위 버킷으로 나눠 패딩을 최소화합니다.
+
+    Args:
+        texts: 발화 텍스트 리스트
+        max_batch_size: 한 번의 forward에 넣을 최대 발화 수
+        backend: "torch" | "onnx" | "torchscript" (기본: 환경 변수 EMOTION_BACKEND, 없으면 torch)
+        quantized: 내보낸 int8 아티팩트 사용 여부 (onnx / torchscript)
+
+    Returns:
+        입력 순서대로 (감정 라벨, softmax 신뢰도) 튜플 리스트
+    """
+    texts = list(texts)
+    if not texts:
+        return []
+
+    backend = resolve_backend(backend)
+    tokenizer = registry.get("kobert_tokenizer")
+    if backend == "torch":
+        _, model = registry.get("kobert_emotion")
+    else:
+        runner = registry.get("emotion_exported", model="kobert_emotion", fmt=backend, quantized=quantized,
+                              export_dir=export_dir)
+    encoded = tokenizer(texts, truncation=True, padding=False)
+    order = sorted(range(len(texts)), key=lambda i: len(encoded["input_ids"][i]))
+
+    results = [None] * len(texts)
+    with torch.inference_mode():
+        for b in range(0, len(order), max_batch_size):
+            bucket = order[b:b + max_batch_size]
+            inputs = tokenizer.pad(
+                {key: [encoded[key][i] for i in bucket] for key in encoded.keys()},
+                return_tensors="pt"
+            )
+            if backend == "torch":
+                logits = model(**inputs).logits
+            else:
+                logits = runner(inputs["input_ids"], inputs["attention_mask"], inputs["token_type_ids"])
+            probs = torch.softmax(logits, dim=-1)
+            confidences, labels = probs.max(dim=-1)
+            for i, label, confidence in zip(bucket, labels.tolist(), confidences.tolist()):
+                results[i] = (label_map[label], confidence)
+    return results
+
 
 def classify_text_emotion(text):
-    tokenizer = BertTokenizer.from_pretrained("monologg/kobert")
-    model = BertForSequenceClassification.from_pretrained("monologg/kobert", num_labels=len(label_map))
-    inputs = tokenizer(text, return_tensors="pt", truncation=True, padding=True)
-    outputs = model(**inputs)
-    label = torch.argmax(outputs.logits, dim=1).item()
-    return label_map[label]
\ No newline at end of file
+    label, _ = classify_text_emotion_batch([text])[0]
+    return label
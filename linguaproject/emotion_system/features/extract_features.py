@@ -2,13 +2,51 @@
 음성 파일에서 음향 특징 추출
 pitch, energy, spectral centroid, ZCR, speech rate, MFCC 평균값
 딕셔너리 형태로 모델에 입력됩니다.
+LSTM 입력용으로는 프레임 단위 특징 행렬 (time, dim)과
+패딩된 배치 텐서 (batch, time, dim) + 길이 배열을 제공합니다.
+파일 경로 대신 메모리상의 버퍼(numpy 배열, memoryview)와 구간(start/end, 초)을
+넘기면 임시 파일이나 재디코딩 없이 해당 구간의 뷰(view)만 분석합니다.
+LONG_AUDIO_SECONDS보다 긴 파일 경로는 long_audio 모듈의 창 단위 모드로 처리합니다.
 '''
 
 import librosa
 import numpy as np
+from ..metrics import metrics
+from ..utils.audio_utils import as_float32_mono
+
+SAMPLE_RATE = 16000
+N_FFT = 2048
+HOP_LENGTH = 512
+N_MFCC = 13
+
+# 프레임 특징 행렬의 열 순서
+FRAME_FEATURE_NAMES = ['pitch', 'energy', 'spec_centroid', 'zcr'] + [f'mfcc_{i+1}' for i in range(N_MFCC)]
+FRAME_FEATURE_DIM = len(FRAME_FEATURE_NAMES)
+
+
+def segment_view(y, sr, start=None, end=None):
+    """버퍼에서 [start, end) 초 구간을 복사 없이 잘라낸 뷰를 반환"""
+    begin = int(round(start * sr)) if start is not None else 0
+    stop = int(round(end * sr)) if end is not None else len(y)
+    return y[max(begin, 0):min(stop, len(y))]
+
+
+def extract_features(audio, sr=SAMPLE_RATE, start=None, end=None):
+    if isinstance(audio, str):
+        from .long_audio import extract_features_long, is_long_audio
+        if is_long_audio(audio):
+            return extract_features_long(audio, sr, start, end)  # 시간은 segment_statistics에서 기록
+    return _extract_features(audio, sr, start, end)
+
+
+@metrics.timed("feature_extraction")
+def _extract_features(audio, sr, start, end):
+    if isinstance(audio, str):
+        y, sr = librosa.load(audio, sr=sr)
+    else:
+        y = as_float32_mono(audio)
+    y = segment_view(y, sr, start, end)
 
-def extract_features(file_path):
-    y, sr = librosa.load(file_path, sr=16000)
     pitches, magnitudes = librosa.piptrack(y=y, sr=sr)
     pitch = np.mean(pitches[pitches > 0]) if np.any(pitches > 0) else 0
     energy = np.mean(librosa.feature.rms(y=y))
@@ -17,7 +55,7 @@ def extract_features(file_path):
     spec_centroid = np.mean(librosa.feature.spectral_centroid(y=y, sr=sr))
     zcr = np.mean(librosa.feature.zero_crossing_rate(y))
     duration = librosa.get_duration(y=y, sr=sr)
-    speech_rate = len(librosa.effects.split(y)) / duration
+    speech_rate = len(librosa.effects.split(y)) / duration if duration > 0 else 0
 
     features = {
         'pitch': pitch,
@@ -28,4 +66,101 @@ def extract_features(file_path):
     }
     for i, val in enumerate(mfccs_mean):
         features[f'mfcc_{i+1}'] = val
-    return features
\ No newline at end of file
+    return features
+
+
+def _frame_features(y, sr, segment_stats=False):
+    """
+    STFT를 한 번만 계산해 모든 프레임 특징을 벡터 연산으로 구함
+
+    segment_stats=True이면 extract_features의 통계를 구간 단위로 나눠 합산할 수 있도록
+    프레임별 (양수 pitch 후보 합, 양수 pitch 후보 수, 시간 영역 RMS) (time, 3) 배열도 함께 반환합니다.
+    """
+    S = np.abs(librosa.stft(y, n_fft=N_FFT, hop_length=HOP_LENGTH))
+    n_frames = S.shape[1]
+
+    pitches, magnitudes = librosa.piptrack(S=S, sr=sr, n_fft=N_FFT, hop_length=HOP_LENGTH)
+    pitch = pitches[np.argmax(magnitudes, axis=0), np.arange(n_frames)]
+    if segment_stats:
+        stats = np.empty((n_frames, 3), dtype=np.float64)
+        stats[:, 0] = pitches.sum(axis=0, dtype=np.float64)  # piptrack 값은 0 이상
+        stats[:, 1] = np.count_nonzero(pitches > 0, axis=0)
+        stats[:, 2] = librosa.feature.rms(y=y, frame_length=N_FFT, hop_length=HOP_LENGTH)[0][:n_frames]
+    energy = librosa.feature.rms(S=S, frame_length=N_FFT, hop_length=HOP_LENGTH)[0]
+    spec_centroid = librosa.feature.spectral_centroid(S=S, sr=sr, n_fft=N_FFT, hop_length=HOP_LENGTH)[0]
+    zcr = librosa.feature.zero_crossing_rate(y, frame_length=N_FFT, hop_length=HOP_LENGTH)[0][:n_frames]
+    mel = librosa.feature.melspectrogram(S=S ** 2, sr=sr, n_fft=N_FFT, hop_length=HOP_LENGTH)
+    mfccs = librosa.feature.mfcc(S=librosa.power_to_db(mel), n_mfcc=N_MFCC)
+
+    frames = np.empty((n_frames, FRAME_FEATURE_DIM), dtype=np.float32)
+    frames[:, 0] = pitch
+    frames[:, 1] = energy
+    frames[:, 2] = spec_centroid
+    frames[:, 3] = zcr
+    frames[:, 4:] = mfccs.T
+    if segment_stats:
+        return frames, stats
+    return frames
+
+
+def extract_frame_features(audio, sr=SAMPLE_RATE, start=None, end=None):
+    """
+    프레임 단위 특징 행렬 추출
+
+    Returns:
+        (time, FRAME_FEATURE_DIM) 형태의 C-contiguous float32 배열
+    """
+    if isinstance(audio, str):
+        from .long_audio import extract_frame_features_long, is_long_audio
+        if is_long_audio(audio):
+            return extract_frame_features_long(audio, sr, start, end)  # 시간은 segment_frame_features_long에서 기록
+    return _extract_frame_features(audio, sr, start, end)
+
+
+@metrics.timed("feature_extraction")
+def _extract_frame_features(audio, sr, start, end):
+    if isinstance(audio, str):
+        y, sr = librosa.load(audio, sr=sr)
+    else:
+        y = as_float32_mono(audio)
+    return _frame_features(segment_view(y, sr, start, end), sr)
+
+
+@metrics.timed("feature_extraction")
+def segment_frame_features(audio, spans, sr=SAMPLE_RATE):
+    """
+    여러 구간의 프레임 특징 행렬을 한 번에 추출
+
+    버퍼 전체에 대해 STFT 기반 특징을 한 번만 계산한 뒤 구간별 프레임을 잘라냅니다.
+
+    Args:
+        audio: 디코딩된 float32 버퍼
+        spans: [(start, end), ...] (초)
+
+    Returns:
+        구간별 (time, FRAME_FEATURE_DIM) 배열 리스트
+        버퍼 끝을 넘는 구간(ASR / 화자 분리 타임스탬프가 디코딩 길이보다 긴 경우)도 마지막 프레임 1개를 받음
+    """
+    y = as_float32_mono(audio)
+    frames = _frame_features(y, sr)
+    mats = []
+    for start, end in spans:
+        first = min(int(start * sr) // HOP_LENGTH, max(len(frames) - 1, 0))
+        last = max(int(np.ceil(end * sr / HOP_LENGTH)), first + 1)
+        mats.append(frames[first:min(last, len(frames))])
+    return mats
+
+
+def pad_feature_batch(frame_mats):
+    """
+    가변 길이 프레임 행렬들을 0으로 패딩해 배치 텐서로 묶음
+
+    Returns:
+        (batch, max_time, dim) float32 배열, (batch,) int64 길이 배열
+    """
+    lengths = np.fromiter((len(m) for m in frame_mats), dtype=np.int64, count=len(frame_mats))
+    dim = frame_mats[0].shape[1] if frame_mats else FRAME_FEATURE_DIM
+    batch = np.zeros((len(frame_mats), int(lengths.max(initial=0)), dim), dtype=np.float32)
+    for i, m in enumerate(frame_mats):
+        batch[i, :len(m)] = m
+    return batch, lengths
@@ -0,0 +1,516 @@
+'''
+긴 녹음(수십 분~수 시간)용 창(window) 단위 특징 추출
+파일 전체를 디코딩/분석하지 않고 PCM 데이터를 고정 길이 창으로 읽어 창마다 프레임 특징을
+계산한 뒤, 구간(segment)별 프레임 행렬이나 통계(extract_features와 같은 키)로 합칩니다.
+메모리 사용은 창 길이와 구간 길이에만 비례하고 녹음 전체 길이와는 무관합니다.
+
+- 16kHz PCM16/PCM32/float32 WAV는 변환 없이 헤더가 가리키는 데이터 영역을 직접 읽습니다.
+- 그 밖의 형식(m4a, mp3, 다른 샘플레이트)은 ffmpeg 출력을 청크 단위로 디코딩 캐시(.npy,
+  load_audio와 같은 파일)에 기록한 뒤 같은 방식으로 읽습니다.
+- 창 양쪽에 STFT 창 길이만큼 여유 샘플을 붙여 계산하고 가장자리 프레임은 버리므로,
+  프레임 특징은 파일 전체로 계산한 값과 같습니다 (MFCC의 top_db 하한만 창 기준).
+
+LINGUA_LONG_AUDIO_SECONDS(기본 600초)보다 긴 파일은 extract_features와 main이 이 모드를 사용합니다.
+길이는 WAV 헤더나 ffprobe로 구하고, 알 수 없는 파일도 이 모드로 처리합니다.
+'''
+
+import math
+import os
+import shutil
+import struct
+import subprocess
+import tempfile
+import threading
+import warnings
+
+import numpy as np
+from ..metrics import metrics
+from ..utils.audio_utils import DECODE_CACHE_DIR, decode_audio, file_digest, prune_decode_cache, touch_cache_file
+from .extract_features import FRAME_FEATURE_DIM, HOP_LENGTH, N_FFT, N_MFCC, SAMPLE_RATE, _frame_features
+
+WINDOW_SECONDS = float(os.getenv("LINGUA_LONG_AUDIO_WINDOW", "30"))
+LONG_AUDIO_SECONDS = float(os.getenv("LINGUA_LONG_AUDIO_SECONDS", "600"))
+MARGIN = N_FFT  # 창 앞뒤에 덧붙여 읽는 샘플 수 (HOP_LENGTH의 배수)
+CHUNK_BYTES = 1 << 22  # 디코딩/변환 시 한 번에 옮기는 바이트 수
+SILENCE_TOP_DB = 60  # speech_rate 무음 기준 (librosa.effects.split 기본값)
+
+WAVE_FORMAT_PCM = 1
+WAVE_FORMAT_IEEE_FLOAT = 3
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+_WAV_DTYPES = {
+    (WAVE_FORMAT_PCM, 16): np.dtype("<i2"),
+    (WAVE_FORMAT_PCM, 32): np.dtype("<i4"),
+    (WAVE_FORMAT_IEEE_FLOAT, 32): np.dtype("<f4"),
+}
+
+
+def _wav_layout(path):
+    """
+    WAV 헤더 파싱
+
+    Returns:
+        (format_tag, channels, sample_rate, bits, data_offset, data_bytes) 또는 WAV가 아니면 None
+    """
+    with open(path, "rb") as f:
+        riff = f.read(12)
+        if len(riff) < 12 or riff[:4] != b"RIFF" or riff[8:12] != b"WAVE":
+            return None
+        fmt = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                return None
+            chunk_id, size = header[:4], struct.unpack("<I", header[4:])[0]
+            if chunk_id == b"fmt ":
+                body = f.read(size + (size & 1))
+                tag, channels, rate = struct.unpack("<HHI", body[:8])
+                bits = struct.unpack("<H", body[14:16])[0]
+                if tag == WAVE_FORMAT_EXTENSIBLE and size >= 26:
+                    tag = struct.unpack("<H", body[24:26])[0]  # SubFormat GUID의 앞 2바이트
+                fmt = (tag, channels, rate, bits)
+            elif chunk_id == b"data":
+                if fmt is None:
+                    return None
+                offset = f.tell()
+                # 녹음 중 끊긴 파일은 size가 0 또는 0xFFFFFFFF일 수 있어 실제 파일 크기로 제한
+                available = os.fstat(f.fileno()).st_size - offset
+                return fmt + (offset, min(size, available) if size else available)
+            else:
+                f.seek(size + (size & 1), os.SEEK_CUR)
+
+
+class LongAudio:
+    """
+    디스크 위의 PCM 데이터를 필요한 범위만 읽는 리더
+
+    read(start, stop)는 요청한 샘플 범위만 파일에서 읽어 mono float32로 돌려주므로
+    녹음 길이와 관계없이 읽은 만큼만 메모리를 씁니다.
+    """
+
+    def __init__(self, path, sr, dtype, channels, offset, frames):
+        self.path = path
+        self.sr = sr
+        self.dtype = np.dtype(dtype)
+        self.channels = channels
+        self.offset = offset
+        self.frames = frames
+        self._file = open(path, "rb")
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self.frames
+
+    @property
+    def duration(self):
+        return self.frames / self.sr
+
+    def read(self, start, stop):
+        """[start, stop) 샘플 구간을 mono float32로 읽음 (범위 밖은 잘라냄)"""
+        start, stop = max(int(start), 0), min(int(stop), self.frames)
+        if stop <= start:
+            return np.zeros(0, dtype=np.float32)
+        buffer = np.empty((stop - start) * self.channels, dtype=self.dtype)
+        with self._lock:
+            self._file.seek(self.offset + start * self.channels * self.dtype.itemsize)
+            read = self._file.readinto(memoryview(buffer).cast("B"))
+        y = buffer[:read // self.dtype.itemsize]
+        if np.issubdtype(y.dtype, np.integer):
+            y = y.astype(np.float32) / np.iinfo(y.dtype).max
+        if self.channels > 1:
+            y = y[:len(y) // self.channels * self.channels].reshape(-1, self.channels).mean(axis=1)
+        return y.astype(np.float32, copy=False)
+
+    def array(self, cache_dir=DECODE_CACHE_DIR):
+        """
+        전체 녹음을 (samples,) float32 memmap으로 반환 (화자 분리 / STT처럼 버퍼 전체가 필요한 단계용)
+
+        mono float32가 아닌 WAV는 디코딩 캐시(.npy)로 한 번 변환한 뒤 매핑합니다.
+        copy-on-write 매핑이므로 페이지는 접근할 때만 읽히고 원본 파일은 바뀌지 않습니다.
+        """
+        if self.dtype == np.dtype("<f4") and self.channels == 1:
+            return np.memmap(self.path, dtype=self.dtype, mode="c", offset=self.offset, shape=(self.frames,))
+        path = _cache_path(self.path, self.sr, cache_dir)
+        if os.path.exists(path):
+            touch_cache_file(path)
+        else:
+            chunk = max(CHUNK_BYTES // (self.dtype.itemsize * self.channels), 1)
+            _write_npy(path, self.frames, (self.read(i, i + chunk) for i in range(0, self.frames, chunk)))
+            _prune(cache_dir, path)
+        return _open_npy(path, self.sr).array()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def _cache_path(file_path, sr, cache_dir):
+    """load_audio와 같은 디코딩 캐시 경로 ({digest}_{sr}.npy)"""
+    cache_dir = cache_dir or tempfile.gettempdir()
+    os.makedirs(cache_dir, exist_ok=True)
+    return os.path.join(cache_dir, f"{file_digest(file_path)}_{sr}.npy")
+
+
+def _prune(cache_dir, keep):
+    """load_audio와 같은 디스크 캐시 크기 상한 적용 (임시 디렉터리 대체 시에는 정리하지 않음)"""
+    if cache_dir:
+        prune_decode_cache(cache_dir, keep=keep)
+
+
+def _write_npy(path, n, chunks):
+    """float32 청크들을 (n,) .npy 파일로 기록 (임시 파일에 쓴 뒤 교체)"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    written = 0
+    with open(tmp_path, "wb") as f:
+        np.lib.format.write_array_header_1_0(f, {"descr": "<f4", "fortran_order": False, "shape": (n,)})
+        for chunk in chunks:
+            chunk = np.ascontiguousarray(chunk, dtype="<f4")
+            f.write(memoryview(chunk).cast("B"))
+            written += len(chunk)
+    if written != n:
+        os.remove(tmp_path)
+        raise RuntimeError(f"디코딩 결과 길이가 맞지 않습니다 ({written} != {n})")
+    os.replace(tmp_path, path)
+
+
+def _stream_ffmpeg(file_path, sr, out):
+    """ffmpeg f32le 출력을 청크 단위로 out에 기록하고 샘플 수를 반환"""
+    command = [
+        "ffmpeg", "-nostdin", "-v", "error", "-i", file_path,
+        "-f", "f32le", "-acodec", "pcm_f32le", "-ac", "1", "-ar", str(sr), "-"
+    ]
+    with tempfile.TemporaryFile() as stderr:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr)
+        written = 0
+        for chunk in iter(lambda: process.stdout.read(CHUNK_BYTES), b""):
+            out.write(chunk)
+            written += len(chunk)
+        process.stdout.close()
+        if process.wait() != 0:
+            stderr.seek(0)
+            raise RuntimeError(f"ffmpeg 디코딩 실패 ({file_path}): {stderr.read().decode(errors='replace').strip()}")
+    return written // 4
+
+
+def _decode_to_npy(file_path, sr, cache_dir):
+    """원본을 디코딩 캐시(.npy)로 스트리밍 디코딩하고 경로를 반환 (이미 있으면 재사용)"""
+    path = _cache_path(file_path, sr, cache_dir)
+    if os.path.exists(path):
+        touch_cache_file(path)
+        metrics.inc("decode_cache_total", result="disk")
+        return path
+
+    metrics.inc("decode_cache_total", result="miss")
+    if not shutil.which("ffmpeg"):
+        warnings.warn("ffmpeg가 없어 긴 녹음을 메모리로 한 번에 디코딩합니다.")
+        y = decode_audio(file_path, sr)
+        _write_npy(path, len(y), [y])
+        _prune(cache_dir, path)
+        return path
+
+    raw_path = f"{path}.{os.getpid()}.raw"
+    try:
+        with open(raw_path, "wb") as raw:
+            n = _stream_ffmpeg(file_path, sr, raw)
+        with open(raw_path, "rb") as raw:
+            _write_npy(path, n, (np.frombuffer(chunk, dtype="<f4")
+                                 for chunk in iter(lambda: raw.read(CHUNK_BYTES), b"")))
+    finally:
+        if os.path.exists(raw_path):
+            os.remove(raw_path)
+    _prune(cache_dir, path)
+    return path
+
+
+def _open_npy(path, sr):
+    with open(path, "rb") as f:
+        version = np.lib.format.read_magic(f)
+        read_header = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+        shape, fortran_order, dtype = read_header(f)
+        offset = f.tell()
+    if len(shape) != 1 or dtype != np.dtype("<f4"):
+        raise ValueError(f"(samples,) float32 배열이 아닙니다: {path} {shape} {dtype}")
+    return LongAudio(path, sr, dtype, 1, offset, shape[0])
+
+
+@metrics.timed("decode", mode="long")
+def open_long_audio(file_path, sr=SAMPLE_RATE, cache_dir=DECODE_CACHE_DIR):
+    """
+    녹음 파일을 창 단위로 읽을 수 있게 엶
+
+    Args:
+        file_path: wav / m4a / mp3 또는 디코딩 캐시(.npy) 경로
+        sr: 목표 샘플레이트
+        cache_dir: 변환이 필요한 형식의 디코딩 캐시 디렉터리 (None이면 임시 디렉터리)
+
+    Returns:
+        LongAudio (with 문으로 닫기)
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(file_path)
+    if file_path.endswith(".npy"):
+        return _open_npy(file_path, sr)
+    layout = _wav_layout(file_path)
+    if layout is not None:
+        tag, channels, rate, bits, offset, size = layout
+        dtype = _WAV_DTYPES.get((tag, bits))
+        if dtype is not None and rate == sr:
+            return LongAudio(file_path, sr, dtype, channels, offset, size // (dtype.itemsize * channels))
+    return _open_npy(_decode_to_npy(file_path, sr, cache_dir), sr)
+
+
+def _probe_duration(file_path):
+    """ffprobe로 컨테이너 재생 길이(초)를 구함 (ffprobe가 없거나 길이가 없으면 None)"""
+    if not shutil.which("ffprobe"):
+        return None
+    command = [
+        "ffprobe", "-v", "error", "-show_entries", "format=duration",
+        "-of", "default=noprint_wrappers=1:nokey=1", file_path
+    ]
+    result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=False)
+    try:
+        return float(result.stdout.decode().strip())
+    except ValueError:  # 실패 또는 "N/A"
+        return None
+
+
+def _cached_duration(file_path, sr=SAMPLE_RATE):
+    """디코딩 캐시(.npy)가 이미 있으면 헤더의 샘플 수로 길이(초)를 구함"""
+    if not DECODE_CACHE_DIR:
+        return None
+    path = os.path.join(DECODE_CACHE_DIR, f"{file_digest(file_path)}_{sr}.npy")
+    if not os.path.exists(path):
+        return None
+    with _open_npy(path, sr) as audio:
+        return audio.duration
+
+
+def audio_duration(file_path):
+    """
+    디코딩 없이 재생 길이(초)를 구함 (알 수 없으면 None)
+
+    WAV 헤더 → ffprobe → 디코딩 캐시(.npy) 헤더 → soundfile 순으로 시도합니다.
+    """
+    try:
+        layout = _wav_layout(file_path)
+        if layout is not None:
+            _, channels, rate, bits, _, size = layout
+            return size / (channels * bits // 8 * rate)
+        duration = _probe_duration(file_path)
+        if duration is None:
+            duration = _cached_duration(file_path)
+        if duration is None:
+            import soundfile as sf  # librosa 의존성 (m4a는 읽지 못함)
+            duration = sf.info(file_path).duration
+        return duration
+    except Exception:
+        return None
+
+
+def is_long_audio(file_path, threshold=LONG_AUDIO_SECONDS):
+    """
+    파일 길이가 threshold(초)를 넘는지 (long-audio 모드 사용 여부)
+
+    길이를 알 수 없으면 True: 창 단위 모드는 어떤 길이에서도 메모리 사용이 일정하므로,
+    수 시간짜리 m4a를 메모리로 한 번에 디코딩하는 쪽보다 안전합니다.
+    """
+    duration = audio_duration(file_path)
+    return duration is None or duration > threshold
+
+
+def iter_frame_windows(audio, window_seconds=WINDOW_SECONDS):
+    """
+    창 단위 프레임 특징 생성
+
+    Yields:
+        (첫 프레임 번호, (frames, FRAME_FEATURE_DIM) 배열, (frames, 3) 통계 배열)
+        통계 배열의 열: 양수 pitch 후보 합, 양수 pitch 후보 수, 시간 영역 RMS
+    """
+    if len(audio) == 0:
+        return
+    frames_per_window = max(int(window_seconds * audio.sr) // HOP_LENGTH, 1)
+    n_frames = 1 + len(audio) // HOP_LENGTH  # librosa center=True 프레임 수
+    for first in range(0, n_frames, frames_per_window):
+        last = min(first + frames_per_window, n_frames)
+        begin = max(first * HOP_LENGTH - MARGIN, 0)
+        y = audio.read(begin, last * HOP_LENGTH + MARGIN)
+        frames, stats = _frame_features(y, audio.sr, segment_stats=True)
+        metrics.inc("long_audio_windows_total")
+        skip = first - begin // HOP_LENGTH
+        keep = slice(skip, skip + last - first)
+        yield first, frames[keep], stats[keep]
+
+
+def _frame_range(start, end, sr, n_frames):
+    """segment_frame_features와 같은 규칙의 [first, last) 프레임 범위"""
+    first = min(int(start * sr) // HOP_LENGTH, max(n_frames - 1, 0))
+    last = n_frames if math.isinf(end) else max(int(np.ceil(end * sr / HOP_LENGTH)), first + 1)
+    return first, min(last, n_frames)
+
+
+class _FrameCollector:
+    def __init__(self, duration):
+        self._chunks = []
+
+    def add(self, frames, stats):
+        self._chunks.append(frames.copy())  # 창 전체 배열을 붙잡지 않도록 복사
+
+    def result(self):
+        if not self._chunks:
+            return np.zeros((0, FRAME_FEATURE_DIM), dtype=np.float32)
+        return np.concatenate(self._chunks) if len(self._chunks) > 1 else self._chunks[0]
+
+
+class _StatsAccumulator:
+    """구간의 창별 부분합을 모아 extract_features와 같은 키의 통계로 합침"""
+
+    def __init__(self, duration):
+        self.duration = duration
+        self.count = 0
+        self.sums = np.zeros(FRAME_FEATURE_DIM, dtype=np.float64)
+        self.stat_sums = np.zeros(3, dtype=np.float64)
+        self._energy = []  # speech_rate용 프레임 RMS (구간 길이에 비례, 프레임당 4바이트)
+
+    def add(self, frames, stats):
+        self.count += len(frames)
+        self.sums += frames.sum(axis=0, dtype=np.float64)
+        self.stat_sums += stats.sum(axis=0)
+        self._energy.append(stats[:, 2].astype(np.float32))
+
+    def _speech_intervals(self):
+        # librosa.effects.split과 같은 기준: 구간 최대 RMS 대비 -top_db 초과 프레임의 연속 구간 수
+        energy = np.concatenate(self._energy) if self._energy else np.zeros(0, dtype=np.float32)
+        if not len(energy) or energy.max() <= 0:
+            return 0
+        voiced = (energy > energy.max() * 10 ** (-SILENCE_TOP_DB / 20)).astype(np.int8)
+        return int(voiced[0]) + int(np.count_nonzero(np.diff(voiced) == 1))
+
+    def result(self):
+        means = self.sums / self.count if self.count else np.zeros(FRAME_FEATURE_DIM)
+        pitch_sum, pitch_count, energy_sum = self.stat_sums
+        features = {
+            'pitch': pitch_sum / pitch_count if pitch_count else 0,
+            'energy': energy_sum / self.count if self.count else 0,
+            'spec_centroid': means[2],
+            'zcr': means[3],
+            'speech_rate': self._speech_intervals() / self.duration if self.duration > 0 else 0
+        }
+        for i in range(N_MFCC):
+            features[f'mfcc_{i+1}'] = means[4 + i]
+        return features
+
+
+def _iter_spans(audio, spans, window_seconds, accumulator):
+    """
+    창을 한 번 훑으면서 구간별 누적기를 채우고, 끝난 구간부터 (인덱스, 결과)를 내보냄
+
+    구간은 시작 시각 순으로 활성화되고 마지막 프레임을 지난 창에서 완료되므로
+    동시에 메모리에 있는 것은 현재 창과 진행 중인 구간의 누적기뿐입니다.
+    """
+    n_frames = 1 + len(audio) // HOP_LENGTH if len(audio) else 0
+    ranges = [_frame_range(start, end, audio.sr, n_frames) for start, end in spans]
+    order = sorted(range(len(spans)), key=lambda i: ranges[i][0])
+    pending = {}
+    position = 0
+
+    def activate(i):
+        start, end = spans[i]
+        pending[i] = accumulator(max(min(end, audio.duration) - start, 0))
+
+    for first, frames, stats in iter_frame_windows(audio, window_seconds):
+        last = first + len(frames)
+        while position < len(order) and ranges[order[position]][0] < last:
+            activate(order[position])
+            position += 1
+        for i in list(pending):
+            lo, hi = ranges[i]
+            a, b = max(lo, first) - first, min(hi, last) - first
+            if a < b:
+                pending[i].add(frames[a:b], stats[a:b])
+            if hi <= last:
+                yield i, pending.pop(i).result()
+
+    # 녹음 끝을 넘는 구간
+    for i in order[position:]:
+        activate(i)
+    for i in sorted(pending):
+        yield i, pending.pop(i).result()
+
+
+def _open(audio, sr):
+    return (open_long_audio(audio, sr), True) if isinstance(audio, str) else (audio, False)
+
+
+def iter_segment_frame_features(audio, spans, sr=SAMPLE_RATE, window_seconds=WINDOW_SECONDS):
+    """
+    구간별 프레임 특징 행렬을 완료되는 순서대로 생성 (segment_frame_features의 창 단위 버전)
+
+    Args:
+        audio: 파일 경로 또는 LongAudio
+        spans: [(start, end), ...] (초)
+
+    Yields:
+        (spans 인덱스, (time, FRAME_FEATURE_DIM) 배열)
+    """
+    audio, owned = _open(audio, sr)
+    try:
+        yield from _iter_spans(audio, spans, window_seconds, _FrameCollector)
+    finally:
+        if owned:
+            audio.close()
+
+
+@metrics.timed("feature_extraction", mode="long")
+def segment_frame_features_long(audio, spans, sr=SAMPLE_RATE, window_seconds=WINDOW_SECONDS):
+    """
+    여러 구간의 프레임 특징 행렬을 창 단위로 추출
+
+    Returns:
+        spans 순서의 (time, FRAME_FEATURE_DIM) 배열 리스트
+    """
+    mats = [None] * len(spans)
+    for i, mat in iter_segment_frame_features(audio, spans, sr, window_seconds):
+        mats[i] = mat
+    return mats
+
+
+@metrics.timed("feature_extraction", mode="long")
+def segment_statistics(audio, spans, sr=SAMPLE_RATE, window_seconds=WINDOW_SECONDS):
+    """
+    구간별 음향 통계를 창 단위로 계산해 합침
+
+    pitch / energy / spec_centroid / zcr / MFCC 평균과 speech_rate를 extract_features와
+    같은 키로 반환합니다. 프레임은 녹음 전체 기준 격자를 쓰므로 구간 경계의 패딩 차이만큼
+    구간 버퍼로 계산한 extract_features와 소수점 단위로 다를 수 있습니다.
+
+    Returns:
+        spans 순서의 특징 딕셔너리 리스트
+    """
+    audio, owned = _open(audio, sr)
+    try:
+        results = [None] * len(spans)
+        for i, features in _iter_spans(audio, spans, window_seconds, _StatsAccumulator):
+            results[i] = features
+        return results
+    finally:
+        if owned:
+            audio.close()
+
+
+def extract_features_long(file_path, sr=SAMPLE_RATE, start=None, end=None, window_seconds=WINDOW_SECONDS):
+    """extract_features의 long-audio 모드: 파일의 [start, end) 구간 통계를 창 단위로 계산"""
+    with open_long_audio(file_path, sr) as audio:
+        span = (start or 0.0, math.inf if end is None else end)
+        return segment_statistics(audio, [span], sr, window_seconds)[0]
+
+
+def extract_frame_features_long(file_path, sr=SAMPLE_RATE, start=None, end=None, window_seconds=WINDOW_SECONDS):
+    """extract_frame_features의 long-audio 모드"""
+    with open_long_audio(file_path, sr) as audio:
+        span = (start or 0.0, math.inf if end is None else end)
+        return segment_frame_features_long(audio, [span], sr, window_seconds)[0]
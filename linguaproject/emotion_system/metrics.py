@@ -0,0 +1,212 @@
+'''
+파이프라인 단계별 계측 (span / 히스토그램 / 카운터)
+with metrics.span("asr"): ... 형태로 단계 소요 시간을 히스토그램에 기록하고,
+모델 로드 수, 캐시 적중, 처리한 구간 수 등은 카운터로 셉니다.
+Prometheus 텍스트 형식 또는 JSON 스냅샷으로 내보낼 수 있습니다.
+
+환경 변수 LINGUA_METRICS=1이면 활성화되고, 비활성 상태의 span()은 공유 no-op
+객체를 반환하므로 호출 비용이 거의 없습니다.
+LINGUA_METRICS_FILE을 지정하면 dump()가 해당 파일(.json 또는 Prometheus 텍스트)에 씁니다.
+'''
+
+import bisect
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import nullcontext
+from typing import Dict, List, Optional, Tuple
+
+# 지연 시간 히스토그램 버킷 (초)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_NOOP = nullcontext()
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, object]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    items = list(key) + ([extra] if extra else [])
+    if not items:
+        return ""
+    escaped = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in items)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(items, escaped)) + "}"
+
+
+class Histogram:
+    """누적 버킷 히스토그램 (Prometheus histogram과 같은 의미)"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # 마지막 칸은 +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> List[int]:
+        total, result = 0, []
+        for count in self.counts:
+            total += count
+            result.append(total)
+        return result
+
+
+class _Span:
+    """활성 상태의 span: 종료 시 소요 시간을 히스토그램에 기록"""
+    __slots__ = ("_metrics", "_name", "_labels", "_started")
+
+    def __init__(self, metrics: "Metrics", name: str, labels: Dict[str, object]):
+        self._metrics = metrics
+        self._name = name
+        self._labels = labels
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self._started
+        self._metrics.observe("stage_seconds", elapsed, stage=self._name, **self._labels)
+        if exc_type is not None:
+            self._metrics.inc("stage_errors_total", stage=self._name)
+        return False
+
+
+class Metrics:
+    """스레드 안전 메트릭 저장소"""
+
+    def __init__(self, enabled: bool = False, prefix: str = "lingua"):
+        self.enabled = enabled
+        self.prefix = prefix
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._lock = threading.Lock()
+
+    def enable(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+
+    def span(self, name: str, **labels):
+        """단계 소요 시간 측정 context manager (stage_seconds{stage=name})"""
+        if not self.enabled:
+            return _NOOP
+        return _Span(self, name, labels)
+
+    def timed(self, name: str, **labels):
+        """함수 호출 전체를 span으로 감싸는 데코레이터"""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with _Span(self, name, labels):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(value)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def snapshot(self) -> dict:
+        """JSON 직렬화 가능한 현재 값"""
+        with self._lock:
+            counters = {
+                name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                for name, series in self._counters.items()
+            }
+            histograms = {
+                name: [{
+                    "labels": dict(key),
+                    "count": h.count,
+                    "sum": h.sum,
+                    "mean": h.sum / h.count if h.count else 0.0,
+                    "buckets": dict(zip([*map(str, h.buckets), "+Inf"], h.cumulative()))
+                } for key, h in series.items()]
+                for name, series in self._histograms.items()
+            }
+        return {"timestamp": time.time(), "counters": counters, "histograms": histograms}
+
+    def to_prometheus(self) -> str:
+        """Prometheus 텍스트 노출 형식"""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                metric = f"{self.prefix}_{name}"
+                lines.append(f"# TYPE {metric} counter")
+                lines += [f"{metric}{_format_labels(key)} {value:g}" for key, value in series.items()]
+            for name, series in sorted(self._histograms.items()):
+                metric = f"{self.prefix}_{name}"
+                lines.append(f"# TYPE {metric} histogram")
+                for key, h in series.items():
+                    for bound, count in zip([*map(str, h.buckets), "+Inf"], h.cumulative()):
+                        lines.append(f"{metric}_bucket{_format_labels(key, ('le', bound))} {count}")
+                    lines.append(f"{metric}_sum{_format_labels(key)} {h.sum:.6f}")
+                    lines.append(f"{metric}_count{_format_labels(key)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def format_summary(self) -> str:
+        """단계별 호출 수 / 평균 / 합계 (콘솔 출력용)"""
+        snapshot = self.snapshot()
+        lines = [f"{'stage':<24}{'calls':>8}{'mean(ms)':>12}{'total(s)':>10}"]
+        for item in sorted(snapshot["histograms"].get("stage_seconds", []), key=lambda i: -i["sum"]):
+            stage = ",".join(f"{k}={v}" for k, v in item["labels"].items() if k != "stage")
+            name = item["labels"]["stage"] + (f" [{stage}]" if stage else "")
+            lines.append(f"{name:<24}{item['count']:>8}{item['mean'] * 1000:>12.2f}{item['sum']:>10.2f}")
+        for name, series in sorted(snapshot["counters"].items()):
+            for item in series:
+                labels = ",".join(f"{k}={v}" for k, v in item["labels"].items())
+                lines.append(f"{name}{'{' + labels + '}' if labels else ''} = {item['value']:g}")
+        return "\n".join(lines)
+
+    def dump(self, path: Optional[str] = None) -> None:
+        """
+        활성 상태이면 메트릭을 내보냄
+
+        path(기본: LINGUA_METRICS_FILE)가 .json이면 JSON 스냅샷, 그 밖의 경로는 Prometheus 텍스트로 쓰고,
+        경로가 없으면 요약을 stderr에 출력합니다.
+        """
+        if not self.enabled:
+            return
+        path = path or os.getenv("LINGUA_METRICS_FILE")
+        if not path:
+            print(self.format_summary(), file=sys.stderr)
+            return
+        with open(path, "w", encoding="utf-8") as f:
+            if path.endswith(".json"):
+                json.dump(self.snapshot(), f, ensure_ascii=False, indent=2)
+            else:
+                f.write(self.to_prometheus())
+
+
+# 프로세스 전역 메트릭
+metrics = Metrics(enabled=os.getenv("LINGUA_METRICS", "").lower() in ("1", "true", "yes", "on"))
@@ -0,0 +1,209 @@
+'''
+프로세스 전역 모델 레지스트리
+KoBERT, KoGPT2, Whisper, pyannote 등 무거운 모델을 프로세스당 한 번만 로드합니다.
+각 단계 모듈이 로더를 등록하고, 실제 로드는 첫 get() 호출 시점에 지연 수행됩니다.
+'''
+
+import inspect
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .metrics import metrics
+
+
+@dataclass
+class ModelLoadStats:
+    """모델 로드 통계"""
+    name: str                      # 레지스트리 키
+    options: Dict[str, Any]        # 로더에 전달된 옵션
+    load_seconds: float            # 로드 소요 시간 (초)
+    rss_delta_bytes: Optional[int]  # 로드 전후 프로세스 상주 메모리 증가량
+    param_bytes: Optional[int]     # torch 파라미터/버퍼 메모리 (계산 가능한 경우)
+
+
+def _current_rss_bytes() -> Optional[int]:
+    """현재 프로세스의 상주 메모리(RSS)를 바이트 단위로 반환"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _torch_param_bytes(obj: Any) -> Optional[int]:
+    """모델(또는 모델을 담은 튜플/딕셔너리)의 파라미터 + 버퍼 메모리 합계"""
+    if isinstance(obj, (tuple, list)):
+        sizes = [_torch_param_bytes(item) for item in obj]
+    elif isinstance(obj, dict):
+        sizes = [_torch_param_bytes(item) for item in obj.values()]
+    else:
+        if not (hasattr(obj, "parameters") and hasattr(obj, "buffers")):
+            return None
+        try:
+            tensors = list(obj.parameters()) + list(obj.buffers())
+        except TypeError:
+            return None
+        return sum(t.numel() * t.element_size() for t in tensors)
+    sizes = [s for s in sizes if s is not None]
+    return sum(sizes) if sizes else None
+
+
+class ModelRegistry:
+    """지연 초기화 + 스레드 안전 모델 레지스트리"""
+
+    def __init__(self):
+        self._loaders: Dict[str, Callable[..., Any]] = {}
+        self._resolvers: Dict[str, Callable[..., Dict[str, Any]]] = {}
+        self._models: Dict[Tuple, Any] = {}
+        self._stats: Dict[Tuple, ModelLoadStats] = {}
+        self._key_locks: Dict[Tuple, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, loader: Callable[..., Any],
+                 resolve: Optional[Callable[..., Dict[str, Any]]] = None) -> None:
+        """
+        모델 로더 등록
+
+        Args:
+            name: 레지스트리 키 (예: "kobert_emotion")
+            loader: 옵션을 키워드 인자로 받아 모델 객체를 반환하는 함수
+            resolve: 옵션을 키워드 인자로 받아 확정된 옵션 딕셔너리를 반환하는 함수 (선택)
+                     환경 변수 / auto 값을 채워 넣어 get(name)과 명시 옵션 호출이 같은 모델을 공유하도록 함
+        """
+        with self._lock:
+            self._loaders[name] = loader
+            self._resolvers[name] = resolve
+
+    def is_registered(self, name: str) -> bool:
+        return name in self._loaders
+
+    def get(self, name: str, **options) -> Any:
+        """
+        모델 반환 (최초 호출 시 로드)
+
+        같은 이름이라도 옵션(모델 크기, 토큰 등)이 다르면 별도로 캐시됩니다.
+        서로 다른 모델은 병렬로 로드될 수 있고, 같은 모델은 한 번만 로드됩니다.
+        """
+        if name not in self._loaders:
+            raise KeyError(f"등록되지 않은 모델입니다: {name}")
+        loader = self._loaders[name]
+        options = self._resolve_options(name, options)
+        key = self._make_key(name, options)
+        model = self._models.get(key)
+        if model is not None:
+            return model
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            model = self._models.get(key)
+            if model is not None:
+                return model
+
+            rss_before = _current_rss_bytes()
+            started = time.perf_counter()
+            model = loader(**options)
+            elapsed = time.perf_counter() - started
+            rss_after = _current_rss_bytes()
+
+            self._stats[key] = ModelLoadStats(
+                name=name,
+                options=dict(options),
+                load_seconds=elapsed,
+                rss_delta_bytes=(rss_after - rss_before
+                                 if rss_before is not None and rss_after is not None else None),
+                param_bytes=_torch_param_bytes(model),
+            )
+            self._models[key] = model
+            metrics.inc("models_loaded_total", model=name)
+            metrics.observe("model_load_seconds", elapsed, model=name)
+            return model
+
+    def is_loaded(self, name: str, **options) -> bool:
+        if name not in self._loaders:
+            return False
+        return self._make_key(name, self._resolve_options(name, options)) in self._models
+
+    def warmup(self, names: Optional[Iterable[str]] = None) -> List[ModelLoadStats]:
+        """
+        모델 선로딩
+
+        Args:
+            names: 로드할 레지스트리 키 목록 (None이면 등록된 전체 모델)
+
+        Returns:
+            로드된 모델의 ModelLoadStats 리스트
+        """
+        targets = list(names) if names is not None else list(self._loaders)
+        for name in targets:
+            self.get(name)
+        return self.report()
+
+    def unload(self, name: Optional[str] = None) -> None:
+        """캐시된 모델 해제 (name이 None이면 전체)"""
+        with self._lock:
+            for key in list(self._models):
+                if name is None or key[0] == name:
+                    del self._models[key]
+                    self._stats.pop(key, None)
+
+    def report(self) -> List[ModelLoadStats]:
+        """로드된 모델별 로드 시간 및 메모리 사용량"""
+        return list(self._stats.values())
+
+    def format_report(self) -> str:
+        """report()를 사람이 읽기 쉬운 표 형태로 변환"""
+        lines = [f"{'model':<28}{'load(s)':>10}{'rss(MB)':>12}{'params(MB)':>12}"]
+        for stats in self.report():
+            rss = f"{stats.rss_delta_bytes / 2**20:.1f}" if stats.rss_delta_bytes is not None else "-"
+            params = f"{stats.param_bytes / 2**20:.1f}" if stats.param_bytes is not None else "-"
+            lines.append(f"{stats.name:<28}{stats.load_seconds:>10.2f}{rss:>12}{params:>12}")
+        return "\n".join(lines)
+
+    def _resolve_options(self, name: str, options: Dict[str, Any]) -> Dict[str, Any]:
+        """로더 기본값(과 등록된 resolve)을 채워 넣어 get(name)과 get(name, **기본값)이 같은 키가 되도록 함"""
+        resolve = self._resolvers.get(name)
+        if resolve is not None:
+            return resolve(**options)
+        try:
+            bound = inspect.signature(self._loaders[name]).bind(**options)
+        except (TypeError, ValueError):
+            return options
+        bound.apply_defaults()
+        return dict(bound.arguments)
+
+    @staticmethod
+    def _make_key(name: str, options: Dict[str, Any]) -> Tuple:
+        return (name,) + tuple(sorted(options.items()))
+
+
+# 프로세스 전역 레지스트리
+registry = ModelRegistry()
+
+
+def warmup(names: Optional[Iterable[str]] = None) -> List[ModelLoadStats]:
+    """
+    각 단계 모듈을 import해 로더를 등록한 뒤 모델을 선로딩합니다.
+    """
+    from . import asr  # noqa: F401
+    from .emotion import text_emotion, audio_emotion  # noqa: F401
+    from .response import generate_response  # noqa: F401
+    from .diarization import speaker_split  # noqa: F401
+    return registry.warmup(names)
+
+
+if __name__ == "__main__":
+    # 사용 예: python -m emotion_system.model_registry kobert_emotion kogpt2
+    warmup(sys.argv[1:] or None)
+    print(registry.format_report())
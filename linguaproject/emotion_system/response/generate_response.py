@@ -1,35 +1,172 @@
 '''
 KoGPT 기반 상담사 응답 생성
 styles.py에 입력해 상담사별 스타일을 적용 가능합니다(counselor_A, counselor_B 등)
+프롬프트는 감정 스타일별 공통 prefix(헤더 + 감정 + 스타일)와 발화별 suffix로 나뉩니다.
+prefix의 key/value 캐시는 스타일별로 한 번만 계산해 재사용하고,
+여러 발화는 같은 스타일끼리 묶어 한 번에 생성하며, 토큰 단위 스트리밍도 지원합니다.
 '''
 
-from transformers import GPT2LMHeadModel, PreTrainedTokenizerFast
+import copy
+import threading
+import weakref
+from collections import defaultdict
 
-def generate_response(emotion_label, user_text):
-    style_map = {
-        "불만": "공감하며 사과하고 해결 방안을 안내하는 말투로",
-        "분노": "책임감 있게 사과하고 신속한 조치를 약속하는 말투로",
-        "짜증": "불편을 인정하고 빠른 해결을 약속하는 말투로",
-        "실망": "기대에 못 미친 점을 사과하고 개선을 약속하는 말투로",
-        "불안": "안심시키고 절차를 명확히 설명하는 말투로",
-        "혼란": "상황을 정리하고 명확하게 설명하는 말투로",
-        "중립": "정중하고 간결하게 안내하는 말투로",
-        "요청": "요청 사항을 확인하고 처리 절차를 안내하는 말투로",
-        "호기심": "정보를 친절하게 설명하고 추가 안내를 제공하는 말투로",
-        "감사": "감사 인사를 공손하게 전달하는 말투로",
-        "기쁨": "긍정적인 분위기를 유지하며 감사 인사를 전하는 말투로",
-        "감동": "진심 어린 감사와 응원의 말을 전하는 말투로",
-        "슬픔": "공감하며 위로하고 필요한 도움을 안내하는 말투로",
-        "피로": "간결하고 배려 있는 말투로 핵심만 안내하는 말투로"
-    }
-    style = style_map.get(emotion_label, "정중하고 간결한 말투로")
-    prompt = f"""민원 상담 응답 생성기
+import torch
+from transformers import GPT2LMHeadModel, PreTrainedTokenizerFast, TextIteratorStreamer
+from ..metrics import metrics
+from ..model_registry import registry
+
+MODEL_NAME = "skt/kogpt2-base-v2"
+MAX_NEW_TOKENS = 100
+
+STYLE_MAP = {
+    "불만": "공감하며 사과하고 해결 방안을 안내하는 말투로",
+    "분노": "책임감 있게 사과하고 신속한 조치를 약속하는 말투로",
+    "짜증": "불편을 인정하고 빠른 해결을 약속하는 말투로",
+    "실망": "기대에 못 미친 점을 사과하고 개선을 약속하는 말투로",
+    "불안": "안심시키고 절차를 명확히 설명하는 말투로",
+    "혼란": "상황을 정리하고 명확하게 설명하는 말투로",
+    "중립": "정중하고 간결하게 안내하는 말투로",
+    "요청": "요청 사항을 확인하고 처리 절차를 안내하는 말투로",
+    "호기심": "정보를 친절하게 설명하고 추가 안내를 제공하는 말투로",
+    "감사": "감사 인사를 공손하게 전달하는 말투로",
+    "기쁨": "긍정적인 분위기를 유지하며 감사 인사를 전하는 말투로",
+    "감동": "진심 어린 감사와 응원의 말을 전하는 말투로",
+    "슬픔": "공감하며 위로하고 필요한 도움을 안내하는 말투로",
+    "피로": "간결하고 배려 있는 말투로 핵심만 안내하는 말투로"
+}
+DEFAULT_STYLE = "정중하고 간결한 말투로"
+
+
+def _load_kogpt2():
+    tokenizer = PreTrainedTokenizerFast.from_pretrained(MODEL_NAME)
+    model = GPT2LMHeadModel.from_pretrained(MODEL_NAME)
+    model.eval()
+    return tokenizer, model
+
+
+registry.register("kogpt2", _load_kogpt2)
+
+# model → {prefix: (prefix_ids, past_key_values)} (레지스트리에서 모델이 해제되면 함께 사라짐)
+_prefix_cache = weakref.WeakKeyDictionary()
+_prefix_lock = threading.Lock()
+
+
+def build_prompt(emotion_label, user_text):
+    """(스타일별 공통 prefix, 발화별 suffix)"""
+    style = STYLE_MAP.get(emotion_label, DEFAULT_STYLE)
+    prefix = f"""민원 상담 응답 생성기
 사용자 감정: {emotion_label}
-사용자 발화: {user_text}
 상담사 응답 스타일: {style}
+"""
+    suffix = f"""사용자 발화: {user_text}
 상담사 응답:"""
-    tokenizer = PreTrainedTokenizerFast.from_pretrained("skt/kogpt2-base-v2")
-    model = GPT2LMHeadModel.from_pretrained("skt/kogpt2-base-v2")
-    input_ids = tokenizer.encode(prompt, return_tensors="pt")
-    output = model.generate(input_ids, max_new_tokens=100, do_sample=True)
-    return tokenizer.decode(output[0], skip_special_tokens=True)
\ No newline at end of file
+    return prefix, suffix
+
+
+def _prefix_state(tokenizer, model, prefix):
+    """prefix 토큰과 key/value 캐시 (스타일별 1회 계산, 호출마다 복사본을 사용)"""
+    with _prefix_lock:
+        states = _prefix_cache.setdefault(model, {})
+        cached = states.get(prefix)
+        metrics.inc("prefix_cache_total", result="miss" if cached is None else "hit")
+        if cached is None:
+            prefix_ids = tokenizer(prefix, return_tensors="pt")["input_ids"]
+            with torch.no_grad():
+                past = model(prefix_ids, use_cache=True).past_key_values
+            cached = states[prefix] = (prefix_ids, past)
+    return cached
+
+
+def clear_prefix_cache():
+    with _prefix_lock:
+        _prefix_cache.clear()
+
+
+def _repeat_cache(past, repeats):
+    """key/value 캐시를 배치 방향으로 repeats배 확장 (Cache 객체 / 구버전 transformers의 튜플 캐시)"""
+    if isinstance(past, tuple):
+        return tuple(tuple(tensor.repeat_interleave(repeats, dim=0) for tensor in layer) for layer in past)
+    past.batch_repeat_interleave(repeats)
+    return past
+
+
+def _prepare_inputs(tokenizer, model, prefix, suffixes):
+    """
+    prefix 캐시를 배치 크기로 확장하고 suffix를 왼쪽 패딩해 generate 입력 구성
+
+    패딩은 prefix와 suffix 사이에 오고 attention_mask로 가려집니다.
+    """
+    prefix_ids, past = _prefix_state(tokenizer, model, prefix)
+    past = copy.deepcopy(past)  # generate가 캐시를 제자리 갱신하므로 복사본 사용
+    if len(suffixes) > 1:
+        past = _repeat_cache(past, len(suffixes))
+
+    encoded = [tokenizer(suffix)["input_ids"] for suffix in suffixes]
+    width = max(len(ids) for ids in encoded)
+    pad_id = tokenizer.pad_token_id if tokenizer.pad_token_id is not None else tokenizer.eos_token_id
+    suffix_ids = torch.tensor([[pad_id] * (width - len(ids)) + ids for ids in encoded])
+    suffix_mask = torch.tensor([[0] * (width - len(ids)) + [1] * len(ids) for ids in encoded])
+
+    batch = len(suffixes)
+    input_ids = torch.cat((prefix_ids.expand(batch, -1), suffix_ids), dim=1)
+    attention_mask = torch.cat((torch.ones(batch, prefix_ids.shape[1], dtype=torch.long), suffix_mask), dim=1)
+    return {
+        "input_ids": input_ids,
+        "attention_mask": attention_mask,
+        "past_key_values": past,
+        "pad_token_id": pad_id
+    }
+
+
+@metrics.timed("generation")
+def generate_responses(items, max_new_tokens=MAX_NEW_TOKENS, do_sample=True):
+    """
+    여러 발화의 응답을 감정 스타일별 배치로 생성
+
+    Args:
+        items: [(emotion_label, user_text), ...]
+
+    Returns:
+        응답 문자열 리스트 (입력 순서, 생성된 부분만)
+    """
+    tokenizer, model = registry.get("kogpt2")
+    groups = defaultdict(list)  # prefix → [(원래 인덱스, suffix)]
+    for index, (emotion_label, user_text) in enumerate(items):
+        prefix, suffix = build_prompt(emotion_label, user_text)
+        groups[prefix].append((index, suffix))
+
+    responses = [None] * len(items)
+    for prefix, members in groups.items():
+        inputs = _prepare_inputs(tokenizer, model, prefix, [suffix for _, suffix in members])
+        prompt_length = inputs["input_ids"].shape[1]
+        with torch.no_grad():
+            output = model.generate(**inputs, max_new_tokens=max_new_tokens, do_sample=do_sample)
+        for (index, _), tokens in zip(members, output[:, prompt_length:]):
+            responses[index] = tokenizer.decode(tokens, skip_special_tokens=True).strip()
+    return responses
+
+
+def generate_response_stream(emotion_label, user_text, max_new_tokens=MAX_NEW_TOKENS, do_sample=True):
+    """
+    응답을 생성되는 대로 조각 단위로 yield (상담사 화면 첫 토큰 지연 최소화)
+    """
+    tokenizer, model = registry.get("kogpt2")
+    prefix, suffix = build_prompt(emotion_label, user_text)
+    inputs = _prepare_inputs(tokenizer, model, prefix, [suffix])
+    streamer = TextIteratorStreamer(tokenizer, skip_prompt=True, skip_special_tokens=True)
+
+    def _generate():
+        with torch.no_grad():
+            model.generate(**inputs, max_new_tokens=max_new_tokens, do_sample=do_sample, streamer=streamer)
+
+    thread = threading.Thread(target=_generate, daemon=True)
+    thread.start()
+    try:
+        yield from streamer
+    finally:
+        thread.join()
+
+
+def generate_response(emotion_label, user_text):
+    return generate_responses([(emotion_label, user_text)])[0]
@@ -0,0 +1,165 @@
+'''
+계층형 상담사 응답기
+1. 템플릿: styles.py의 counselor_styles에 예시 응답이 있는 (빈도 높은) 감정 라벨은 즉시 반환
+2. 캐시: 생성된 응답을 (감정, 정규화 텍스트, 상담사 스타일) 키의 LRU(크기/TTL 제한)에 저장
+3. 생성: 두 단계 모두 미스일 때만 KoGPT2로 생성
+단계별 적중 횟수와 적중률을 stats()로 확인할 수 있습니다.
+'''
+
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from ..metrics import metrics
+from .styles import counselor_styles
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+def normalize_text(text):
+    """캐시 키용 정규화 (문장부호 제거, 공백 정리, 소문자)"""
+    return " ".join(_PUNCTUATION.sub(" ", text).lower().split())
+
+
+class ResponseCache:
+    """크기와 TTL이 제한된 스레드 안전 LRU 캐시"""
+
+    def __init__(self, max_size=1024, ttl=3600.0, clock=time.monotonic):
+        """
+        Args:
+            max_size: 최대 항목 수 (넘으면 가장 오래 사용하지 않은 항목부터 제거)
+            ttl: 항목 유효 시간 (초, None이면 만료 없음)
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self._items = OrderedDict()  # key → (value, expires_at)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at is not None and self.clock() >= expires_at:
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        expires_at = None if self.ttl is None else self.clock() + self.ttl
+        with self._lock:
+            self._items[key] = (value, expires_at)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+
+class TieredResponder:
+    """템플릿 → LRU 캐시 → KoGPT2 생성 순서로 응답"""
+
+    def __init__(self, counselor="default", template_labels=None, cache_size=1024, ttl=3600.0,
+                 generate_fn=None):
+        """
+        Args:
+            counselor: counselor_styles의 상담사 키 (counselor_A, counselor_B 등)
+            template_labels: 템플릿으로 바로 응답할 감정 라벨 (기본: 해당 상담사에 예시 응답이 있는 라벨)
+            cache_size / ttl: 생성 응답 캐시의 최대 항목 수 / 유효 시간 (초)
+            generate_fn: [(emotion, text)] → [response] 배치 생성 함수 (기본: KoGPT2 generate_responses)
+        """
+        if counselor not in counselor_styles:
+            raise ValueError(f"알 수 없는 상담사 스타일입니다: {counselor}")
+        self.counselor = counselor
+        self.templates = {**counselor_styles["default"], **counselor_styles[counselor]}
+        self.template_labels = set(self.templates if template_labels is None else template_labels)
+        self.cache = ResponseCache(cache_size, ttl)
+        self._generate_fn = generate_fn
+        self._counts = {"template": 0, "cache": 0, "generated": 0}
+        self._lock = threading.Lock()
+
+    def _generate(self, items):
+        if self._generate_fn is None:
+            from .generate_response import generate_responses  # 미스가 처음 날 때 KoGPT2 경로 import
+            self._generate_fn = generate_responses
+        return self._generate_fn(items)
+
+    def _count(self, tier, n=1):
+        with self._lock:
+            self._counts[tier] += n
+        metrics.inc("responses_total", n, tier=tier)
+
+    def _lookup(self, emotion_label, user_text):
+        """(응답, 캐시 키) — 템플릿/캐시 미스이면 응답은 None"""
+        if emotion_label in self.template_labels and emotion_label in self.templates:
+            self._count("template")
+            return self.templates[emotion_label][1], None
+        key = (emotion_label, normalize_text(user_text), self.counselor)
+        response = self.cache.get(key)
+        if response is not None:
+            self._count("cache")
+        return response, key
+
+    def respond(self, emotion_label, user_text):
+        return self.respond_batch([(emotion_label, user_text)])[0]
+
+    def respond_batch(self, items):
+        """
+        여러 발화 응답 (미스인 발화만 모아 한 번에 생성)
+
+        Args:
+            items: [(emotion_label, user_text), ...]
+
+        Returns:
+            응답 문자열 리스트 (입력 순서)
+        """
+        responses = [None] * len(items)
+        misses = {}  # 캐시 키 → 같은 키를 가진 입력 인덱스 (배치 내 중복은 한 번만 생성)
+        for index, (emotion_label, user_text) in enumerate(items):
+            response, key = self._lookup(emotion_label, user_text)
+            if response is not None:
+                responses[index] = response
+            elif key in misses:
+                self._count("cache")  # 같은 배치에서 먼저 나온 발화의 생성 결과를 재사용
+                misses[key].append(index)
+            else:
+                misses[key] = [index]
+
+        if misses:
+            keys = list(misses)
+            generated = self._generate([items[misses[key][0]] for key in keys])
+            self._count("generated", len(keys))
+            for key, response in zip(keys, generated):
+                self.cache.put(key, response)
+                for index in misses[key]:
+                    responses[index] = response
+        return responses
+
+    def stats(self):
+        """단계별 적중 횟수와 적중률"""
+        with self._lock:
+            counts = dict(self._counts)
+        total = sum(counts.values())
+        hits = counts["template"] + counts["cache"]
+        return {
+            **counts,
+            "total": total,
+            "cache_size": len(self.cache),
+            "template_hit_rate": counts["template"] / total if total else 0.0,
+            "cache_hit_rate": counts["cache"] / total if total else 0.0,
+            "hit_rate": hits / total if total else 0.0
+        }
+
+    def format_stats(self):
+        s = self.stats()
+        return (f"응답 {s['total']}건: 템플릿 {s['template']} / 캐시 {s['cache']} / 생성 {s['generated']} "
+                f"(적중률 {s['hit_rate'] * 100:.1f}%)")
@@ -0,0 +1,175 @@
+'''
+실시간 오디오 발화 구간 검출 (VAD endpointing)
+미리 할당한 링 버퍼에 오디오를 쌓고, 경량 VAD로 발화 시작/끝을 찾아
+앞뒤 패딩을 붙인 완결된 발화 구간만 ASR로 넘깁니다.
+무음 블록은 ASR을 호출하지 않고, 단어가 블록 경계에서 잘리지 않습니다.
+'''
+
+import numpy as np
+
+
+class RingBuffer:
+    """미리 할당된 고정 크기 float32 링 버퍼 (절대 샘플 인덱스로 접근)"""
+
+    def __init__(self, capacity):
+        self._buffer = np.zeros(capacity, dtype=np.float32)
+        self.capacity = capacity
+        self.total_written = 0  # 지금까지 쓴 전체 샘플 수
+
+    @property
+    def oldest(self):
+        """아직 덮어쓰이지 않은 가장 오래된 샘플의 절대 인덱스"""
+        return max(0, self.total_written - self.capacity)
+
+    def write(self, samples):
+        samples = np.asarray(samples, dtype=np.float32).reshape(-1)
+        if len(samples) > self.capacity:
+            self.total_written += len(samples) - self.capacity
+            samples = samples[-self.capacity:]
+        position = self.total_written % self.capacity
+        head = min(len(samples), self.capacity - position)
+        self._buffer[position:position + head] = samples[:head]
+        self._buffer[:len(samples) - head] = samples[head:]
+        self.total_written += len(samples)
+
+    def read(self, start, end):
+        """[start, end) 절대 인덱스 구간을 연속 배열로 복사해 반환 (버퍼 범위로 잘림)"""
+        start = max(start, self.oldest)
+        end = min(end, self.total_written)
+        if end <= start:
+            return np.zeros(0, dtype=np.float32)
+        first, last = start % self.capacity, end % self.capacity
+        if first < last or last == 0:
+            return self._buffer[first:last or self.capacity].copy()
+        return np.concatenate((self._buffer[first:], self._buffer[:last]))
+
+
+class EnergyVAD:
+    """
+    프레임 RMS 에너지 기반 경량 VAD
+
+    무음 프레임으로 노이즈 플로어를 지수 이동 평균으로 추정하고,
+    노이즈 플로어의 threshold_ratio배를 넘는 프레임을 음성으로 판단합니다.
+    배경 소음이 임계값 위로 올라가 모든 프레임이 음성으로 판단되는 경우에도 따라갈 수 있도록,
+    음성 프레임에서는 최근 noise_window 프레임 RMS의 하위 noise_percentile(최소 통계)로 천천히 올립니다.
+    (실제 발화에는 단어 사이 쉼이 있어 하위 백분위가 배경 소음 수준에 머묾)
+    webrtcvad가 설치되어 있고 use_webrtc=True이면 WebRTC VAD를 사용합니다.
+    """
+
+    def __init__(self, samplerate=16000, threshold_ratio=3.0, min_rms=0.005, noise_alpha=0.05,
+                 noise_window=100, noise_percentile=10, use_webrtc=False, webrtc_mode=2):
+        """
+        Args:
+            noise_window: 최소 통계에 쓰는 최근 프레임 수 (30ms 프레임 기준 100 = 3초)
+            noise_percentile: 최근 프레임 RMS 중 배경 소음으로 볼 하위 백분위
+        """
+        self.samplerate = samplerate
+        self.threshold_ratio = threshold_ratio
+        self.min_rms = min_rms
+        self.noise_alpha = noise_alpha
+        self.noise_floor = min_rms
+        self.noise_percentile = noise_percentile
+        self._recent_rms = np.zeros(noise_window, dtype=np.float32)  # 최근 프레임 RMS 링 버퍼
+        self._frames_seen = 0
+        self._webrtc = None
+        if use_webrtc:
+            try:
+                import webrtcvad
+                self._webrtc = webrtcvad.Vad(webrtc_mode)
+            except ImportError:
+                print("Warning: webrtcvad를 로드할 수 없습니다. 에너지 기반 VAD를 사용합니다.")
+
+    def is_speech(self, frame):
+        if self._webrtc is not None:
+            pcm = (np.clip(frame, -1.0, 1.0) * 32767).astype(np.int16).tobytes()
+            return self._webrtc.is_speech(pcm, self.samplerate)
+
+        rms = float(np.sqrt(np.mean(frame * frame)))
+        self._recent_rms[self._frames_seen % len(self._recent_rms)] = rms
+        self._frames_seen += 1
+        speech = rms > max(self.min_rms, self.noise_floor * self.threshold_ratio)
+        if not speech:
+            self.noise_floor += self.noise_alpha * (rms - self.noise_floor)
+        elif self._frames_seen >= len(self._recent_rms):
+            background = float(np.percentile(self._recent_rms, self.noise_percentile))
+            if background > self.noise_floor:
+                self.noise_floor += self.noise_alpha * (background - self.noise_floor)
+        return speech
+
+
+class UtteranceSegmenter:
+    """링 버퍼 + VAD 기반 발화 구간 검출기"""
+
+    def __init__(self, samplerate=16000, frame_ms=30, pre_padding=0.3, post_padding=0.3,
+                 min_speech=0.25, max_silence=0.6, max_utterance=15.0, vad=None):
+        """
+        Args:
+            frame_ms: VAD 판단 프레임 길이 (webrtcvad는 10/20/30ms만 지원)
+            pre_padding: 발화 시작 앞에 붙일 오디오 (초)
+            post_padding: 발화 끝 뒤에 붙일 오디오 (초, max_silence 이하)
+            min_speech: 이보다 짧은 음성 구간은 버림 (초)
+            max_silence: 이만큼 무음이 이어지면 발화 종료 (초)
+            max_utterance: 발화가 이보다 길면 강제로 끊음 (초)
+            vad: is_speech(frame)를 제공하는 객체 (기본: EnergyVAD)
+        """
+        self.samplerate = samplerate
+        self.frame = int(samplerate * frame_ms / 1000)
+        self.pre_padding = int(pre_padding * samplerate)
+        self.post_padding = int(min(post_padding, max_silence) * samplerate)
+        self.min_speech = int(min_speech * samplerate)
+        self.max_silence = int(max_silence * samplerate)
+        self.max_utterance = int(max_utterance * samplerate)
+        self.vad = vad or EnergyVAD(samplerate)
+
+        # 발화 최대 길이 + 패딩 + 처리 대기분을 담을 수 있는 크기로 한 번만 할당
+        self.ring = RingBuffer(self.max_utterance + self.pre_padding + self.max_silence + samplerate)
+        self._processed = 0          # VAD 판단을 마친 샘플 인덱스
+        self._speech_start = None    # 현재 발화의 첫 음성 프레임 인덱스
+        self._last_voiced_end = 0    # 마지막 음성 프레임의 끝 인덱스
+        self._voiced_samples = 0     # 현재 발화 내 음성 프레임 샘플 수
+
+    def push(self, samples):
+        """
+        오디오 블록 추가
+
+        Returns:
+            이번 블록으로 완결된 발화 구간(float32 배열) 리스트
+        """
+        self.ring.write(samples)
+        utterances = []
+        while self.ring.total_written - self._processed >= self.frame:
+            start = self._processed
+            end = start + self.frame
+            voiced = self.vad.is_speech(self.ring.read(start, end))
+            self._processed = end
+
+            if voiced:
+                if self._speech_start is None:
+                    self._speech_start = start
+                    self._voiced_samples = 0
+                self._last_voiced_end = end
+                self._voiced_samples += self.frame
+
+            if self._speech_start is not None:
+                silence = end - self._last_voiced_end
+                length = end - self._speech_start
+                if silence >= self.max_silence or length >= self.max_utterance:
+                    utterance = self._emit()
+                    if utterance is not None:
+                        utterances.append(utterance)
+        return utterances
+
+    def flush(self):
+        """남아 있는 발화를 강제로 종료 (스트림 종료 시)"""
+        if self._speech_start is None:
+            return []
+        utterance = self._emit()
+        return [utterance] if utterance is not None else []
+
+    def _emit(self):
+        start, end = self._speech_start, self._last_voiced_end
+        voiced = self._voiced_samples
+        self._speech_start = None
+        if voiced < self.min_speech:
+            return None
+        return self.ring.read(start - self.pre_padding, end + self.post_padding)
@@ -1,168 +1,311 @@
 import os
 import queue
-import sounddevice as sd
-import numpy as np
 import threading
-import tempfile
-import wave
+import time
+from functools import partial
 
-from faster_whisper import WhisperModel
-from pyannote.audio import Pipeline
+from .asr import ASRConfig, load_asr_model, transcribe
+from .metrics import metrics
+from .emotion.text_emotion import classify_text_emotion
+from .emotion.audio_emotion import classify_audio_emotion
+from .features.extract_features import extract_frame_features, segment_view
+from .response.responder import TieredResponder
+from .diarization.online_diarization import OnlineDiarizer
+from .segmenter import UtteranceSegmenter
+from logic_classify_system.risk_based_classifier import RiskScoreClassifier, ConsultationMetadata
 
-from emotion.text_emotion import classify_text_emotion
-from emotion.audio_emotion import classify_audio_emotion
-from features.extract_features import extract_features
-from response.generate_response import generate_response
-from risk_score import RiskScoreClassifier, ConsultationMetadata
+'''
+실시간 마이크 입력 파이프라인
+capture → segmentation(VAD) → ASR → analysis → output 단계를 스레드로 분리하고
+단계 사이를 크기가 제한된 큐로 연결합니다. 모든 단계는 블로킹 get()으로 대기하므로
+말하는 사람이 없을 때는 CPU를 거의 쓰지 않습니다.
+'''
 
 HF_TOKEN = os.getenv("HF_TOKEN")
+SAMPLE_RATE = 16000
+
+# 단계 종료 신호
+_STOP = object()
+
+# 큐 put 재시도 간격 / 단계 오류 후 종료 신호 전달을 기다리는 시간 / 종료 시 단계 스레드를 기다리는 최대 시간 (초)
+PUT_RETRY_SECONDS = 0.5
+STOP_GRACE_SECONDS = 2.0
+SHUTDOWN_TIMEOUT = float(os.getenv("LINGUA_LIVE_SHUTDOWN_TIMEOUT", "30"))
 
-# 오디오 큐
-audio_queue = queue.Queue()
 
-# 모델 초기화
-whisper_model = WhisperModel("medium", device="cuda", compute_type="float16")
-diarization_pipeline = Pipeline.from_pretrained("pyannote/speaker-diarization", use_auth_token=HF_TOKEN)
 classifier = RiskScoreClassifier()
 
 
-def audio_callback(indata, frames, time, status):
-    audio_queue.put(indata.copy())
+class LivePipeline:
+    """이벤트 기반 실시간 처리 엔진"""
 
+    def __init__(self, analyze, segmenter=None, queue_size=8, samplerate=SAMPLE_RATE, asr_config=None):
+        """
+        Args:
+            analyze: (audio_data, asr_segments) → 출력할 문자열 리스트를 반환하는 함수
+            segmenter: 발화 구간 검출기 (기본: VAD 기반 UtteranceSegmenter)
+            queue_size: 단계 사이 큐의 최대 길이 (가득 차면 상류 단계가 대기)
+            asr_config: ASR 설정 (기본: ASRConfig.from_env(), GPU가 없으면 CPU int8)
+        """
+        self.analyze = analyze
+        self.asr_config = asr_config or ASRConfig.from_env()
+        self.samplerate = samplerate
+        self.segmenter = segmenter or UtteranceSegmenter(samplerate)
+        # 오디오 콜백은 블로킹되면 안 되므로 capture 큐는 넉넉하게, 가득 차면 버림
+        self.capture_queue = queue.Queue(maxsize=queue_size * 64)
+        self.asr_queue = queue.Queue(maxsize=queue_size)
+        self.analysis_queue = queue.Queue(maxsize=queue_size)
+        self.output_queue = queue.Queue(maxsize=queue_size)
+        self.stop_event = threading.Event()
+        self.failed_event = threading.Event()  # 단계 스레드가 예외로 종료됨 → 남은 항목은 버림
+        self.dropped_blocks = 0
+        self._threads = []
 
-def save_temp_wav(audio_data, samplerate=16000):
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".wav")
-    with wave.open(temp_file.name, 'wb') as wf:
-        wf.setnchannels(1)
-        wf.setsampwidth(2)
-        wf.setframerate(samplerate)
-        wf.writeframes((audio_data * 32767).astype(np.int16).tobytes())
-    return temp_file.name
+    # --- capture ---
+    def _audio_callback(self, indata, frames, time, status):
+        try:
+            self.capture_queue.put_nowait(indata[:, 0].copy())
+        except queue.Full:
+            self.dropped_blocks += 1
+            metrics.inc("dropped_blocks_total")
 
+    def _put(self, target, item):
+        """
+        하류 큐에 넣기 (가득 차면 대기)
 
-def run_live_emotion_only():
-    """실시간 감정 분석만 수행"""
-    stream = sd.InputStream(callback=audio_callback, channels=1, samplerate=16000)
-    stream.start()
+        다른 단계가 죽어 하류가 더 이상 비워지지 않을 수 있으면 데이터는 바로 버리고,
+        종료 신호(_STOP)는 STOP_GRACE_SECONDS까지만 시도합니다.
+        """
+        give_up = time.monotonic() + STOP_GRACE_SECONDS
+        while item is _STOP or not self.failed_event.is_set():
+            try:
+                target.put(item, timeout=PUT_RETRY_SECONDS)
+                return True
+            except queue.Full:
+                if self.failed_event.is_set() and time.monotonic() >= give_up:
+                    return False
+        return False
+
+    def _fail(self, stage, error):
+        """단계 스레드가 복구 불가능한 예외로 종료 → 파이프라인 전체 종료"""
+        print(f"Warning: {stage} 단계 오류로 실시간 입력을 종료합니다: {error}")
+        self.failed_event.set()
+        self.stop_event.set()
 
-    def emotion_only_loop():
+    # --- segmentation ---
+    def _segmentation_stage(self):
+        # 완결된 발화 구간(앞뒤 패딩 포함)만 ASR로 전달, 무음은 버림
+        try:
+            while True:
+                block = self.capture_queue.get()
+                if block is _STOP:
+                    for utterance in self.segmenter.flush():
+                        self._put(self.asr_queue, utterance)
+                    break
+                for utterance in self.segmenter.push(block):
+                    metrics.inc("utterances_total")
+                    self._put(self.asr_queue, utterance)
+        except Exception as e:
+            self._fail("segmentation", e)
+        finally:
+            self._put(self.asr_queue, _STOP)
+
+    # --- ASR ---
+    def _asr_stage(self):
+        try:
+            load_asr_model(self.asr_config)  # 첫 발화 전에 모델 로드
+            while True:
+                audio_data = self.asr_queue.get()
+                if audio_data is _STOP:
+                    break
+                try:
+                    segments = transcribe(audio_data, self.asr_config)
+                except Exception as e:
+                    # 발화 하나의 디코딩 실패는 건너뛰고 계속
+                    self._put(self.output_queue, [f"Warning: 음성 인식 중 오류 발생: {e}"])
+                    continue
+                segments = [segment for segment in segments if segment.text.strip()]
+                if segments:
+                    self._put(self.analysis_queue, (audio_data, segments))
+        except Exception as e:
+            self._fail("ASR", e)
+        finally:
+            self._put(self.analysis_queue, _STOP)
+
+    # --- analysis ---
+    def _analysis_stage(self):
+        try:
+            while True:
+                item = self.analysis_queue.get()
+                if item is _STOP:
+                    break
+                audio_data, segments = item
+                try:
+                    with metrics.span("analysis"):
+                        lines = self.analyze(audio_data, segments)
+                except Exception as e:
+                    lines = [f"Warning: 분석 중 오류 발생: {e}"]
+                self._put(self.output_queue, lines)
+        finally:
+            self._put(self.output_queue, _STOP)
+
+    # --- output ---
+    def _output_stage(self):
         while True:
-            if not audio_queue.empty():
-                audio_chunk = audio_queue.get()
-                audio_data = np.squeeze(audio_chunk)
-                segments, _ = whisper_model.transcribe(audio_data, language="ko")
-                for segment in segments:
-                    text = segment.text
-                    temp_wav = save_temp_wav(audio_data)
-                    features = extract_features(temp_wav)
-                    text_emotion = classify_text_emotion(text)
-                    audio_emotion = classify_audio_emotion(features)
-                    final_emotion = text_emotion if text_emotion else audio_emotion
-                    print(f"발화: {text}")
-                    print(f"감정: {final_emotion}")
-                    print("-" * 50)
-
-    threading.Thread(target=emotion_only_loop, daemon=True).start()
-    print("🎙️ 실시간 감정 분석 시작 (Ctrl+C로 종료)")
-    try:
+            lines = self.output_queue.get()
+            if lines is _STOP:
+                break
+            for line in lines:
+                print(line)
+
+    def run(self, title):
+        """Ctrl+C 또는 stop() 호출까지 실행"""
+        stages = [self._segmentation_stage, self._asr_stage, self._analysis_stage, self._output_stage]
+        self._threads = [threading.Thread(target=stage, daemon=True) for stage in stages]
+        for thread in self._threads:
+            thread.start()
+
+        import sounddevice as sd  # 마이크가 필요한 시점에만 import
+
+        stream = sd.InputStream(callback=self._audio_callback, channels=1, samplerate=self.samplerate,
+                                dtype="float32")
+        stream.start()
+        print(title)
+        try:
+            # 짧은 타임아웃으로 대기해야 Windows에서도 Ctrl+C를 받을 수 있음
+            while not self.stop_event.wait(0.5):
+                pass
+        except KeyboardInterrupt:
+            print("🛑 실시간 입력 종료")
+        finally:
+            stream.stop()
+            stream.close()
+            self.shutdown(SHUTDOWN_TIMEOUT)
+
+    def stop(self):
+        self.stop_event.set()
+
+    def shutdown(self, timeout=None):
+        """
+        남은 구간을 모두 처리한 뒤 단계 스레드를 순서대로 종료
+
+        Args:
+            timeout: 전체 대기 시간 상한 (초, None이면 모두 끝날 때까지 대기)
+        """
+        self.stop_event.set()
+        deadline = None if timeout is None else time.monotonic() + timeout
         while True:
-            pass
-    except KeyboardInterrupt:
-        print("🛑 실시간 입력 종료")
-        stream.stop()
+            try:
+                self.capture_queue.put(_STOP, timeout=PUT_RETRY_SECONDS)
+                break
+            except queue.Full:
+                if self.failed_event.is_set() or (deadline is not None and time.monotonic() >= deadline):
+                    break
+        for thread in self._threads:
+            thread.join(None if deadline is None else max(deadline - time.monotonic(), 0))
+        if any(thread.is_alive() for thread in self._threads):
+            print(f"Warning: {timeout}초 안에 처리를 마치지 못해 남은 발화를 버립니다.")
+
+
+def _segment_emotion(audio_data, segment):
+    """ASR 구간의 텍스트/음향 감정 (음향 특징은 버퍼의 해당 구간 뷰에서 추출)"""
+    features = extract_frame_features(audio_data, start=segment.start, end=segment.end)
+    text_emotion = classify_text_emotion(segment.text)
+    audio_emotion = classify_audio_emotion(features[None])
+    return text_emotion if text_emotion else audio_emotion
+
+
+def _segment_speaker(diarizer, audio_data, segment):
+    """ASR 구간 오디오의 화자 임베딩을 통화 단위 화자 centroid에 배정"""
+    with metrics.span("speaker_assign"):
+        return diarizer.assign(segment_view(audio_data, SAMPLE_RATE, segment.start, segment.end))
+
+
+def _analyze_emotion_only(audio_data, segments):
+    lines = []
+    for segment in segments:
+        metrics.inc("segments_processed_total", pipeline="live_emotion_only")
+        text = segment.text
+        final_emotion = _segment_emotion(audio_data, segment)
+        lines += [f"발화: {text}", f"감정: {final_emotion}", "-" * 50]
+    return lines
+
+
+def _analyze_emotion_with_diarization(diarizer, audio_data, segments):
+    lines = []
+    for segment in segments:
+        metrics.inc("segments_processed_total", pipeline="live_emotion_diarization")
+        text = segment.text
+        speaker = _segment_speaker(diarizer, audio_data, segment)
+        final_emotion = _segment_emotion(audio_data, segment)
+        lines += [f"[{speaker}] 발화: {text}", f"감정: {final_emotion}", "-" * 50]
+    return lines
+
+
+def _analyze_full(diarizer, responder, audio_data, segments):
+    lines = []
+    for segment in segments:
+        metrics.inc("segments_processed_total", pipeline="live_full")
+        text = segment.text
+        speaker = _segment_speaker(diarizer, audio_data, segment)
+        lines.append(f"[{speaker}] {text}")
+
+        # 텍스트 규칙 평가 1회 → 욕설 필터링 / Risk Score에서 재사용
+        with metrics.span("risk_scoring"):
+            analysis = classifier.analyze(text)
+
+            # 욕설 필터링
+            profanity_result = classifier.profanity_filter.filter_profanity(text, analysis)
+        if profanity_result:
+            lines += [
+                "욕설 감지 → CRITICAL 처리",
+                f"Risk Score: {profanity_result.risk_score} {profanity_result.risk_level.name}",
+                f"권장 조치: {profanity_result.recommendation}",
+                "-" * 50
+            ]
+            continue
+
+        # 감정 분석
+        final_emotion = _segment_emotion(audio_data, segment)
+
+        # Risk Score 평가
+        metadata = ConsultationMetadata(
+            consultation_content="실시간 상담",
+            consultation_result="추가 상담 필요",
+            requirement_type="단일 요건",
+            consultation_reason="일반"
+        )
+        with metrics.span("risk_classify"):
+            risk_result = classifier.classify(text, metadata=metadata, analysis=analysis)
+
+        # 응답 생성
+        response = responder.respond(final_emotion, text)
+
+        # 출력
+        lines += [
+            f"감정: {final_emotion}",
+            f"Risk Score: {risk_result.risk_score} ({risk_result.risk_level.name})",
+            f"응답: {response}",
+            f"권장 조치: {risk_result.recommendation}",
+            "-" * 50
+        ]
+    return lines
+
+
+def run_live_emotion_only():
+    """실시간 감정 분석만 수행"""
+    LivePipeline(_analyze_emotion_only).run("🎙️ 실시간 감정 분석 시작 (Ctrl+C로 종료)")
 
 
 def run_live_emotion_with_diarization():
     """실시간 감정 분석 + 화자 분리"""
-    stream = sd.InputStream(callback=audio_callback, channels=1, samplerate=16000)
-    stream.start()
-
-    def emotion_diarization_loop():
-        while True:
-            if not audio_queue.empty():
-                audio_chunk = audio_queue.get()
-                audio_data = np.squeeze(audio_chunk)
-                segments, _ = whisper_model.transcribe(audio_data, language="ko")
-                diarization = diarization_pipeline(audio_data)
-                for segment in segments:
-                    text = segment.text
-                    for turn, _, speaker in diarization.itertracks(yield_label=True):
-                        temp_wav = save_temp_wav(audio_data)
-                        features = extract_features(temp_wav)
-                        text_emotion = classify_text_emotion(text)
-                        audio_emotion = classify_audio_emotion(features)
-                        final_emotion = text_emotion if text_emotion else audio_emotion
-                        print(f"[{speaker}] 발화: {text}")
-                        print(f"감정: {final_emotion}")
-                        print("-" * 50)
-
-    threading.Thread(target=emotion_diarization_loop, daemon=True).start()
-    print("🎙️ 실시간 감정 분석 + 화자 분리 시작 (Ctrl+C로 종료)")
-    try:
-        while True:
-            pass
-    except KeyboardInterrupt:
-        print("🛑 실시간 입력 종료")
-        stream.stop()
+    diarizer = OnlineDiarizer(hf_token=HF_TOKEN)  # 통화 동안 화자 라벨 유지
+    LivePipeline(partial(_analyze_emotion_with_diarization, diarizer)).run("🎙️ 실시간 감정 분석 + 화자 분리 시작 (Ctrl+C로 종료)")
 
 
 def run_live_pipeline():
     """실시간 전체 파이프라인"""
-    stream = sd.InputStream(callback=audio_callback, channels=1, samplerate=16000)
-    stream.start()
-
-    def full_loop():
-        while True:
-            if not audio_queue.empty():
-                audio_chunk = audio_queue.get()
-                audio_data = np.squeeze(audio_chunk)
-                segments, _ = whisper_model.transcribe(audio_data, language="ko")
-                diarization = diarization_pipeline(audio_data)
-                for segment in segments:
-                    text = segment.text
-                    for turn, _, speaker in diarization.itertracks(yield_label=True):
-                        print(f"[{speaker}] {text}")
-
-                        # 욕설 필터링
-                        profanity_result = classifier.profanity_filter.filter_profanity(text)
-                        if profanity_result:
-                            print("욕설 감지 → CRITICAL 처리")
-                            print("Risk Score:", profanity_result.risk_score, profanity_result.risk_level.name)
-                            print("권장 조치:", profanity_result.recommendation)
-                            print("-" * 50)
-                            continue
-
-                        # 감정 분석
-                        temp_wav = save_temp_wav(audio_data)
-                        features = extract_features(temp_wav)
-                        text_emotion = classify_text_emotion(text)
-                        audio_emotion = classify_audio_emotion(features)
-                        final_emotion = text_emotion if text_emotion else audio_emotion
-
-                        # Risk Score 평가
-                        metadata = ConsultationMetadata(
-                            consultation_content="실시간 상담",
-                            consultation_result="추가 상담 필요",
-                            requirement_type="단일 요건",
-                            consultation_reason="일반"
-                        )
-                        risk_result = classifier.classify(text, metadata=metadata)
-
-                        # 응답 생성
-                        response = generate_response(final_emotion, text)
-
-                        # 출력
-                        print(f"감정: {final_emotion}")
-                        print(f"Risk Score: {risk_result.risk_score} ({risk_result.risk_level.name})")
-                        print("응답:", response)
-                        print("권장 조치:", risk_result.recommendation)
-                        print("-" * 50)
-
-    threading.Thread(target=full_loop, daemon=True).start()
-    print("🎙️ 실시간 전체 파이프라인 시작 (Ctrl+C로 종료)")
-    try:
-        while True:
-            pass
-    except KeyboardInterrupt:
-        print("🛑 실시간 입력 종료")
-        stream.stop()
+    diarizer = OnlineDiarizer(hf_token=HF_TOKEN)  # 통화 동안 화자 라벨 유지
+    responder = TieredResponder()  # 템플릿 → 캐시 → KoGPT2 생성
+    LivePipeline(partial(_analyze_full, diarizer, responder)).run("🎙️ 실시간 전체 파이프라인 시작 (Ctrl+C로 종료)")
+    print(responder.format_stats())
@@ -1,21 +1,192 @@
-from pydub import AudioSegment
+'''
+오디오 디코딩 (m4a / mp3 / wav → 16kHz mono float32)
+
+ffmpeg 파이프로 원본을 목표 샘플레이트의 f32le PCM으로 한 번에 디코딩/리샘플링해
+임시 WAV 파일 없이 메모리로 받습니다. ffmpeg가 없으면 librosa로 디코딩합니다.
+디코딩 결과는 파일 내용 해시(sha256) 키로 프로세스 내 캐시와 디스크 캐시(.npy)에 저장되어
+같은 녹음은 단계나 실행이 달라도 다시 디코딩하지 않습니다.
+디스크 캐시 위치: LINGUA_AUDIO_CACHE (기본: ~/.cache/lingua/audio, 빈 값이면 사용 안 함)
+디스크 캐시 크기: LINGUA_AUDIO_CACHE_MAX_MB (기본 2048MB, 넘으면 가장 오래 쓰지 않은 파일부터 삭제)
+'''
+
+import hashlib
 import os
+import shutil
+import subprocess
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from ..metrics import metrics
+
+DEFAULT_SAMPLE_RATE = 16000
+DECODE_CACHE_DIR = os.getenv("LINGUA_AUDIO_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "lingua", "audio"))
+DECODE_CACHE_MAX_BYTES = int(float(os.getenv("LINGUA_AUDIO_CACHE_MAX_MB", "2048")) * 2**20)
+MEMORY_CACHE_SIZE = 4  # 프로세스 내에 유지할 최근 디코딩 결과 수
+
+_memory_cache = OrderedDict()  # (digest, sr) → float32 배열 (호출자 간 공유)
+_memory_lock = threading.Lock()
+
+
+def file_digest(file_path: str, chunk_size: int = 1 << 20) -> str:
+    """파일 내용 sha256 (청크 단위로 읽어 메모리 사용 일정)"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _decode_ffmpeg(file_path: str, sr: int) -> np.ndarray:
+    command = [
+        "ffmpeg", "-nostdin", "-v", "error", "-i", file_path,
+        "-f", "f32le", "-acodec", "pcm_f32le", "-ac", "1", "-ar", str(sr), "-"
+    ]
+    result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg 디코딩 실패 ({file_path}): {result.stderr.decode(errors='replace').strip()}")
+    return np.frombuffer(result.stdout, dtype=np.float32)
+
+
+def _decode_librosa(file_path: str, sr: int) -> np.ndarray:
+    import librosa  # ffmpeg가 없을 때만 import
+
+    y, _ = librosa.load(file_path, sr=sr, mono=True)
+    return y
+
+
+def decode_audio(file_path: str, sr: int = DEFAULT_SAMPLE_RATE) -> np.ndarray:
+    """
+    캐시 없이 오디오 파일을 mono float32로 디코딩 (리샘플링 1회)
+
+    Args:
+        file_path: m4a / mp3 / wav 등 ffmpeg가 읽을 수 있는 파일 경로
+        sr: 목표 샘플레이트
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(file_path)
+    y = _decode_ffmpeg(file_path, sr) if shutil.which("ffmpeg") else _decode_librosa(file_path, sr)
+    return np.ascontiguousarray(y, dtype=np.float32)
+
+
+def _remember(key, y):
+    # 호출자 간 공유되는 배열 → 디코딩 경로(frombuffer / np.load / librosa)와 관계없이 읽기 전용
+    y.setflags(write=False)
+    with _memory_lock:
+        _memory_cache[key] = y
+        _memory_cache.move_to_end(key)
+        while len(_memory_cache) > MEMORY_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
+    return y
+
+
+@metrics.timed("decode")
+def load_audio(file_path: str, sr: int = DEFAULT_SAMPLE_RATE, cache_dir=DECODE_CACHE_DIR) -> np.ndarray:
+    """
+    오디오 파일을 mono float32 버퍼로 반환 (내용 해시 기준 디코딩 캐시)
+
+    Args:
+        file_path: 오디오 파일 경로 (m4a / mp3 / wav)
+        sr: 목표 샘플레이트
+        cache_dir: 디스크 캐시 디렉터리 (None 또는 빈 문자열이면 디스크 캐시 사용 안 함)
+
+    Returns:
+        (samples,) 형태의 읽기 전용 float32 numpy 배열 (캐시와 공유, 수정하려면 복사)
+    """
+    digest = file_digest(file_path)
+    key = (digest, sr)
+    with _memory_lock:
+        y = _memory_cache.get(key)
+    if y is not None:
+        metrics.inc("decode_cache_total", result="memory")
+        return y
+
+    cache_path = os.path.join(cache_dir, f"{digest}_{sr}.npy") if cache_dir else None
+    if cache_path and os.path.exists(cache_path):
+        try:
+            y = np.load(cache_path)
+            touch_cache_file(cache_path)
+            metrics.inc("decode_cache_total", result="disk")
+            return _remember(key, y)
+        except (OSError, ValueError):
+            pass  # 손상된 캐시 파일은 다시 디코딩해 덮어씀
+
+    metrics.inc("decode_cache_total", result="miss")
+    y = decode_audio(file_path, sr)
+    if cache_path:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, y)
+            os.replace(tmp_path, cache_path)  # 동시에 여러 프로세스가 써도 완성된 파일만 보임
+            prune_decode_cache(cache_dir, keep=cache_path)
+        except OSError as e:
+            print(f"Warning: 디코딩 캐시를 저장할 수 없습니다: {e}")
+    return _remember(key, y)
+
+
+def touch_cache_file(path):
+    """최근 사용 시각 갱신 (LRU 정리 기준, 읽기 전용 공유 캐시면 무시)"""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def prune_decode_cache(cache_dir=DECODE_CACHE_DIR, max_bytes=None, keep=None):
+    """디스크 캐시가 max_bytes(기본 DECODE_CACHE_MAX_BYTES)를 넘으면 최근 사용 시각(mtime)이 오래된 .npy부터 삭제 (keep은 남김)"""
+    max_bytes = DECODE_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith(".npy"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:  # 다른 프로세스가 먼저 삭제
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+        except OSError:  # 이미 삭제됨 / 다른 프로세스가 사용 중 (Windows)
+            continue
+        total -= size
+
+
+def clear_decode_cache(cache_dir=DECODE_CACHE_DIR, disk=False):
+    """프로세스 내 캐시 비우기 (disk=True이면 디스크 캐시 파일도 삭제)"""
+    with _memory_lock:
+        _memory_cache.clear()
+    if disk and cache_dir and os.path.isdir(cache_dir):
+        for name in os.listdir(cache_dir):
+            if name.endswith(".npy"):
+                os.remove(os.path.join(cache_dir, name))
+
 
-def convert_to_wav(file_path: str) -> str:
+def as_float32_mono(audio) -> np.ndarray:
     """
-    m4a 또는 mp3 파일을 wav로 변환합니다.
+    메모리상의 오디오 버퍼를 복사 없이(가능한 경우) mono float32 배열로 변환합니다.
 
     Args:
-        file_path: 원본 오디오 파일 경로 (.m4a 또는 .mp3)
+        audio: numpy 배열, memoryview, 또는 float32 PCM bytes
+            바이트 단위(format 'B' 등) memoryview는 bytes처럼 float32 PCM으로 해석하고,
+            정수형(int16/int32) PCM은 [-1, 1] 범위로 정규화하고,
+            (samples, channels) 형태는 채널 평균으로 mono 변환합니다.
 
     Returns:
-        변환된 wav 파일 경로
+        (samples,) 형태의 float32 numpy 배열
     """
-    ext = os.path.splitext(file_path)[1].lower()
-    if ext not in [".m4a", ".mp3"]:
-        raise ValueError("지원되지 않는 오디오 형식입니다. m4a 또는 mp3만 가능합니다.")
-
-    wav_path = file_path.replace(ext, ".wav")
-    audio = AudioSegment.from_file(file_path, format=ext[1:])  # 'm4a' 또는 'mp3'
-    audio.export(wav_path, format="wav")
-    return wav_path
\ No newline at end of file
+    if isinstance(audio, (bytes, bytearray)) or (isinstance(audio, memoryview) and audio.itemsize == 1):
+        y = np.frombuffer(audio, dtype=np.float32)
+    else:
+        y = np.asarray(audio)
+    if np.issubdtype(y.dtype, np.integer):
+        y = y.astype(np.float32) / np.iinfo(y.dtype).max
+    if y.ndim > 1:
+        y = y.mean(axis=1) if y.shape[1] < y.shape[0] else y.mean(axis=0)
+    return y.astype(np.float32, copy=False)
@@ -5,9 +5,16 @@
 """
 
 from enum import Enum
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Union
 from dataclasses import dataclass
 
+try:
+    from .keyword_automaton import KeywordAutomaton, KeywordMatch
+    from .session_context import SessionContext
+except ImportError:
+    from keyword_automaton import KeywordAutomaton, KeywordMatch
+    from session_context import SessionContext
+
 
 class ComplaintSeverity(Enum):
     """민원 심각도 레벨"""
@@ -101,126 +108,167 @@ class ClassificationCriteria:
         "장난", "놀리는", "테스트", "연습", "이유리 상담원 찾아요"
     ]
     
+    # 오토마톤으로 컴파일되는 키워드 리스트 (클래스 속성 이름)
+    KEYWORD_GROUPS = [
+        "PROFANITY_KEYWORDS", "INSULT_KEYWORDS", "THREAT_KEYWORDS",
+        "SEXUAL_HARASSMENT_KEYWORDS", "REPETITION_INDICATORS",
+        "UNREASONABLE_DEMAND_INDICATORS", "IRRELEVANCE_INDICATORS",
+        "FALSE_COMPLAINT_INDICATORS", "PRANK_CALL_INDICATORS"
+    ]
+    
+    _automaton: Optional[KeywordAutomaton] = None
+    
+    @classmethod
+    def compile_keywords(cls) -> KeywordAutomaton:
+        """
+        키워드 리스트 전체를 하나의 오토마톤으로 컴파일
+        
+        import 시 자동으로 호출되며, 키워드 리스트를 수정한 뒤에는 다시 호출해야 합니다.
+        """
+        cls._automaton = KeywordAutomaton({name: getattr(cls, name) for name in cls.KEYWORD_GROUPS})
+        return cls._automaton
+    
     @staticmethod
-    def classify_text(text: str, session_context: Optional[List[str]] = None) -> List[ClassificationResult]:
+    def scan_keywords(text: str) -> Dict[str, List[KeywordMatch]]:
+        """
+        텍스트를 한 번 스캔해 키워드 그룹별 매칭(오프셋 포함) 반환
+        
+        Returns:
+            {키워드 리스트 이름: [KeywordMatch, ...]}
+        """
+        return ClassificationCriteria._automaton.scan(text)
+    
+    @staticmethod
+    def classify_text(
+        text: str,
+        session_context: Optional[Union[List[str], SessionContext]] = None
+    ) -> List[ClassificationResult]:
         """
         텍스트를 분석하여 악성 민원 분류 결과 반환
         
         Args:
             text: 분석할 텍스트
             session_context: 세션 내 이전 대화 맥락 (반복성 감지용)
+                SessionContext를 넘기면 이전 발화를 다시 토큰화하지 않습니다.
         
         Returns:
             ClassificationResult 리스트 (여러 카테고리 동시 감지 가능)
         """
         results = []
         text_lower = text.lower()
+        hits = ClassificationCriteria.scan_keywords(text)  # 전체 키워드 1회 스캔
         
         # 1. 욕설/저주 감지
-        profanity_count = sum(1 for kw in ClassificationCriteria.PROFANITY_KEYWORDS if kw in text)
+        profanity_evidence = KeywordAutomaton.distinct_keywords(hits["PROFANITY_KEYWORDS"])
+        profanity_count = len(profanity_evidence)
         if profanity_count > 0:
             results.append(ClassificationResult(
                 category=ComplaintCategory.PROFANITY,
                 severity=ComplaintSeverity.HIGH if profanity_count >= 3 else ComplaintSeverity.MEDIUM,
                 confidence=min(0.5 + profanity_count * 0.15, 1.0),
-                evidence=[kw for kw in ClassificationCriteria.PROFANITY_KEYWORDS if kw in text],
+                evidence=profanity_evidence,
                 description=f"욕설/저주 표현 {profanity_count}건 감지"
             ))
         
         # 2. 모욕/조롱 감지
-        insult_count = sum(1 for kw in ClassificationCriteria.INSULT_KEYWORDS if kw in text)
+        insult_evidence = KeywordAutomaton.distinct_keywords(hits["INSULT_KEYWORDS"])
+        insult_count = len(insult_evidence)
         if insult_count > 0:
             results.append(ClassificationResult(
                 category=ComplaintCategory.INSULT,
                 severity=ComplaintSeverity.MEDIUM if insult_count >= 2 else ComplaintSeverity.LOW,
                 confidence=min(0.4 + insult_count * 0.2, 1.0),
-                evidence=[kw for kw in ClassificationCriteria.INSULT_KEYWORDS if kw in text],
+                evidence=insult_evidence,
                 description=f"모욕/조롱 표현 {insult_count}건 감지"
             ))
         
         # 3. 폭력/위협 감지
-        threat_count = sum(1 for kw in ClassificationCriteria.THREAT_KEYWORDS if kw in text)
+        threat_evidence = KeywordAutomaton.distinct_keywords(hits["THREAT_KEYWORDS"])
+        threat_count = len(threat_evidence)
         if threat_count > 0:
             results.append(ClassificationResult(
                 category=ComplaintCategory.VIOLENCE_THREAT,
                 severity=ComplaintSeverity.CRITICAL,
                 confidence=min(0.7 + threat_count * 0.15, 1.0),
-                evidence=[kw for kw in ClassificationCriteria.THREAT_KEYWORDS if kw in text],
+                evidence=threat_evidence,
                 description=f"폭력/위협 표현 {threat_count}건 감지 - 즉시 조치 필요"
             ))
         
         # 4. 성희롱 감지
-        sexual_count = sum(1 for kw in ClassificationCriteria.SEXUAL_HARASSMENT_KEYWORDS if kw in text)
+        sexual_evidence = KeywordAutomaton.distinct_keywords(hits["SEXUAL_HARASSMENT_KEYWORDS"])
+        sexual_count = len(sexual_evidence)
         if sexual_count > 0:
             results.append(ClassificationResult(
                 category=ComplaintCategory.SEXUAL_HARASSMENT,
                 severity=ComplaintSeverity.CRITICAL,
                 confidence=min(0.6 + sexual_count * 0.2, 1.0),
-                evidence=[kw for kw in ClassificationCriteria.SEXUAL_HARASSMENT_KEYWORDS if kw in text],
+                evidence=sexual_evidence,
                 description=f"성희롱 표현 {sexual_count}건 감지 - 법적 조치 고려"
             ))
         
         # 5. 반복성 감지 (세션 맥락 필요)
         if session_context:
-            repetition_count = sum(1 for indicator in ClassificationCriteria.REPETITION_INDICATORS 
-                                  if indicator in text)
-            # 이전 대화와의 유사도도 체크 (간단한 키워드 기반)
-            similar_topics = sum(1 for prev_text in session_context[-3:] 
-                               if any(word in prev_text and word in text 
-                                     for word in text.split() if len(word) > 3))
+            repetition_evidence = KeywordAutomaton.distinct_keywords(hits["REPETITION_INDICATORS"])
+            repetition_count = len(repetition_evidence)
+            # 이전 대화와의 유사도도 체크 (최근 3개 발화와 공유하는 단어 기반)
+            if not isinstance(session_context, SessionContext):
+                session_context = SessionContext.from_texts(session_context[-3:])
+            similar_topics = session_context.similar_count(text)
             
             if repetition_count > 0 or similar_topics >= 2:
                 results.append(ClassificationResult(
                     category=ComplaintCategory.REPETITION,
                     severity=ComplaintSeverity.MEDIUM if similar_topics >= 3 else ComplaintSeverity.LOW,
                     confidence=min(0.5 + (repetition_count + similar_topics) * 0.15, 1.0),
-                    evidence=[indicator for indicator in ClassificationCriteria.REPETITION_INDICATORS 
-                             if indicator in text],
+                    evidence=repetition_evidence,
                     description=f"반복성 감지: 반복 표현 {repetition_count}건, 유사 주제 {similar_topics}건"
                 ))
         
         # 6. 무리한 요구 감지
-        unreasonable_count = sum(1 for kw in ClassificationCriteria.UNREASONABLE_DEMAND_INDICATORS 
-                                if kw in text)
+        unreasonable_evidence = KeywordAutomaton.distinct_keywords(hits["UNREASONABLE_DEMAND_INDICATORS"])
+        unreasonable_count = len(unreasonable_evidence)
         if unreasonable_count >= 2:
             results.append(ClassificationResult(
                 category=ComplaintCategory.UNREASONABLE_DEMAND,
                 severity=ComplaintSeverity.MEDIUM,
                 confidence=min(0.4 + unreasonable_count * 0.2, 1.0),
-                evidence=[kw for kw in ClassificationCriteria.UNREASONABLE_DEMAND_INDICATORS if kw in text],
+                evidence=unreasonable_evidence,
                 description=f"무리한 요구 표현 {unreasonable_count}건 감지"
             ))
         
         # 7. 부당성/무관성 감지
-        irrelevance_count = sum(1 for kw in ClassificationCriteria.IRRELEVANCE_INDICATORS if kw in text)
+        irrelevance_evidence = KeywordAutomaton.distinct_keywords(hits["IRRELEVANCE_INDICATORS"])
+        irrelevance_count = len(irrelevance_evidence)
         if irrelevance_count > 0:
             results.append(ClassificationResult(
                 category=ComplaintCategory.IRRELEVANCE,
                 severity=ComplaintSeverity.LOW,
                 confidence=min(0.3 + irrelevance_count * 0.25, 1.0),
-                evidence=[kw for kw in ClassificationCriteria.IRRELEVANCE_INDICATORS if kw in text],
+                evidence=irrelevance_evidence,
                 description=f"상담 맥락 이탈 표현 {irrelevance_count}건 감지"
             ))
         
         # 8. 허위 민원 감지
-        false_count = sum(1 for kw in ClassificationCriteria.FALSE_COMPLAINT_INDICATORS if kw in text)
+        false_evidence = KeywordAutomaton.distinct_keywords(hits["FALSE_COMPLAINT_INDICATORS"])
+        false_count = len(false_evidence)
         if false_count > 0:
             results.append(ClassificationResult(
                 category=ComplaintCategory.FALSE_COMPLAINT,
                 severity=ComplaintSeverity.HIGH,
                 confidence=min(0.5 + false_count * 0.25, 1.0),
-                evidence=[kw for kw in ClassificationCriteria.FALSE_COMPLAINT_INDICATORS if kw in text],
+                evidence=false_evidence,
                 description=f"허위 민원 의심 표현 {false_count}건 감지"
             ))
         
         # 9. 장난전화 감지
-        prank_count = sum(1 for kw in ClassificationCriteria.PRANK_CALL_INDICATORS if kw in text)
+        prank_evidence = KeywordAutomaton.distinct_keywords(hits["PRANK_CALL_INDICATORS"])
+        prank_count = len(prank_evidence)
         if prank_count > 0:
             results.append(ClassificationResult(
                 category=ComplaintCategory.PRANK_CALL,
                 severity=ComplaintSeverity.MEDIUM,
                 confidence=min(0.5 + prank_count * 0.2, 1.0),
-                evidence=[kw for kw in ClassificationCriteria.PRANK_CALL_INDICATORS if kw in text],
+                evidence=prank_evidence,
                 description=f"장난전화 의심 표현 {prank_count}건 감지"
             ))
         
@@ -249,6 +297,9 @@ class ClassificationCriteria:
         return actions.get(severity, "확인 필요")
 
 
+ClassificationCriteria.compile_keywords()
+
+
 # 혐오 표현 세부 카테고리 (이미지 기준)
 HATE_SPEECH_SUBCATEGORIES = {
     "성_혐오": ["여자는", "남자는", "성차별", "성 고정관념"],
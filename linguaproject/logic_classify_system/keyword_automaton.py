@@ -0,0 +1,118 @@
+"""
+다중 키워드 매칭용 Aho-Corasick 오토마톤
+
+여러 키워드 그룹을 하나의 오토마톤으로 컴파일해 텍스트를 한 번만 훑으면서
+모든 그룹의 키워드 출현 위치를 찾습니다.
+스캔 비용은 키워드 개수가 아니라 텍스트 길이(+ 매칭 수)에 비례합니다.
+"""
+
+from collections import deque
+from typing import Dict, Iterator, List, NamedTuple, Sequence, Tuple
+
+
+class KeywordMatch(NamedTuple):
+    """키워드 매칭 결과"""
+    keyword: str  # 매칭된 키워드
+    start: int    # 텍스트 내 시작 오프셋
+    end: int      # 텍스트 내 끝 오프셋 (exclusive)
+
+
+class KeywordAutomaton:
+    """키워드 그룹 → Aho-Corasick 오토마톤"""
+
+    def __init__(self, keyword_groups: Dict[str, Sequence[str]]):
+        """
+        Args:
+            keyword_groups: {그룹 이름: 키워드 리스트}
+                같은 키워드가 여러 그룹에 있어도 됩니다.
+        """
+        self.groups = list(keyword_groups)
+        self._keywords: List[str] = []
+        # 키워드 id → [(그룹 이름, 그룹 내 순서), ...]
+        self._owners: List[List[Tuple[str, int]]] = []
+
+        keyword_ids: Dict[str, int] = {}
+        for group, keywords in keyword_groups.items():
+            for position, keyword in enumerate(keywords):
+                if not keyword:
+                    continue
+                if keyword not in keyword_ids:
+                    keyword_ids[keyword] = len(self._keywords)
+                    self._keywords.append(keyword)
+                    self._owners.append([])
+                self._owners[keyword_ids[keyword]].append((group, position))
+
+        self._build()
+
+    def _build(self) -> None:
+        # 1. trie 구성
+        self._goto: List[Dict[str, int]] = [{}]
+        self._output: List[List[int]] = [[]]
+        for keyword_id, keyword in enumerate(self._keywords):
+            state = 0
+            for ch in keyword:
+                next_state = self._goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][ch] = next_state
+                    self._goto.append({})
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(keyword_id)
+
+        # 2. BFS로 failure link 계산 + suffix 출력 병합
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(ch, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def _iter_hits(self, text: str) -> Iterator[Tuple[int, int]]:
+        """(키워드 끝 오프셋, 키워드 id) 스트림"""
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for index, ch in enumerate(text):
+            next_state = goto[state].get(ch)
+            while next_state is None and state:
+                state = fail[state]
+                next_state = goto[state].get(ch)
+            state = next_state or 0
+            if output[state]:
+                for keyword_id in output[state]:
+                    yield index + 1, keyword_id
+
+    def iter_matches(self, text: str) -> Iterator[KeywordMatch]:
+        """텍스트의 모든 키워드 출현을 (겹치는 것 포함) 순서대로 반환"""
+        for end, keyword_id in self._iter_hits(text):
+            keyword = self._keywords[keyword_id]
+            yield KeywordMatch(keyword, end - len(keyword), end)
+
+    def scan(self, text: str) -> Dict[str, List[KeywordMatch]]:
+        """
+        텍스트를 한 번 스캔해 그룹별 매칭 결과를 반환
+
+        Returns:
+            {그룹 이름: [KeywordMatch, ...]} - 그룹 내 키워드 순서, 출현 위치 순으로 정렬
+            (매칭이 없는 그룹도 빈 리스트로 포함)
+        """
+        hits: Dict[str, List[Tuple[int, KeywordMatch]]] = {group: [] for group in self.groups}
+        for end, keyword_id in self._iter_hits(text):
+            keyword = self._keywords[keyword_id]
+            match = KeywordMatch(keyword, end - len(keyword), end)
+            for group, position in self._owners[keyword_id]:
+                hits[group].append((position, match))
+        return {
+            group: [match for _, match in sorted(entries, key=lambda e: (e[0], e[1].start))]
+            for group, entries in hits.items()
+        }
+
+    @staticmethod
+    def distinct_keywords(matches: List[KeywordMatch]) -> List[str]:
+        """매칭 리스트에서 중복 없는 키워드 목록 (순서 유지)"""
+        return list(dict.fromkeys(match.keyword for match in matches))
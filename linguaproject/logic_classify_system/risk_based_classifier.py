@@ -6,16 +6,30 @@ Risk Score 기반 분류 시스템
 2. Risk Score 기반 분류 → 간접적 악성 민원 위험도 평가
 """
 
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
-from typing import List, Dict, Optional, Tuple
+from itertools import islice
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple, Union
 from dataclasses import dataclass
 
-from classification_criteria import (
-    ClassificationCriteria,
-    ClassificationResult,
-    ComplaintCategory,
-    ComplaintSeverity
-)
+try:
+    from .classification_criteria import (
+        ClassificationCriteria,
+        ClassificationResult,
+        ComplaintCategory,
+        ComplaintSeverity
+    )
+    from .session_context import SessionContext
+except ImportError:
+    from classification_criteria import (
+        ClassificationCriteria,
+        ClassificationResult,
+        ComplaintCategory,
+        ComplaintSeverity
+    )
+    from session_context import SessionContext
 
 
 class RiskLevel(Enum):
@@ -51,6 +65,26 @@ class RiskScoreResult:
     recommendation: str                # 권장 조치
 
 
+@dataclass
+class ClassificationRecord:
+    """스트리밍 배치 분류 입력 레코드"""
+    text: str                                          # 분석할 텍스트
+    session_context: Optional[List[str]] = None        # 세션 내 이전 발화
+    metadata: Optional[ConsultationMetadata] = None    # 상담 메타데이터
+
+
+@dataclass
+class TextAnalysis:
+    """
+    텍스트 1회 규칙 평가 결과
+
+    RiskScoreClassifier.analyze()로 한 번 만든 뒤 욕설 필터, Baseline 점수,
+    근거/권장 조치 계산에 그대로 넘겨 같은 텍스트를 다시 스캔하지 않도록 합니다.
+    """
+    text: str                                  # 분석한 텍스트
+    results: List[ClassificationResult]        # ClassificationCriteria.classify_text 결과
+
+
 class ProfanityFilter:
     """욕설 필터링 전용 모델"""
     
@@ -75,10 +109,14 @@ class ProfanityFilter:
                 self.use_korcen = False
                 self.use_baseline = True
     
-    def detect_profanity(self, text: str) -> Tuple[bool, Optional[str], float]:
+    def detect_profanity(self, text: str, analysis: Optional[TextAnalysis] = None) -> Tuple[bool, Optional[str], float]:
         """
         욕설 감지
         
+        Args:
+            text: 분석할 텍스트
+            analysis: 같은 텍스트의 TextAnalysis (있으면 Baseline 규칙을 다시 평가하지 않음)
+        
         Returns:
             (is_profanity, category, confidence)
         """
@@ -119,7 +157,7 @@ class ProfanityFilter:
         
         if self.use_baseline:
             # Baseline 규칙으로 욕설 감지
-            results = ClassificationCriteria.classify_text(text)
+            results = analysis.results if analysis is not None else ClassificationCriteria.classify_text(text)
             
             profanity_categories = [
                 ComplaintCategory.PROFANITY,
@@ -137,14 +175,14 @@ class ProfanityFilter:
         # 기본값: 욕설 없음
         return False, None, 0.0
     
-    def filter_profanity(self, text: str) -> Optional[RiskScoreResult]:
+    def filter_profanity(self, text: str, analysis: Optional[TextAnalysis] = None) -> Optional[RiskScoreResult]:
         """
         욕설 필터링 - 직접적 악성 민원 분리
         
         Returns:
             RiskScoreResult (욕설 감지된 경우) 또는 None
         """
-        is_profanity, category, confidence = self.detect_profanity(text)
+        is_profanity, category, confidence = self.detect_profanity(text, analysis)
         
         if is_profanity:
             # 욕설 감지 → 즉시 CRITICAL 처리
@@ -168,14 +206,34 @@ class RiskScoreClassifier:
     def __init__(self):
         self.profanity_filter = ProfanityFilter()
     
-    def calculate_baseline_risk(self, text: str, session_context: Optional[List[str]] = None) -> Tuple[int, List[str]]:
+    def analyze(
+        self,
+        text: str,
+        session_context: Optional[Union[List[str], SessionContext]] = None
+    ) -> TextAnalysis:
+        """
+        텍스트 규칙 평가 (1회)
+        
+        반환값을 filter_profanity / calculate_baseline_risk / classify의 analysis 인자로
+        넘기면 같은 텍스트를 다시 분석하지 않습니다.
+        """
+        return TextAnalysis(text=text, results=ClassificationCriteria.classify_text(text, session_context))
+    
+    def calculate_baseline_risk(
+        self,
+        text: str,
+        session_context: Optional[Union[List[str], SessionContext]] = None,
+        analysis: Optional[TextAnalysis] = None
+    ) -> Tuple[int, List[str]]:
         """
         Baseline 규칙 기반 위험도 점수 계산
         
         Returns:
             (risk_score, issues)
         """
-        results = ClassificationCriteria.classify_text(text, session_context)
+        if analysis is None:
+            analysis = self.analyze(text, session_context)
+        results = analysis.results
         
         risk_score = 0
         issues = []
@@ -248,22 +306,29 @@ class RiskScoreClassifier:
     def classify(
         self,
         text: str,
-        session_context: Optional[List[str]] = None,
-        metadata: Optional[ConsultationMetadata] = None
+        session_context: Optional[Union[List[str], SessionContext]] = None,
+        metadata: Optional[ConsultationMetadata] = None,
+        analysis: Optional[TextAnalysis] = None
     ) -> RiskScoreResult:
         """
         Risk Score 기반 분류
         
+        Args:
+            analysis: analyze()로 미리 만든 결과 (없으면 여기서 한 번 분석)
+        
         Returns:
             RiskScoreResult
         """
+        if analysis is None:
+            analysis = self.analyze(text, session_context)
+        
         # 1단계: 욕설 필터링 (직접적 악성 민원)
-        profanity_result = self.profanity_filter.filter_profanity(text)
+        profanity_result = self.profanity_filter.filter_profanity(text, analysis)
         if profanity_result:
             return profanity_result
         
         # 2단계: Risk Score 계산 (간접적 악성 민원)
-        baseline_score, baseline_issues = self.calculate_baseline_risk(text, session_context)
+        baseline_score, baseline_issues = self.calculate_baseline_risk(text, session_context, analysis)
         metadata_score, metadata_issues = self.calculate_metadata_risk(metadata)
         
         # 통합 Risk Score (가중 평균)
@@ -313,19 +378,82 @@ class RiskScoreClassifier:
         self,
         texts: List[str],
         session_contexts: Optional[List[List[str]]] = None,
-        metadata_list: Optional[List[ConsultationMetadata]] = None
+        metadata_list: Optional[List[ConsultationMetadata]] = None,
+        workers: int = 1
     ) -> List[RiskScoreResult]:
-        """배치 분류"""
-        results = []
+        """배치 분류 (workers > 1이면 프로세스 풀 사용)"""
+        records = (
+            ClassificationRecord(
+                text=text,
+                session_context=session_contexts[i] if session_contexts else None,
+                metadata=metadata_list[i] if metadata_list else None
+            )
+            for i, text in enumerate(texts)
+        )
+        return list(self.classify_stream(records, workers=workers))
+    
+    def classify_stream(
+        self,
+        records: Iterable[Union[str, ClassificationRecord]],
+        workers: Optional[int] = None,
+        chunk_size: int = 256,
+        max_pending_chunks: Optional[int] = None
+    ) -> Iterator[RiskScoreResult]:
+        """
+        스트리밍 배치 분류
         
-        for i, text in enumerate(texts):
-            context = session_contexts[i] if session_contexts else None
-            metadata = metadata_list[i] if metadata_list else None
-            
-            result = self.classify(text, context, metadata)
-            results.append(result)
+        입력 이터레이터를 chunk_size 단위로 잘라 프로세스 풀에 분배하고, 입력 순서대로
+        결과를 yield합니다. 동시에 처리 중인 청크 수를 제한하므로 입력 크기와 무관하게
+        메모리 사용량이 일정합니다.
+        
+        Args:
+            records: 텍스트 또는 ClassificationRecord 이터러블 (제너레이터 가능)
+            workers: 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스에서 순차 처리)
+            chunk_size: 워커 한 번 호출에 보낼 레코드 수
+            max_pending_chunks: 동시에 제출해 둘 최대 청크 수 (기본: workers x 2)
         
-        return results
+        Yields:
+            입력 순서대로 RiskScoreResult
+        """
+        records = (r if isinstance(r, ClassificationRecord) else ClassificationRecord(text=r) for r in records)
+        workers = workers or os.cpu_count() or 1
+        
+        if workers <= 1:
+            for record in records:
+                yield self.classify(record.text, record.session_context, record.metadata)
+            return
+        
+        max_pending_chunks = max_pending_chunks or workers * 2
+        chunks = iter(lambda: list(islice(records, chunk_size)), [])
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            pending = deque()
+            try:
+                for chunk in islice(chunks, max_pending_chunks):
+                    pending.append(executor.submit(_classify_chunk, chunk))
+                while pending:
+                    # 맨 앞 청크가 끝나는 대로 결과를 내보내고 빈 자리에 다음 청크 제출
+                    results = pending.popleft().result()
+                    next_chunk = next(chunks, None)
+                    if next_chunk is not None:
+                        pending.append(executor.submit(_classify_chunk, next_chunk))
+                    yield from results
+            finally:
+                # 소비자가 중간에 멈춘 경우 아직 시작하지 않은 청크는 취소
+                for future in pending:
+                    future.cancel()
+
+
+# 프로세스 풀 워커별 분류기 (워커 시작 시 한 번 생성)
+_worker_classifier: Optional[RiskScoreClassifier] = None
+
+
+def _init_worker() -> None:
+    global _worker_classifier
+    _worker_classifier = RiskScoreClassifier()
+
+
+def _classify_chunk(records: List[ClassificationRecord]) -> List[RiskScoreResult]:
+    return [_worker_classifier.classify(r.text, r.session_context, r.metadata) for r in records]
 
 
 # 사용 예제
@@ -0,0 +1,57 @@
+"""
+세션 맥락 (반복성 감지용)
+
+이전 발화를 토큰 집합으로 미리 변환해 최근 window개만 유지합니다.
+새 발화가 들어올 때마다 상태를 제자리에서 갱신하므로, 통화가 길어져도
+발화당 비용은 (현재 발화 토큰 수 x window)로 일정합니다.
+"""
+
+from collections import deque
+from typing import Deque, FrozenSet, Iterable, Union
+
+
+class SessionContext:
+    """세션 내 이전 발화 맥락"""
+
+    def __init__(self, window: int = 3, min_token_length: int = 4):
+        """
+        Args:
+            window: 유사도 비교에 사용할 최근 발화 수
+            min_token_length: 유사 주제 판단에 사용할 최소 단어 길이
+        """
+        self.window = window
+        self.min_token_length = min_token_length
+        self._recent: Deque[FrozenSet[str]] = deque(maxlen=window)
+        self._count = 0
+
+    @classmethod
+    def from_texts(cls, texts: Iterable[Union[str, dict]], window: int = 3) -> "SessionContext":
+        """
+        기존 발화 리스트로 맥락 생성
+
+        Args:
+            texts: 발화 문자열 또는 {"text": ...} 형태의 구간 딕셔너리
+        """
+        context = cls(window=window)
+        for item in texts:
+            context.append(item["text"] if isinstance(item, dict) else item)
+        return context
+
+    def tokenize(self, text: str) -> FrozenSet[str]:
+        """유사 주제 판단용 토큰 집합"""
+        return frozenset(word for word in text.split() if len(word) >= self.min_token_length)
+
+    def append(self, text: str) -> None:
+        """발화 추가 (오래된 발화는 window 밖으로 밀려남)"""
+        self._recent.append(self.tokenize(text))
+        self._count += 1
+
+    def similar_count(self, text: str) -> int:
+        """최근 window개 발화 중 text와 토큰을 공유하는 발화 수"""
+        tokens = self.tokenize(text)
+        if not tokens:
+            return 0
+        return sum(1 for prev in self._recent if not tokens.isdisjoint(prev))
+
+    def __len__(self) -> int:
+        return self._count
@@ -1,18 +1,10 @@
 import os
-from emotion_system.diarization.speaker_split import diarize_and_transcribe
-from emotion_system.emotion.text_emotion import classify_text_emotion
-from emotion_system.emotion.audio_emotion import classify_audio_emotion
-from emotion_system.features.extract_features import extract_features
-from emotion_system.response.generate_response import generate_response
-from emotion_system.response.compare_actions import compare_actions
-from emotion_system.utils.audio_utils import convert_to_wav
-from emotion_system.streaming_input import (
-    run_live_emotion_only,
-    run_live_emotion_with_diarization,
-    run_live_pipeline
-)
-from logic_classify_system.risk_based_classifier import RiskScoreClassifier
-from logic_classify_system.classification_criteria import ConsultationMetadata
+import time
+
+from emotion_system.metrics import metrics
+
+# 모델/오디오 관련 무거운 모듈(torch, transformers, pyannote, whisper, sounddevice)은
+# 선택한 모드에서 필요할 때 함수 안에서 import합니다. CLI 시작은 1초 미만이어야 합니다.
 
 HF_TOKEN = os.getenv("HF_TOKEN")
 
@@ -32,103 +24,277 @@ def get_user_choice():
     return input_mode, process_mode
 
 
+def transcribe_with_features(audio_path, json_path=None):
+    """
+    화자 분리/STT 구간과 구간별 프레임 특징 (json_path가 있으면 구간을 JSON으로 저장)
+
+    LINGUA_LONG_AUDIO_SECONDS보다 긴 녹음은 전체를 메모리로 디코딩하지 않고
+    memmap 버퍼로 화자 분리/STT를 돌린 뒤 특징은 창 단위로 계산합니다.
+    """
+    from emotion_system.diarization.speaker_split import diarize_and_transcribe
+    from emotion_system.features.long_audio import is_long_audio, open_long_audio, segment_frame_features_long
+
+    if is_long_audio(audio_path):
+        with open_long_audio(audio_path) as long_audio:
+            segments = diarize_and_transcribe(audio_path, HF_TOKEN, save_json=json_path is not None,
+                                              json_path=json_path, audio=long_audio.array())
+            spans = [(seg["start"], seg["end"]) for seg in segments]
+            return segments, segment_frame_features_long(long_audio, spans)
+
+    from emotion_system.features.extract_features import segment_frame_features
+    from emotion_system.utils.audio_utils import load_audio
+
+    audio = load_audio(audio_path)  # 파일 전체를 한 번만 디코딩
+    segments = diarize_and_transcribe(audio_path, HF_TOKEN, save_json=json_path is not None, json_path=json_path,
+                                      audio=audio)
+    return segments, segment_frame_features(audio, [(seg["start"], seg["end"]) for seg in segments])
+
+
+# 처리 방식 → 파이프라인 이름 (JSON 파일명 / 메트릭 라벨)
+PIPELINES = {"A": "emotion_only", "B": "emotion_diarization", "C": "full"}
+JSON_PATHS = {"A": "emotion_only.json", "B": "emotion_diarization.json", "C": "full_pipeline.json"}
+
+
+def warmup_models(process_mode="C", audio=True):
+    """
+    처리 방식에 필요한 모델을 미리 로드 (배치 워커 / 서버 시작 시 1회)
+
+    실제 호출과 같은 레지스트리 키로 로드되도록 각 단계 함수를 작은 입력으로 한 번씩 실행합니다.
+    audio=False이면 전사문 분석에 필요한 텍스트 모델(KoBERT, KoGPT2)만 로드합니다
+    (화자 분리 / ASR / 음향 감정 모델은 첫 녹음 분석 때 로드).
+    """
+    import numpy as np
+    from emotion_system.asr import load_asr_model
+    from emotion_system.emotion.text_emotion import classify_text_emotion_batch
+    from emotion_system.emotion.audio_emotion import classify_audio_emotion_batch
+    from emotion_system.features.extract_features import FRAME_FEATURE_DIM
+    from emotion_system.model_registry import registry
+    import emotion_system.diarization.speaker_split  # noqa: F401  로더 등록
+
+    classify_text_emotion_batch(["안녕하세요"])
+    if audio:
+        registry.get("pyannote_diarization", hf_token=HF_TOKEN)
+        load_asr_model()
+        classify_audio_emotion_batch([np.zeros((8, FRAME_FEATURE_DIM), dtype=np.float32)])
+    if process_mode in ("A", "C"):
+        import emotion_system.response.generate_response  # noqa: F401  로더 등록
+        registry.get("kogpt2")
+    return registry.report()
+
+
+def analyze_file(audio_path, process_mode="C", json_path=None, responder=None, classifier=None, on_result=None):
+    """
+    오디오 파일 1개 분석 (입력/출력 없이 결과만 반환)
+
+    Args:
+        audio_path: m4a / mp3 / wav 파일 경로
+        process_mode: "A" 감정 분석 + 응답, "B" 감정 분석 + 화자 분리, "C" + Risk Score 평가
+        json_path: 화자 분리/STT 구간을 저장할 JSON 경로 (None이면 저장 안 함)
+        responder: 재사용할 TieredResponder (None이면 새로 생성, 캐시를 파일 간 공유하려면 전달)
+        classifier: 재사용할 RiskScoreClassifier (None이면 새로 생성)
+        on_result: 구간 결과가 확정될 때마다 호출할 콜백 (스트리밍용)
+
+    Returns:
+        구간별 결과 딕셔너리 리스트
+        공통 키: speaker, start, end, text, emotion
+        A: + response / C: + profanity, risk_score, risk_level, recommendation, response, comparison 등
+    """
+    if process_mode not in PIPELINES:
+        raise ValueError(f"잘못된 처리 방식입니다: {process_mode} (가능: {', '.join(PIPELINES)})")
+
+    pipeline = PIPELINES[process_mode]
+    on_result = _segment_observer(pipeline, on_result)
+    with metrics.span("call", pipeline=pipeline):
+        return _analyze_file(audio_path, process_mode, json_path, responder, classifier, on_result)
+
+
+def _segment_observer(pipeline, on_result=None):
+    """
+    구간 결과가 확정될 때마다 호출 시작부터의 지연을 segment_latency_seconds{pipeline}에 기록하는 콜백
+
+    단계 span은 배치 단위라 구간별 지연이 아니므로, 결과를 받는 쪽(스트리밍 응답)이 보는 지연을 따로 잽니다.
+    """
+    started = time.perf_counter()
+
+    def emit(result):
+        metrics.observe("segment_latency_seconds", time.perf_counter() - started, pipeline=pipeline)
+        if on_result:
+            on_result(result)
+    return emit
+
+
+def _analyze_file(audio_path, process_mode, json_path, responder, classifier, on_result):
+    from emotion_system.emotion.text_emotion import classify_text_emotion_batch
+    from emotion_system.emotion.audio_emotion import classify_audio_emotion_batch
+
+    segments, frame_features = transcribe_with_features(audio_path, json_path)
+    text_emotions = classify_text_emotion_batch([seg["text"] for seg in segments])
+    audio_emotions = classify_audio_emotion_batch(frame_features)
+    results = [{
+        "speaker": seg["speaker"],
+        "start": seg["start"],
+        "end": seg["end"],
+        "text": seg["text"],
+        "emotion": text_emotion if text_emotion else audio_emotion
+    } for seg, (text_emotion, _), (audio_emotion, _) in zip(segments, text_emotions, audio_emotions)]
+    metrics.inc("segments_processed_total", len(results), pipeline=PIPELINES[process_mode])
+
+    if process_mode == "A":
+        from emotion_system.response.responder import TieredResponder
+
+        # 템플릿/캐시 미스인 구간만 같은 감정 스타일끼리 묶어 배치 생성
+        responder = responder or TieredResponder()
+        responses = responder.respond_batch([(r["emotion"], r["text"]) for r in results])
+        for result, response in zip(results, responses):
+            result["response"] = response
+    elif process_mode == "C":
+        return _score_risk(results, responder, classifier, on_result=on_result)
+    for result in results:
+        on_result(result)
+    return results
+
+
+def analyze_transcript(utterances, metadata=None, responder=None, classifier=None, on_result=None):
+    """
+    전사문(발화 텍스트) 분석: 텍스트 감정 → 욕설 필터링 / Risk Score → 응답 생성
+
+    Args:
+        utterances: [{"speaker", "text"}, ...] 또는 텍스트 리스트 (발화 순서)
+        metadata: ConsultationMetadata 필드 딕셔너리 (None이면 CLI와 같은 기본값)
+
+    Returns:
+        발화별 결과 딕셔너리 리스트 (analyze_file "C" 모드와 같은 키, start/end 제외)
+    """
+    on_result = _segment_observer("transcript", on_result)
+    with metrics.span("call", pipeline="transcript"):
+        return _analyze_transcript(utterances, metadata, responder, classifier, on_result)
+
+
+def _analyze_transcript(utterances, metadata, responder, classifier, on_result):
+    from emotion_system.emotion.text_emotion import classify_text_emotion_batch
+    from logic_classify_system.risk_based_classifier import ConsultationMetadata
+
+    utterances = [u if isinstance(u, dict) else {"text": u} for u in utterances]
+    text_emotions = classify_text_emotion_batch([u["text"] for u in utterances])
+    results = [{"speaker": u.get("speaker"), "text": u["text"], "emotion": emotion}
+               for u, (emotion, _) in zip(utterances, text_emotions)]
+    metrics.inc("segments_processed_total", len(results), pipeline="transcript")
+    metadata = ConsultationMetadata(**metadata) if metadata is not None else None
+    return _score_risk(results, responder, classifier, metadata, on_result)
+
+
+def _score_risk(results, responder, classifier, metadata=None, on_result=None):
+    """욕설 필터링 → Risk Score → 응답 생성 → 조치 비교 (구간 순서대로, 이전 발화 맥락 유지)"""
+    from emotion_system.response.responder import TieredResponder
+    from emotion_system.response.compare_actions import compare_actions
+    from logic_classify_system.risk_based_classifier import RiskScoreClassifier, ConsultationMetadata
+    from logic_classify_system.session_context import SessionContext
+
+    classifier = classifier or RiskScoreClassifier()
+    responder = responder or TieredResponder()  # 템플릿 → 캐시 → KoGPT2 생성
+    session = SessionContext()  # 이전 발화 맥락 (발화마다 제자리 갱신)
+    metadata = metadata or ConsultationMetadata(
+        consultation_content="고충 상담",
+        consultation_result="해결 불가",
+        requirement_type="다수 요건",
+        consultation_reason="업체"
+    )
+
+    for result in results:
+        text = result["text"]
+
+        # 텍스트 규칙 평가 1회 → 욕설 필터링 / Risk Score에서 재사용
+        with metrics.span("risk_scoring"):
+            analysis = classifier.analyze(text, session_context=session)
+            session.append(text)
+
+            # 욕설 필터링
+            profanity_result = classifier.profanity_filter.filter_profanity(text, analysis)
+        if profanity_result:
+            result.update(profanity=True, risk_score=profanity_result.risk_score,
+                          risk_level=profanity_result.risk_level.name,
+                          profanity_category=profanity_result.profanity_category,
+                          recommendation=profanity_result.recommendation)
+            if on_result:
+                on_result(result)
+            continue
+
+        # Risk Score 평가 (규칙 평가·욕설 필터링은 risk_scoring 구간)
+        with metrics.span("risk_classify"):
+            risk_result = classifier.classify(text, metadata=metadata, analysis=analysis)
+
+        result.update(
+            profanity=False,
+            risk_score=risk_result.risk_score,
+            risk_level=risk_result.risk_level.name,
+            baseline_issues=risk_result.baseline_issues,
+            metadata_issues=risk_result.metadata_issues,
+            confidence=risk_result.confidence,
+            recommendation=risk_result.recommendation,
+            # 상담사 응답 생성
+            response=responder.respond(result["emotion"], text),
+            # 권장 조치 vs 실제 조치 비교
+            comparison=compare_actions(
+                text,
+                recommended_action="환불 접수 후 3일 내 처리",
+                actual_action="처리 지연 중"
+            )
+        )
+        if on_result:
+            on_result(result)
+    return results
+
+
 def run_emotion_only(audio_path):
+    from emotion_system.response.responder import TieredResponder
+
     print("\n[감정 분석만 수행]")
     # JSON 저장도 함께 수행
-    segments = diarize_and_transcribe(audio_path, HF_TOKEN, save_json=True, json_path="emotion_only.json")
-
-    for seg in segments:
-        speaker = seg["speaker"]
-        text = seg["text"]
-        text_emotion = classify_text_emotion(text)
-        features = extract_features(audio_path)
-        audio_emotion = classify_audio_emotion(features)
-        final_emotion = text_emotion if text_emotion else audio_emotion
-        response = generate_response(final_emotion, text)
-
-        print(f"[{speaker}] 발화: {text}")
-        print(f"감정: {final_emotion}")
-        print("응답:", response)
+    responder = TieredResponder()
+    for result in analyze_file(audio_path, "A", JSON_PATHS["A"], responder=responder):
+        print(f"[{result['speaker']}] 발화: {result['text']}")
+        print(f"감정: {result['emotion']}")
+        print("응답:", result["response"])
         print("-" * 50)
+    print(responder.format_stats())
 
 
 def run_emotion_with_diarization(audio_path):
     print("\n[감정 분석 + 화자 분리]")
-    segments = diarize_and_transcribe(audio_path, HF_TOKEN, save_json=True, json_path="emotion_diarization.json")
-
-    for seg in segments:
-        speaker = seg["speaker"]
-        text = seg["text"]
-        text_emotion = classify_text_emotion(text)
-        features = extract_features(audio_path)
-        audio_emotion = classify_audio_emotion(features)
-        final_emotion = text_emotion if text_emotion else audio_emotion
-
-        print(f"[{speaker}] 발화: {text}")
-        print(f"감정: {final_emotion}")
+    for result in analyze_file(audio_path, "B", JSON_PATHS["B"]):
+        print(f"[{result['speaker']}] 발화: {result['text']}")
+        print(f"감정: {result['emotion']}")
         print("-" * 50)
 
 
 def run_full_pipeline(audio_path):
-    print("\n[감정 분석 + 화자 분리 + Risk Score 평가]")
-    segments = diarize_and_transcribe(audio_path, HF_TOKEN, save_json=True, json_path="full_pipeline.json")
-    classifier = RiskScoreClassifier()
-
-    for seg in segments:
-        speaker = seg["speaker"]
-        text = seg["text"]
+    from emotion_system.response.responder import TieredResponder
 
-        # 욕설 필터링
-        profanity_result = classifier.profanity_filter.filter_profanity(text)
-        if profanity_result:
-            print(f"[{speaker}] 발화: {text}")
+    print("\n[감정 분석 + 화자 분리 + Risk Score 평가]")
+    responder = TieredResponder()
+    for result in analyze_file(audio_path, "C", JSON_PATHS["C"], responder=responder):
+        print(f"[{result['speaker']}] 발화: {result['text']}")
+        if result["profanity"]:
             print("욕설 감지 → CRITICAL 처리")
-            print("Risk Score:", profanity_result.risk_score, profanity_result.risk_level.name)
-            print("권장 조치:", profanity_result.recommendation)
+            print("Risk Score:", result["risk_score"], result["risk_level"])
+            print("권장 조치:", result["recommendation"])
             print("-" * 50)
             continue
-
-        # 감정 분석
-        text_emotion = classify_text_emotion(text)
-        features = extract_features(audio_path)
-        audio_emotion = classify_audio_emotion(features)
-        final_emotion = text_emotion if text_emotion else audio_emotion
-
-        # Risk Score 평가
-        metadata = ConsultationMetadata(
-            consultation_content="고충 상담",
-            consultation_result="해결 불가",
-            requirement_type="다수 요건",
-            consultation_reason="업체"
-        )
-        risk_result = classifier.classify(text, session_context=segments, metadata=metadata)
-
-        # 상담사 응답 생성
-        response = generate_response(final_emotion, text)
-
-        # 권장 조치 vs 실제 조치 비교
-        comparison = compare_actions(
-            text,
-            recommended_action="환불 접수 후 3일 내 처리",
-            actual_action="처리 지연 중"
-        )
-
-        print(f"[{speaker}] 발화: {text}")
-        print(f"감정: {final_emotion}")
-        print(f"Risk Score: {risk_result.risk_score} ({risk_result.risk_level.name})")
-        print("응답:", response)
-        print("권장 조치:", risk_result.recommendation)
-        print("조치 비교:", comparison)
+        print(f"감정: {result['emotion']}")
+        print(f"Risk Score: {result['risk_score']} ({result['risk_level']})")
+        print("응답:", result["response"])
+        print("권장 조치:", result["recommendation"])
+        print("조치 비교:", result["comparison"])
         print("-" * 50)
+    print(responder.format_stats())
 
 
 def run_pipeline():
     input_mode, process_mode = get_user_choice()
 
     if input_mode == "1":
+        # m4a / mp3 / wav 모두 load_audio가 메모리로 직접 디코딩 (임시 WAV 없음)
         audio_path = input("\n오디오 파일 경로를 입력하세요: ").strip()
-        if audio_path.endswith((".m4a", ".mp3")):
-            audio_path = convert_to_wav(audio_path)
 
         if process_mode == "A":
             run_emotion_only(audio_path)
@@ -140,6 +306,13 @@ def run_pipeline():
             print("❌ 잘못된 처리 방식입니다.")
 
     elif input_mode == "2":
+        # 실시간 모드에서만 sounddevice / faster-whisper 경로를 import
+        from emotion_system.streaming_input import (
+            run_live_emotion_only,
+            run_live_emotion_with_diarization,
+            run_live_pipeline
+        )
+
         if process_mode == "A":
             run_live_emotion_only()
         elif process_mode == "B":
@@ -151,6 +324,9 @@ def run_pipeline():
     else:
         print("❌ 잘못된 입력 방식입니다.")
 
+    # LINGUA_METRICS=1일 때만 단계별 시간/카운터를 내보냄
+    metrics.dump()
+
 
 if __name__ == "__main__":
     run_pipeline()
@@ -44,6 +44,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'linguaproject.analysis',
 ]
 
 MIDDLEWARE = [
@@ -123,6 +124,19 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# 음성 분석 API (linguaproject.analysis)
+# 작업은 로컬 프로세스 풀에서 실행되며 워커마다 모델을 한 벌씩 로드합니다.
+
+ANALYSIS_WORKERS = env.int('ANALYSIS_WORKERS', default=1)
+ANALYSIS_WORKER_MODULE = env('ANALYSIS_WORKER_MODULE', default='linguaproject.analysis.worker')
+# 워커 시작 시 선로딩: none | text (전사문용 KoBERT / KoGPT2) | all (+ pyannote, Whisper, LSTM, HF_TOKEN 필요)
+ANALYSIS_WARMUP = env('ANALYSIS_WARMUP', default='text')
+ANALYSIS_UPLOAD_DIR = env('ANALYSIS_UPLOAD_DIR', default=str(BASE_DIR / 'uploads'))
+ANALYSIS_MAX_UPLOAD_MB = env.int('ANALYSIS_MAX_UPLOAD_MB', default=500)
+ANALYSIS_MAX_JOBS = env.int('ANALYSIS_MAX_JOBS', default=1000)
+# 대기 + 실행 중 작업 상한 (초과 시 429, 업로드 파일은 작업이 끝날 때까지 디스크에 남음)
+ANALYSIS_MAX_ACTIVE_JOBS = env.int('ANALYSIS_MAX_ACTIVE_JOBS', default=32)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 